@@ -0,0 +1,151 @@
+"""
+交易所无服务端基准测试: 以桩替换 endstone, 用假玩家随机挂单, 输出每秒处理的订单数;
+同时断言余额守恒(余额总量 = 初始总量 - 托管中的买单 - 手续费)、物品守恒(移走的 = 领取箱 + 背包 + 挂单中的卖单),
+以及快照 + 操作日志重启恢复后订单簿与领取箱不变
+
+用法: python bench/market_bench.py [订单数] [--online]
+  --online  所有假玩家在线(成交物品直接进背包, 收款直接入账); 默认离线(进领取箱 / 余额存储)
+"""
+import os, sys, json, time, types, random, shutil, tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "endstone_yessential")
+
+
+# ── endstone 桩 ─────────────────────────────────────────
+def _stub(name: str) -> types.ModuleType:
+    """任意属性都返回一个空类的模块, 足够让插件模块完成导入"""
+    mod = types.ModuleType(name)
+    mod.__getattr__ = lambda attr: mod.__dict__.setdefault(attr, type(attr, (), {"__init__": lambda self, *a, **k: None}))
+    return mod
+
+
+for _name in ("endstone", "endstone.command", "endstone.form", "endstone.inventory", "endstone.event", "endstone.plugin"):
+    sys.modules[_name] = _stub(_name)
+_pkg = types.ModuleType("endstone_yessential"); _pkg.__path__ = [ROOT]   # 跳过 __init__(它会导入整个插件)
+sys.modules["endstone_yessential"] = _pkg
+
+import endstone_yessential.market as market
+import endstone_yessential.shop as shop
+from endstone_yessential.economy import EconomySystem
+
+
+# ── 假物品 / 玩家 / 服务端 ──────────────────────────────
+class FakeType:
+    def __init__(self, id): self.id = id
+
+
+class FakeStack:
+    def __init__(self, type, amount=1, data=0):
+        self.type = FakeType(type); self.amount = amount; self.data = data; self.max_stack_size = 64; self.item_meta = None
+
+    def is_similar(self, other): return self.type.id == other.type.id
+
+
+class FakeInventory:
+    """容量无限的背包, 只统计每种物品的净流入"""
+    def __init__(self): self.net = {}; self.contents = [None] * 36
+
+    def contains_at_least(self, stack, n): return True
+
+    def remove_item(self, *stacks):
+        for s in stacks: self.net[s.type.id] = self.net.get(s.type.id, 0) - s.amount
+        return {}
+
+    def add_item(self, *stacks):
+        for s in stacks: self.net[s.type.id] = self.net.get(s.type.id, 0) + s.amount
+        return {}
+
+
+class FakePlayer:
+    def __init__(self, name): self.name = name; self.inventory = FakeInventory(); self.messages = 0
+
+    def send_message(self, msg): self.messages += 1
+
+    def __str__(self): return self.name
+
+
+class FakeScheduler:
+    def run_task(self, plugin, fn, delay=0, period=0): return types.SimpleNamespace(task_id=0, cancel=lambda: None)
+
+
+class FakeServer:
+    def __init__(self, players, online):
+        self.scheduler = FakeScheduler(); self.scoreboard = None; self.command_sender = None
+        self._players = {p.name: p for p in players}; self._online = online
+        self.online_players = list(players) if online else []
+
+    def get_player(self, name): return self._players.get(name) if self._online else None
+
+    def dispatch_command(self, *args): pass
+
+
+for _mod in (market, shop):
+    _mod.ItemStack = FakeStack; _mod.ItemType = types.SimpleNamespace(get=FakeType)
+market.Player = FakePlayer
+
+
+def make(folder, players, online):
+    cfg = {"Economy": {"mode": "llmoney", "storage": "json"}, "Market": {"fee": 0.02, "max_orders": 10 ** 9}}
+    plugin = types.SimpleNamespace(data_folder=folder, server=FakeServer(players, online),
+                                   config_manager=types.SimpleNamespace(config_data=cfg, get=cfg.get))
+    plugin.economy = EconomySystem(plugin)
+    return plugin, market.MarketSystem(plugin)
+
+
+def state(m):
+    return (m._next, sorted((o.id, o.side, o.qty) for o in m.orders.values()), {k: v for k, v in m.claims.items() if v})
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    n = int(args[0]) if args else 100000; online = "--online" in sys.argv
+    folder = tempfile.mkdtemp(prefix="market-bench-")
+    try:
+        players = [FakePlayer(f"p{i}") for i in range(200)]
+        with open(os.path.join(folder, "money.json"), 'w', encoding='utf-8') as f: json.dump({p.name: 1e9 for p in players}, f)
+        plugin, m = make(folder, players, online); eco = plugin.economy
+        random.seed(1); items = [f"minecraft:item{i}" for i in range(20)]
+        ops = [(random.choice(players), random.choice((market.BUY, market.SELL)), random.choice(items),
+                round(random.gauss(100, 5), 1), random.randint(1, 32)) for _ in range(n)]
+        total0 = sum(eco.money_data.values())
+
+        t = time.perf_counter()
+        for p, side, item, price, qty in ops: m.place(p, side, item, price, qty)
+        dt = time.perf_counter() - t
+        print(f"{n} orders in {dt:.2f}s = {n / dt:,.0f} orders/s, trades {m.trades}, resting {len(m.orders)}, "
+              f"mode={'online' if online else 'offline'}")
+
+        with open(m.log_path, 'r', encoding='utf-8') as f: fees = sum(json.loads(line)["fee"] for line in f)
+        escrow = sum(o.price * o.qty for o in m.orders.values() if o.side == market.BUY)
+        money_drift = total0 - sum(eco.money_data.values()) - escrow - fees
+        claims = sum(sum(b.values()) for b in m.claims.values())
+        resting = sum(o.qty for o in m.orders.values() if o.side == market.SELL)
+        item_drift = sum(sum(p.inventory.net.values()) for p in players) + claims + resting
+        print(f"money drift {money_drift:.4f}, item drift {item_drift}")
+        assert abs(money_drift) < 1e-3 * max(1, m.trades), "余额不守恒"
+        assert item_drift == 0, "物品不守恒"
+
+        # 未写快照即"崩溃": 仅凭操作日志恢复
+        before = state(m)
+        _, m2 = make(folder, players, online)
+        assert state(m2) == before, "日志重放后状态不一致"
+
+        t = time.perf_counter(); count = len(m2.orders)
+        for o in m2.orders.values(): o.expire = 0
+        m2._expiry = [(0, i) for i in m2.orders]; m2.expire_due()
+        print(f"expired {count} in {(time.perf_counter() - t) * 1000:.0f}ms, left {len(m2.orders)}")
+        assert not m2.orders and all(b.live == 0 for b in m2.books.values())
+        money_drift = total0 - sum(m2.economy.money_data.values()) - fees
+        assert abs(money_drift) < 1e-3 * max(1, m.trades), "过期退款后余额不守恒"
+
+        t = time.perf_counter(); m2.flush(background=False)
+        print(f"flush {(time.perf_counter() - t) * 1000:.0f}ms, trades.log {os.path.getsize(m.log_path)} bytes")
+        _, m3 = make(folder, players, online)
+        assert state(m3) == state(m2), "快照重载后状态不一致"
+        print("ok")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
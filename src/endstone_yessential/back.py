@@ -24,7 +24,8 @@ class BackSystem:
         # 记录新的死亡点，包含位置和时间
         death_point = {
             "location": player.location,
-            "time": time.time()
+            "time": time.time(),
+            "source": "death"
         }
 
         self.plugin.logger.info(f"[DEBUG] 死亡点位置: ({death_point['location'].x}, {death_point['location'].y}, {death_point['location'].z})")
@@ -39,6 +40,12 @@ class BackSystem:
         self.plugin.logger.info(f"[DEBUG] 当前记录的死亡点数量: {len(self.death_points[player.unique_id])}")
         player.send_message(tr("back.recorded", len(self.death_points[player.unique_id])))
 
+    def record_origin(self, player: Player, location, source: str):
+        """记录传送出发点（由 TeleportService 调用，不提示玩家）"""
+        points = self.death_points.setdefault(player.unique_id, [])
+        points.insert(0, {"location": location, "time": time.time(), "source": source})
+        del points[self.max_death_points:]
+
     def teleport_back(self, player: Player, index: int = 0):
         """传送到指定索引的死亡点"""
         if player.unique_id not in self.death_points or not self.death_points[player.unique_id]:
@@ -49,11 +56,11 @@ class BackSystem:
             player.send_message(tr("back.invalid_index"))
             return
 
-        death_point = self.death_points[player.unique_id][index]
-        player.teleport(death_point["location"])
-        player.send_message(tr("back.teleported"))
-        # 传送后移除该死亡点
-        del self.death_points[player.unique_id][index]
+        # 先移除该记录，传送未受理（冷却/余额不足）时放回原位
+        points = self.death_points[player.unique_id]
+        death_point = points.pop(index)
+        if not self.plugin.teleport.teleport(player, death_point["location"], "back", tr("back.teleported")):
+            points.insert(index, death_point)
 
     def open_back_gui(self, player: Player):
         """打开返回死亡点 GUI"""
@@ -75,7 +82,9 @@ class BackSystem:
                 else:
                     time_str = tr("back.day_ago", int(death_time / 86400))
 
-                button_text = f"§aDeath {i + 1}: §e({int(loc.x)}, {int(loc.y)}, {int(loc.z)}) §7- {time_str}"
+                source = death_point.get("source", "death")
+                label = f"Death {i + 1}" if source == "death" else f"{source} {i + 1}"
+                button_text = f"§a{label}: §e({int(loc.x)}, {int(loc.y)}, {int(loc.z)}) §7- {time_str}"
                 form.add_button(button_text, on_click=lambda p, idx=i: self.teleport_back(p, idx))
 
             form.content = tr("back.count", len(self.death_points[player.unique_id]))
@@ -91,6 +100,8 @@ class BackSystem:
 
         if self.death_points.get(player.unique_id):
             for i, death_point in enumerate(self.death_points[player.unique_id]):
+                if death_point.get("source", "death") != "death":
+                    continue
                 loc = death_point["location"]
                 death_time = time.time() - death_point["time"]
 
@@ -107,7 +118,7 @@ class BackSystem:
                 button_text = f"§e#{i + 1}: §a({int(loc.x)}, {int(loc.y)}, {int(loc.z)}) §7[{dim}] §7- {time_str}"
                 form.add_button(button_text, on_click=lambda p, idx=i: self.teleport_back(p, idx))
 
-            form.content = tr("back.deathlog_count", len(self.death_points[player.unique_id]))
+            form.content = tr("back.deathlog_count", sum(1 for d in self.death_points[player.unique_id] if d.get("source", "death") == "death"))
         else:
             form.content = tr("back.deathlog_empty")
 
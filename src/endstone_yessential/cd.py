@@ -119,7 +119,16 @@ class MenuEconomyManager:
         self.plugin = plugin
         self.config_manager = config_manager
 
+    def _score_economy(self):
+        """计分板模式且菜单计分项就是经济系统的计分项时返回经济系统: 读写必须经过它, 否则其分数镜像会过期,
+        之后的余额写入会以旧值覆盖菜单的扣款"""
+        eco = getattr(self.plugin, 'economy', None)
+        if eco and eco.config.is_scoreboard and self.config_manager.get_score() == eco.config.scoreboard_name: return eco
+        return None
+
     def get(self, player: Player) -> float:
+        eco = self._score_economy()
+        if eco is not None: return eco.get_money_internal(player)
         if not self.config_manager.get_money():
             score = self.config_manager.get_score()
             try:
@@ -132,6 +141,8 @@ class MenuEconomyManager:
             return 0.0
 
     def add(self, player: Player, amount: float):
+        eco = self._score_economy()
+        if eco is not None: eco.add_money_internal(player, int(amount)); return
         if not self.config_manager.get_money():
             score = self.config_manager.get_score()
             try:
@@ -145,6 +156,8 @@ class MenuEconomyManager:
                 self.plugin.economy.add_money(player.name, amount)
 
     def reduce(self, player: Player, amount: float) -> bool:
+        eco = self._score_economy()
+        if eco is not None: return eco.reduce_money_internal(player, int(amount))
         if not self.config_manager.get_money():
             score = self.config_manager.get_score()
             try:
@@ -346,8 +359,9 @@ class MenuPlayerHandler:
         player.send_form(form)
 
     def handle_button_click(self, player: Player, button: dict, current_menu: str):
+        # 先扣款再执行, 余额检查与扣款是同一步; 按钮类型无效时退回
         required_money = button.get("money", 0)
-        if required_money > 0 and self.economy_manager.get(player) < required_money:
+        if required_money > 0 and not self.economy_manager.reduce(player, required_money):
             self.show_menu(player, current_menu)
             player.send_message(self.config_manager.prefix + tr("economy.not_enough"))
             return
@@ -362,12 +376,10 @@ class MenuPlayerHandler:
         elif btn_type == "opcm":
             self.handle_op_command(player, button, current_menu)
         else:
+            if required_money > 0:
+                self.economy_manager.add(player, required_money)
             self.show_menu(player, current_menu)
             player.send_message(self.config_manager.prefix + tr("cd.button_type_error"))
-            return
-
-        if required_money > 0:
-            self.economy_manager.reduce(player, required_money)
 
     def handle_op_form(self, player: Player, button: dict, current_menu: str):
         op_list = button.get("oplist", [])
@@ -108,10 +108,33 @@ class ConfigManager:
             # ═══════════════════════════════════════════════════
             "Economy": {
                 "mode": "scoreboard",          # "scoreboard" | "llmoney"
+                "storage": "json",             # "json"(追加账本) | "sqlite"(economy.db, WAL) | "compact"(内存映射账户表, 百万级账户)
                 "Scoreboard": "money",
                 "CoinName": "金币",
                 "RankingModel": "New",         # "New" | "Simple"
-                "PayTaxRate": 0                # 0=免税, 数字=单一税率, 数组=阶梯税率
+                "PayTaxRate": 0,               # 0=免税, 数字=单一税率, 数组=阶梯税率
+                "Guard": {                     # 余额异常检测, 告警发给在线 OP 与日志
+                    "enabled": True,
+                    "window": 60,              # 滑动窗口(秒)
+                    "max_ops": 30,             # 窗口内变动次数上限
+                    "max_gain": 100000,        # 窗口内净流入上限
+                    "cooldown": 300            # 同一玩家同类告警间隔(秒)
+                },
+                # 全账户批量任务, 如 {"name": "daily_interest", "rule": "interest", "rate": 0.01, "cap": 1000, "at": "04:00"}
+                # rule: "interest"(rate, cap) | "tax"(rate, threshold) | "reset_under"(threshold, value); 可选 min / max / exclude 过滤
+                "Jobs": [],
+                # 跨服余额同步: 各服按 tick 合并发布余额增量, 接收端按账户序列号去重后叠加(各服初始余额需一致)
+                "Replication": {
+                    "enabled": False,
+                    "node": "",                # 节点名, 留空自动生成并保存在 replication.json
+                    "transport": "sqlite",     # "sqlite"(共享数据库文件) | "socket"(本地中转) | "redis"(Redis 兼容的 Stream)
+                    "path": "",                # sqlite: 共享文件路径; socket: UNIX 套接字路径(留空则用 host:port)
+                    "host": "127.0.0.1",
+                    "port": 6379,              # socket / redis 端口
+                    "broker": False,           # socket: 本服作为中转(只需一台)
+                    "key": "yessential:economy",
+                    "password": ""
+                }
             },
 
             # ═══════════════════════════════════════════════════
@@ -131,7 +154,8 @@ class ConfigManager:
             # ═══════════════════════════════════════════════════
             "Home": {
                 "EnabledModule": True,
-                "max_homes": 5
+                "max_homes": 5,
+                "cache_size": 256              # 内存中保留的离线玩家家园分片数(LRU)
             },
 
             # ═══════════════════════════════════════════════════
@@ -158,6 +182,29 @@ class ConfigManager:
                 "dimid": 0
             },
 
+            # ═══════════════════════════════════════════════════
+            # Teleport — 统一传送服务(home/warp/hub/back/tpa/rtp)
+            # ═══════════════════════════════════════════════════
+            "Teleport": {
+                "prewarm_ticks": 0,            # >0 时先预热目标区块, 延迟该 tick 数再传送
+                "record_back": True,           # 记录出发点, 可用 /back 返回
+                "op_bypass": True,             # OP 不受费用与冷却限制
+                "sources": {                   # 按来源的费用与冷却(秒); rtp 沿用 RTP 节点
+                    "home": {"cost": 0, "cooldown": 0},
+                    "warp": {"cost": 0, "cooldown": 0},
+                    "hub": {"cost": 0, "cooldown": 0},
+                    "back": {"cost": 0, "cooldown": 0},
+                    "tpa": {"cost": 0, "cooldown": 0}
+                },
+                "mass": {                      # 批量传送队列: /warp <名称> all, /hub all, 选择器
+                    "per_tick": 4,             # TPS 充足时每 tick 传送人数
+                    "full_tps": 18.0,          # TPS 不低于此值时满速
+                    "min_tps": 12.0,           # TPS 低于此值时降到 per_tick × min_scale
+                    "min_scale": 0.1,
+                    "progress_seconds": 3      # 向发起者汇报进度的间隔
+                }
+            },
+
             # ═══════════════════════════════════════════════════
             # Motd — 服务器标题轮播
             # ═══════════════════════════════════════════════════
@@ -197,6 +244,24 @@ class ConfigManager:
                 "expireTime": 300
             },
 
+            # ═══════════════════════════════════════════════════
+            # Shop — 物品商店(商品目录见 shop.json)
+            # ═══════════════════════════════════════════════════
+            "Shop": {
+                "EnabledModule": True
+            },
+
+            # ═══════════════════════════════════════════════════
+            # Market — 玩家交易所(订单簿撮合, 余额与物品托管)
+            # ═══════════════════════════════════════════════════
+            "Market": {
+                "EnabledModule": True,
+                "fee": 0.02,                   # 成交手续费率(从卖方收入中扣除)
+                "expire": 86400,               # 挂单有效期(秒)
+                "max_orders": 20,              # 每位玩家同时挂单上限
+                "max_price": 1000000000
+            },
+
             # ═══════════════════════════════════════════════════
             # Crash — 崩溃模块
             # ═══════════════════════════════════════════════════
@@ -255,6 +320,17 @@ class ConfigManager:
                 ]
             },
 
+            # ═══════════════════════════════════════════════════
+            # HttpApi — 本机只读 JSON 接口(排行榜/余额/红包/跨服状态)
+            # ═══════════════════════════════════════════════════
+            "HttpApi": {
+                "EnabledModule": False,
+                "host": "127.0.0.1",           # 仅建议绑定本机地址, 由网站后端轮询
+                "port": 8765,
+                "refresh": 40,                 # 快照发布间隔(tick)
+                "top": 100                     # /ranking 返回的名次数
+            },
+
             # ═══════════════════════════════════════════════════
             # Update — 更新检查
             # ═══════════════════════════════════════════════════
@@ -1,15 +1,23 @@
 """
 YEssential Economy System - 完整经济系统
-支持双模式(计分板/LLMoney), 转账, 历史, 排行榜, 税率, 离线缓存, 通知
+支持双模式(计分板/LLMoney), 转账, 历史, 排行榜, 税率, 离线信箱
 全 i18n 支持
 """
-import os, json, time
-from typing import Dict, List, Any
+import os, json, time, threading
+from typing import Dict, List, Any, Callable, MutableMapping, Optional
 from endstone import Player
-from endstone.form import ActionForm, ModalForm, MessageForm, Dropdown, TextInput, Label
+from endstone.form import ActionForm, ModalForm, MessageForm, Dropdown, TextInput, Label, Button
 from endstone.command import CommandSenderWrapper
-from .i18n import tr as _tr
+from .i18n import tr as _tr, get_i18n
 from .log import plugin_print
+from .economy_history import MoneyHistory
+from .economy_ranking import MoneyRanking
+from .economy_mailbox import OfflineMailbox
+from .economy_import import EconomyImporter
+from .economy_guard import EconomyGuard
+from .economy_jobs import EconomyJobs
+from .economy_stats import EconomyStats
+from .economy_replication import EconomyReplication
 
 def tr(key: str, *args) -> str:
     return _tr(key, *args)
@@ -31,113 +39,123 @@ class EconomyConfig:
     def ranking_model(self): return self._get().get("RankingModel", "New")
     @property
     def pay_tax_rate(self): return self._get().get("PayTaxRate", 0)
+    @property
+    def storage(self): return self._get().get("storage", "json")
+    @property
+    def guard(self): return self._get().get("Guard", {})
+    @property
+    def jobs(self): return self._get().get("Jobs", [])
+    @property
+    def replication(self): return self._get().get("Replication", {})
+
 
+class MoneyLedger:
+    """money.json 快照 + money.ledger 追加日志
+    每次余额变动只追加一行 {"n": 名称, "v": 新余额}, 写入成本与账户数无关;
+    日志超过阈值后轮换为 .old 并在后台线程写入新快照, 加载时 快照 → .old → 日志 依次回放"""
+    COMPACT_THRESHOLD = 5000
 
-class OfflineMoneyCache:
     def __init__(self, data_folder: str):
-        self.path = os.path.join(data_folder, "offline_money.json")
-        self._data: Dict[str, List[dict]] = {}
-        self.load()
-    def load(self):
+        self.snapshot_path = os.path.join(data_folder, "money.json")
+        self.path = os.path.join(data_folder, "money.ledger")
+        self.rotated_path = self.path + ".old"
+        self._fp = None
+        self._records = 0
+        self._compacting = threading.Lock()
+
+    def load(self) -> Dict[str, float]:
+        data: Dict[str, float] = {}
         try:
-            if os.path.exists(self.path):
-                with open(self.path, 'r', encoding='utf-8') as f: self._data = json.load(f)
-        except: self._data = {}
-    def save(self):
+            if os.path.exists(self.snapshot_path):
+                with open(self.snapshot_path, 'r', encoding='utf-8') as f: data = json.load(f)
+        except Exception as e:
+            plugin_print(f"[Economy] money.json 读取失败: {e}", "WARNING"); data = {}
+        self._records = self._replay(self.rotated_path, data) + self._replay(self.path, data)
+        return data
+
+    @staticmethod
+    def _replay(path: str, data: Dict[str, float]) -> int:
+        # 记录是绝对值, 重复回放幂等; 崩溃导致的半行直接跳过
+        n = 0
+        if not os.path.exists(path): return 0
         try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try: rec = json.loads(line)
+                    except ValueError: continue
+                    data[rec["n"]] = rec["v"]; n += 1
+        except Exception as e: plugin_print(f"[Economy] {os.path.basename(path)} 回放失败: {e}", "WARNING")
+        return n
+
+    def _open(self):
+        if self._fp is None:
             os.makedirs(os.path.dirname(self.path), exist_ok=True)
-            with open(self.path, 'w', encoding='utf-8') as f: json.dump(self._data, f, indent=2, ensure_ascii=False)
-        except: pass
-    def add(self, name: str, op_type: str, amount: int, note: str = ""):
-        if name not in self._data: self._data[name] = []
-        self._data[name].append({"type": op_type, "amount": amount, "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"), "note": note})
-        self.save()
-    def get(self, name: str): return self._data.get(name, [])
-    def clear(self, name: str):
-        if name in self._data: del self._data[name]; self.save()
-    def apply(self, player: Player, economy):
-        ops = self.get(player.name)
-        if not ops: return
-        for op in ops:
-            if op["type"] == "add": economy.add_money_internal(player, op["amount"])
-            elif op["type"] == "reduce": economy.reduce_money_internal(player, op["amount"])
-            elif op["type"] == "set": economy.set_money_internal(player, op["amount"])
-        self.clear(player.name)
-
-
-class EconomyNotify:
-    def __init__(self, data_folder: str):
-        self.path = os.path.join(data_folder, "offline_notify.json")
-        self._data: Dict[str, List[str]] = {}
-        self.load()
-    def load(self):
+            torn = False
+            if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+                with open(self.path, 'rb') as f: f.seek(-1, os.SEEK_END); torn = f.read(1) != b"\n"
+            self._fp = open(self.path, 'a', encoding='utf-8')
+            if torn: self._fp.write("\n")  # 与崩溃残留的半行隔开
+        return self._fp
+
+    def append(self, name: str, value: float):
         try:
-            if os.path.exists(self.path):
-                with open(self.path, 'r', encoding='utf-8') as f: self._data = json.load(f)
-        except: self._data = {}
-    def save(self):
+            fp = self._open()
+            fp.write(json.dumps({"n": name, "v": value}, ensure_ascii=False) + "\n"); fp.flush()
+            self._records += 1
+        except Exception as e: plugin_print(f"[Economy] 账本写入失败: {e}", "WARNING")
+
+    def append_many(self, items: Dict[str, float]):
+        """批量追加: 一次 write + 一次 flush"""
+        if not items: return
         try:
-            os.makedirs(os.path.dirname(self.path), exist_ok=True)
-            with open(self.path, 'w', encoding='utf-8') as f: json.dump(self._data, f, indent=2, ensure_ascii=False)
-        except: pass
-    def send(self, p, msg: str):
-        if isinstance(p, Player): p.send_message(msg)
-        else:
-            name = str(p)
-            if EconomyNotify._server:
-                online = EconomyNotify._server.get_player(name)
-                if online: online.send_message(msg); return
-            self._data.setdefault(name, []).append(msg); self.save()
-    def apply(self, player: Player):
-        msgs = self._data.pop(player.name, [])
-        if msgs: self.save(); [player.send_message(m) for m in msgs]
-EconomyNotify._server = None
-
-
-class MoneyHistory:
-    def __init__(self, data_folder: str):
-        self.path = os.path.join(data_folder, "money_history.json")
-        self._data: Dict[str, Dict[str, str]] = {}
-        self.load()
-    def load(self):
+            fp = self._open()
+            fp.write("".join(json.dumps({"n": n, "v": v}, ensure_ascii=False) + "\n" for n, v in items.items())); fp.flush()
+            self._records += len(items)
+        except Exception as e: plugin_print(f"[Economy] 账本写入失败: {e}", "WARNING")
+
+    def _close(self):
+        if self._fp is not None:
+            try: self._fp.close()
+            except Exception: pass
+            self._fp = None
+
+    def _write_snapshot(self, data: Dict[str, float]):
+        tmp = self.snapshot_path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f: json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, self.snapshot_path)
+        if os.path.exists(self.rotated_path): os.remove(self.rotated_path)
+
+    def compact(self, data: Dict[str, float], background: bool = True, force: bool = False) -> bool:
+        """轮换日志并写入快照; background=True 时快照在后台线程写入, 主线程只做一次 dict 拷贝
+        force=True 时即使账本为空也写快照(批量任务直接改写了内存数据); 返回是否已开始写快照"""
+        if self._records == 0 and not force and os.path.exists(self.snapshot_path): return False
+        if not self._compacting.acquire(blocking=not background): return False
         try:
+            self._close()
             if os.path.exists(self.path):
-                with open(self.path, 'r', encoding='utf-8') as f: self._data = json.load(f)
-        except: self._data = {}
-    def save(self):
-        try:
-            os.makedirs(os.path.dirname(self.path), exist_ok=True)
-            with open(self.path, 'w', encoding='utf-8') as f: json.dump(self._data, f, indent=2, ensure_ascii=False)
-        except: pass
-    def add(self, name: str, msg: str):
-        key = f"{time.strftime('%Y-%m-%d %H:%M:%S')}-{int(time.time()*1000)%1000:03d}"
-        self._data.setdefault(name, {})[key] = msg; self.save()
-    def get_recent(self, name: str, n=50):
-        entries = list(self._data.get(name, {}).items())
-        entries.sort(key=lambda x: x[0], reverse=True)
-        return entries[:n]
+                if os.path.exists(self.rotated_path):
+                    # 上一次压缩未完成: 先并入, 保证 .old 始终是完整的待回放日志
+                    with open(self.rotated_path, 'a', encoding='utf-8') as dst, open(self.path, 'r', encoding='utf-8') as src: dst.write(src.read())
+                    os.remove(self.path)
+                else: os.replace(self.path, self.rotated_path)
+            self._records = 0
+            snapshot = dict(data)
+        except Exception as e:
+            self._compacting.release(); plugin_print(f"[Economy] 账本轮换失败: {e}", "WARNING"); return False
+
+        def work():
+            try: self._write_snapshot(snapshot)
+            except Exception as e: plugin_print(f"[Economy] 快照写入失败: {e}", "WARNING")
+            finally: self._compacting.release()
+        if background: threading.Thread(target=work, daemon=True).start()
+        else: work()
+        return True
 
+    def maybe_compact(self, data: Dict[str, float]):
+        if self._records >= self.COMPACT_THRESHOLD: self.compact(data)
 
-class MoneyRanking:
-    def __init__(self, data_folder: str):
-        self.path = os.path.join(data_folder, "money_ranking.json")
-        self._cache: Dict[str, float] = {}
-        self._dirty = False; self.load()
-    def load(self):
-        try:
-            if os.path.exists(self.path):
-                with open(self.path, 'r', encoding='utf-8') as f: self._cache = json.load(f)
-        except: self._cache = {}
-    def save(self):
-        try:
-            with open(self.path, 'w', encoding='utf-8') as f: json.dump(self._cache, f, indent=2, ensure_ascii=False)
-        except: pass
-    def update(self, name, val):
-        if self._cache.get(name) != val: self._cache[name] = val; self._dirty = True
-    def batch_save(self):
-        if self._dirty: self.save(); self._dirty = False
-    def get_top(self, n=50):
-        return sorted(self._cache.items(), key=lambda x: x[1], reverse=True)[:n]
+    def close(self, data: Dict[str, float]):
+        self.compact(data, background=False); self._close()
 
 
 class TaxCalculator:
@@ -159,26 +177,59 @@ class EconomySystem:
         self.config = EconomyConfig(plugin)
         self.data_folder = plugin.data_folder
         self.money_path = os.path.join(self.data_folder, "money.json")
-        self.money_data: Dict[str, float] = {}
-        self.offline_cache = OfflineMoneyCache(self.data_folder)
-        self.notify = EconomyNotify(self.data_folder)
-        self.history = MoneyHistory(self.data_folder)
-        self.ranking = MoneyRanking(self.data_folder)
-        EconomyNotify._server = plugin.server
+        self.money_data: MutableMapping[str, float] = {}  # storage="compact" 时为 AccountTable
+        # 计分板模式: 在线玩家余额的写穿镜像 + 按计分板名缓存的 Objective 句柄
+        self._sb_mirror: Dict[str, float] = {}
+        self._objectives: Dict[str, Any] = {}
+        # 余额变动监听器 fn(name, old, new): 所有内部写入口都会派发
+        self._listeners: List[Callable[[str, float, float], None]] = []
+        # 批量变动监听器 fn({name: new}): 绕过逐条事件的批量任务写回后派发一次
+        self._bulk_listeners: List[Callable[[Dict[str, float]], None]] = []
+        self.source: Optional[str] = None  # 正在派发的变动事件来自哪个批量操作(apply_batch 的 source), 逐条写入时为 None
+        self._ranking_cache = None  # (键, 标题, 总财富行, [(名称, 前缀, 后缀)], [Button])
+        if self.config.storage == "sqlite":
+            from .economy_sqlite import EconomyDB, SqliteMoneyStore, SqliteOfflineMailbox, SqliteMoneyHistory, SqliteMoneyRanking
+            self.db = EconomyDB(self.data_folder)
+            self.db.migrate_from_json(self.data_folder)
+            self.store = SqliteMoneyStore(self.db)
+            self.mailbox = SqliteOfflineMailbox(self.db, plugin.server)
+            self.history = SqliteMoneyHistory(self.db)
+            self.ranking = SqliteMoneyRanking(self.db)
+        else:
+            self.db = None
+            if self.config.storage == "compact":
+                from .economy_accounts import AccountTable
+                self.store = AccountTable(self.data_folder)
+            else: self.store = MoneyLedger(self.data_folder)
+            self.mailbox = OfflineMailbox(self.data_folder, plugin.server)
+            self.history = MoneyHistory(self.data_folder)
+            self.ranking = MoneyRanking(self.data_folder)
+        self.add_listener(lambda name, old, new: self.ranking.update(name, new))
+        self.add_bulk_listener(self.ranking.bulk_update)
+        self.importer = EconomyImporter(self)
+        self.guard = EconomyGuard(self)
+        self.add_listener(self.guard.observe)
+        self.stats = EconomyStats(self)
+        self.add_listener(self.stats.observe)
+        self.jobs = EconomyJobs(self)
+        self.replication = EconomyReplication(self)
         self.load_money()
         self._init_scoreboard()
         self._start_timers()
 
     def load_money(self):
-        try:
-            if os.path.exists(self.money_path):
-                with open(self.money_path, 'r', encoding='utf-8') as f: self.money_data = json.load(f)
-        except: self.money_data = {}
+        self.money_data = self.store.load()
     def save_money(self):
-        try:
-            os.makedirs(os.path.dirname(self.money_path), exist_ok=True)
-            with open(self.money_path, 'w', encoding='utf-8') as f: json.dump(self.money_data, f, indent=2, ensure_ascii=False)
-        except: pass
+        """全量快照(压缩账本), 日常变动走 _persist 追加"""
+        self.store.compact(self.money_data, background=False)
+    def _persist(self, name: str):
+        self.store.append(name, self.money_data[name])
+    def _persist_many(self, names):
+        self.store.append_many({n: self.money_data[n] for n in names})
+    def close(self):
+        self.importer.close(); self.stats.close(); self.replication.close()
+        self.ranking.batch_save(background=False)
+        self.store.close(self.money_data)
 
     def _init_scoreboard(self):
         if not self.config.is_scoreboard: return
@@ -190,15 +241,69 @@ class EconomySystem:
                 self.plugin.server.dispatch_command(CommandSenderWrapper(self.plugin.server.command_sender), f"scoreboard objectives add {sb} dummy")
         except: pass
 
+    # ── 计分板镜像 ────────────────────────────────────────
+    def _objective(self):
+        name = self.config.scoreboard_name
+        obj = self._objectives.get(name)
+        if obj is None:
+            try: obj = self.plugin.server.scoreboard.get_objective(name)
+            except Exception: obj = None
+            if obj is not None: self._objectives[name] = obj
+        return obj
+
+    def _sb_read(self, p: Player) -> float:
+        """直接读取计分板(绕过镜像), 仅用于镜像未命中与校准"""
+        obj = self._objective()
+        if obj is None: return 0.0
+        try:
+            score = obj.get_score(p)
+            return float(score.value) if score.is_score_set else 0.0
+        except Exception:
+            self._objectives.pop(self.config.scoreboard_name, None)  # 句柄失效(计分板被删除重建)
+            return 0.0
+
+    def reconcile_mirror(self, p: Player) -> float:
+        """以计分板为准校准镜像(其他插件/命令可能直接改了分数)"""
+        old = self._last_known(p.name)
+        v = self._sb_read(p); self._sb_mirror[p.name] = v
+        self._expect(p.name, False)   # 校准只同步本地视图, 不是新的余额变动, 不跨服发布
+        self._emit(p.name, old, v)
+        return v
+
+    # ── 变动事件 ──────────────────────────────────────────
+    def add_listener(self, fn: Callable[[str, float, float], None]):
+        self._listeners.append(fn)
+    def remove_listener(self, fn: Callable[[str, float, float], None]):
+        if fn in self._listeners: self._listeners.remove(fn)
+    def _emit(self, name: str, old: float, new: float):
+        for fn in self._listeners:
+            try: fn(name, old, new)
+            except Exception as e: plugin_print(f"[Economy] 余额监听器异常: {e}", "WARNING")
+    def _expect(self, name: str, publish):
+        """声明下一次 name 的变动事件如何跨服发布, 见 _commit"""
+        rep = getattr(self, "replication", None)
+        if rep is not None and rep.enabled: rep.expect(name, publish)
+    def add_bulk_listener(self, fn: Callable[[Dict[str, float]], None]):
+        self._bulk_listeners.append(fn)
+    def remove_bulk_listener(self, fn: Callable[[Dict[str, float]], None]):
+        if fn in self._bulk_listeners: self._bulk_listeners.remove(fn)
+    def _emit_bulk(self, changes: Dict[str, float]):
+        for fn in self._bulk_listeners:
+            try: fn(changes)
+            except Exception as e: plugin_print(f"[Economy] 批量变动监听器异常: {e}", "WARNING")
+    def _last_known(self, name: str) -> float:
+        """事件中的旧值: 计分板模式下离线玩家以排行榜记录的最后一次观测值为准"""
+        if self.config.is_scoreboard:
+            v = self._sb_mirror.get(name)
+            return v if v is not None else self.ranking.get(name, 0.0)
+        return self.money_data.get(name, 0.0)
+
     # ── 内部 API ──────────────────────────────────────────
     def get_money_internal(self, target):
         if isinstance(target, Player):
             if self.config.is_scoreboard:
-                try:
-                    for obj in target.scoreboard.objectives:
-                        if obj.name == self.config.scoreboard_name: return float(obj.get_score(target).value)
-                except: pass
-                return 0.0
+                v = self._sb_mirror.get(target.name)
+                return v if v is not None else self.reconcile_mirror(target)
             return self.money_data.get(target.name, 0.0)
         return self.money_data.get(str(target), 0.0)
 
@@ -207,63 +312,127 @@ class EconomySystem:
 
     def _sb_set(self, p: Player, amt: float):
         self._cmd(f'scoreboard players set "{p.name}" {self.config.scoreboard_name} {int(amt)}')
+        self._sb_mirror[p.name] = float(int(amt))
+
+    def _sb_write(self, p: Player, amt: float):
+        """经缓存的 Objective 句柄直接写分数, 省去命令解析; 句柄不可用时退回 _sb_set"""
+        obj = self._objective()
+        try: obj.get_score(p).value = int(amt); self._sb_mirror[p.name] = float(int(amt))
+        except Exception:
+            self._objectives.pop(self.config.scoreboard_name, None); self._sb_set(p, amt)
+
+    def _commit(self, target, old: float, new: float, publish=None):
+        """唯一的单账户写入口: 写计分板或存储, 然后派发变动事件
+        publish 决定跨服同步发布的内容: None 按 new - old 增量; False 不发布; (覆盖值 | None, 增量, 覆盖时间毫秒)"""
+        if publish is not None: self._expect(target.name if isinstance(target, Player) else str(target), publish)
+        if isinstance(target, Player) and self.config.is_scoreboard:
+            self._sb_set(target, new); self._emit(target.name, old, self._sb_mirror[target.name])
+        else:
+            name = target.name if isinstance(target, Player) else str(target)
+            self.money_data[name] = new; self._persist(name); self._emit(name, old, new)
 
     def add_money_internal(self, target, amount: float):
-        name = target.name if isinstance(target, Player) else str(target)
-        if isinstance(target, Player) and self.config.is_scoreboard:
-            self._sb_set(target, self.get_money_internal(target) + amount)
-        else: self.money_data[name] = self.money_data.get(name, 0.0) + amount; self.save_money()
+        cur = self.get_money_internal(target)
+        self._commit(target, cur, cur + amount)
 
     def reduce_money_internal(self, target, amount: float) -> bool:
-        name = target.name if isinstance(target, Player) else str(target)
         cur = self.get_money_internal(target)
         if cur >= amount:
-            if isinstance(target, Player) and self.config.is_scoreboard:
-                self._sb_set(target, cur - amount)
-            else: self.money_data[name] = cur - amount; self.save_money()
+            self._commit(target, cur, cur - amount)
             return True
         return False
 
     def set_money_internal(self, target, amount: float):
-        name = target.name if isinstance(target, Player) else str(target)
-        if isinstance(target, Player) and self.config.is_scoreboard: self._sb_set(target, amount)
-        else: self.money_data[name] = amount; self.save_money()
+        self._commit(target, self.get_money_internal(target), amount, (float(amount), 0.0, int(time.time() * 1000)))
 
     # ── 公开 API ──────────────────────────────────────────
     def get_money(self, name: str) -> float:
-        p = self.plugin.server.get_player(name)
-        return self.get_money_internal(p) if p else self.money_data.get(name, 0.0)
+        return self.get_money_internal(self.plugin.server.get_player(name) or name)
     def add_money(self, name: str, amount: float):
-        p = self.plugin.server.get_player(name)
-        if p: self.add_money_internal(p, amount)
-        else: self.money_data[name] = self.money_data.get(name, 0.0) + amount; self.save_money()
+        self.add_money_internal(self.plugin.server.get_player(name) or name, amount)
     def reduce_money(self, name: str, amount: float) -> bool:
-        p = self.plugin.server.get_player(name)
-        if p: return self.reduce_money_internal(p, amount) if self.get_money_internal(p) >= amount else False
-        if self.money_data.get(name, 0.0) >= amount: self.money_data[name] -= amount; self.save_money(); return True
-        return False
+        return self.reduce_money_internal(self.plugin.server.get_player(name) or name, amount)
     def set_money(self, name: str, amount: float):
-        p = self.plugin.server.get_player(name)
-        if p: self.set_money_internal(p, amount)
-        else: self.money_data[name] = amount; self.save_money()
+        self.set_money_internal(self.plugin.server.get_player(name) or name, amount)
+
+    # ── 批量 API ──────────────────────────────────────────
+    BATCH_OPS = ("add", "reduce", "set")
+
+    def apply_batch(self, ops: List[dict], source: str = "batch", history: bool = True, replicate: bool = True) -> List[dict]:
+        """批量执行 [{"op": "add"|"reduce"|"set", "name": str, "amount": 数值}, ...]
+        整批先按顺序模拟校验(同一账户多条操作累计计算), 任一条失败则全部不执行;
+        通过后每个账户只写一次余额、派发一次变动事件, 持久化一次;
+        计分板模式下离线账户无法读写分数, 其操作不做余额校验, 整批通过后折叠进信箱(结果带 "queued"), 上线时入账;
+        replicate=False 时不跨服发布(如导入, 各服各自导入同一份数据)
+        返回与 ops 等长的结果列表: {"name", "op", "amount", "ok", "balance" | "error"}"""
+        online = {p.name: p for p in self.plugin.server.online_players}
+        balances: Dict[str, float] = {}; before: Dict[str, float] = {}
+        sets: Dict[str, list] = {}  # 含 set 的账户 → [覆盖值, 其后的净增量], 跨服按绝对值发布
+        queued: List[tuple] = []    # 计分板模式下离线账户的操作 (名称, 操作, 数额)
+        results: List[dict] = []; failed = False
+        for op in ops:
+            kind, name, amt = op.get("op"), str(op.get("name", "")), op.get("amount")
+            res = {"name": name, "op": kind, "amount": amt, "ok": False}; results.append(res)
+            if kind not in self.BATCH_OPS: res["error"] = "bad_op"
+            elif not name: res["error"] = "bad_name"
+            elif isinstance(amt, bool) or not isinstance(amt, (int, float)) or amt != amt or amt in (float("inf"), float("-inf")): res["error"] = "bad_amount"
+            elif amt < 0 or (amt == 0 and kind != "set"): res["error"] = "bad_amount"
+            elif self.config.is_scoreboard and name not in online:
+                queued.append((name, kind, amt)); res["ok"] = True; res["queued"] = True
+            else:
+                if name not in balances:
+                    balances[name] = before[name] = self.get_money_internal(online[name]) if name in online else self.money_data.get(name, 0.0)
+                cur = balances[name]
+                if kind == "reduce" and cur < amt: res["error"] = "not_enough"
+                else:
+                    balances[name] = cur + amt if kind == "add" else cur - amt if kind == "reduce" else float(amt)
+                    if kind == "set": sets[name] = [float(amt), 0.0]
+                    elif name in sets: sets[name][1] += amt if kind == "add" else -amt
+                    res["ok"] = True; res["balance"] = balances[name]
+            failed = failed or not res["ok"]
+        if failed:
+            for res in results:
+                if res["ok"]: res["ok"] = False; res.pop("balance", None); res.pop("queued", None); res["error"] = "aborted"
+            return results
+        stored = []
+        for name, val in balances.items():
+            p = online.get(name)
+            if p is not None and self.config.is_scoreboard: self._sb_write(p, val)
+            else: self.money_data[name] = val; stored.append(name)
+        self._persist_many(stored)
+        if queued: self.mailbox.add_many(queued, remote=not replicate)
+        if history: self.history.add_many([(r["name"], f"{source} {'+' if r['op'] == 'add' else '-' if r['op'] == 'reduce' else '='}{r['amount']}") for r in results])
+        now = int(time.time() * 1000); self.source = source
+        try:
+            for name, old in before.items():
+                if not replicate: self._expect(name, False)
+                elif name in sets: self._expect(name, (sets[name][0], sets[name][1], now))
+                self._emit(name, old, self.get_money_internal(online[name]) if name in online else self.money_data[name])
+        finally: self.source = None
+        return results
 
     def on_player_join(self, player: Player):
         name = player.name
         if self.config.is_scoreboard:
-            if self.get_money_internal(player) == 0 and name not in self.money_data: self._sb_set(player, 0)
-        elif name not in self.money_data: self.money_data[name] = 0.0; self.save_money()
-        self.offline_cache.apply(player, self)
-        self.notify.apply(player)
-        self.ranking.update(name, self.get_money_internal(player))
+            if self.reconcile_mirror(player) == 0 and name not in self.money_data: self._sb_set(player, 0)
+        elif name not in self.money_data: self._commit(player, 0.0, 0.0)
+        self.mailbox.apply(player, self)
+
+    def on_player_quit(self, player: Player):
+        self._sb_mirror.pop(player.name, None)
 
     def _start_timers(self):
-        def sample():
-            for p in self.plugin.server.online_players:
-                if not p.name.endswith("_sp"):
-                    try: self.ranking.update(p.name, float(self.get_money_internal(p)))
-                    except: pass
-        self.plugin.server.scheduler.run_task(self.plugin, sample, 600, 600)
         self.plugin.server.scheduler.run_task(self.plugin, self.ranking.batch_save, 1200, 1200)
+        self.plugin.server.scheduler.run_task(self.plugin, lambda: self.store.maybe_compact(self.money_data), 6000, 6000)
+        self.plugin.server.scheduler.run_task(self.plugin, self.history.archive, 1200, 72000)
+        def reconcile():
+            if not self.config.is_scoreboard: return
+            for p in self.plugin.server.online_players:
+                if p.name in self._sb_mirror: self.reconcile_mirror(p)
+        self.plugin.server.scheduler.run_task(self.plugin, reconcile, 2400, 2400)
+        # 统计基准: 启动后立即精确重算一次, 之后每小时校准
+        self.stats.recompute()
+        self.plugin.server.scheduler.run_task(self.plugin, self.stats.recompute, 72000, 72000)
 
     def _rp_enabled(self):
         return self.plugin.config_manager.config_data.get("RedPacket", {}).get("EnabledModule", False)
@@ -360,14 +529,27 @@ class EconomySystem:
                         self.history.add(tname, f"← {cp.name}: +{recv} {coin}")
                         cp.send_message(tr("economy.send_success", amt, "→", tname))
                         tg.send_message(tr("economy.receive_from", cp.name, recv, coin)+(f" {tr('economy.transfer_note', note)}" if note else ""))
-                        self.ranking.update(cp.name, self.get_money_internal(cp))
-                        self.ranking.update(tname, self.get_money_internal(tg))
                     self._gui_player(cp)
                 cfm = MessageForm(title=tr("economy.confirm_title"), content=f"§7→ §a{tname}\n§7{tr('economy.amount_label')}: §e{amt}\n§7Tax: §c{tax}\n§7→ §a{recv} {coin}"+(f"\n{tr('economy.transfer_note', note)}" if note else ""), button1=tr("economy.confirm_btn"), button2=tr("economy.cancel_btn"))
                 cfm.on_submit = conf; p.send_form(cfm)
             except: self._gui_player(p)
         fm.on_submit = cb; p.send_form(fm)
 
+    def _pick_known(self, p: Player, name: str, then: Callable[[str], None], back: Callable[[], None]):
+        """离线目标校验: 登记表中精确命中(不区分大小写)直接继续, 否则列出前缀候选; 从未进服的名称直接拒绝"""
+        reg = getattr(self.plugin, "players", None)
+        if reg is None: then(name); return
+        real = reg.resolve(name)
+        if real: then(real); return
+        cands = reg.complete(name)
+        if not cands: p.send_message(tr("economy.unknown_player", name)); back(); return
+        f = ActionForm(title=tr("economy.did_you_mean_title"), content=tr("economy.did_you_mean", name))
+        for c in cands: f.add_button(f"§a{c}")
+        def cb(_, idx):
+            if idx is None: back(); return
+            then(cands[idx])
+        f.on_submit = cb; p.send_form(f)
+
     def _offline_transfer(self, p: Player):
         coin = self.config.coin_name; my = int(self.get_money_internal(p))
         tax_cfg = self.config.pay_tax_rate; ti = TaxCalculator.calc(0, my, tax_cfg)
@@ -382,48 +564,73 @@ class EconomySystem:
             data = json.loads(data) if isinstance(data, str) else data
             tname = str(data[0]).strip(); amt_s = str(data[1]).strip().lower(); note = str(data[2]).strip()
             if not tname: p.send_message(tr("economy.need_player_name")); return
-            if tname == p.name: p.send_message(tr("economy.cannot_self")); return
-            if self.plugin.server.get_player(tname): p.send_message(tr("economy.offline_target_online")); return
-            myb = int(self.get_money_internal(p)); amt = myb if amt_s == "all" else (int(amt_s) if amt_s.isdigit() else 0)
-            if amt <= 0: p.send_message(tr("economy.must_positive")); return
-            trs = TaxCalculator.calc(amt, myb, tax_cfg); tax = trs["tax"]; recv = amt - tax
-            if recv <= 0: p.send_message(tr("economy.tax_too_high")); return
-            if myb < amt: p.send_message(tr("economy.not_enough")); return
-            def conf(cp, ok):
-                if ok and self.reduce_money_internal(cp, amt):
-                    self.offline_cache.add(tname, "add", recv, note)
-                    self.history.add(cp.name, f"→ {tname}(offline): -{amt} {coin}")
-                    cp.send_message(f"§a{tr('economy.send_success', amt, '→', tname)}")
-                    self.notify.send(tname, tr("economy.receive_from", cp.name, recv, coin))
-                self._gui_player(cp)
-            cfm = MessageForm(title=tr("economy.confirm_offline_title"), content=f"§7→ §c{tname}(offline)\n§7{tr('economy.amount_label')}: §e{amt}\n§7Tax: §c{tax}\n§7→ §a{recv} {coin}\n\n{tr('economy.offline_warn')}"+(f"\n{tr('economy.transfer_note', note)}" if note else ""), button1=tr("economy.confirm_btn2"), button2=tr("economy.cancel_btn"))
-            cfm.on_submit = conf; p.send_form(cfm)
+            def go(tname):
+                if tname == p.name: p.send_message(tr("economy.cannot_self")); return
+                if self.plugin.server.get_player(tname): p.send_message(tr("economy.offline_target_online")); return
+                myb = int(self.get_money_internal(p)); amt = myb if amt_s == "all" else (int(amt_s) if amt_s.isdigit() else 0)
+                if amt <= 0: p.send_message(tr("economy.must_positive")); return
+                trs = TaxCalculator.calc(amt, myb, tax_cfg); tax = trs["tax"]; recv = amt - tax
+                if recv <= 0: p.send_message(tr("economy.tax_too_high")); return
+                if myb < amt: p.send_message(tr("economy.not_enough")); return
+                def conf(cp, ok):
+                    if ok and self.reduce_money_internal(cp, amt):
+                        self.mailbox.add(tname, "add", recv, note, tr("economy.receive_from", cp.name, recv, coin))
+                        self.history.add(cp.name, f"→ {tname}(offline): -{amt} {coin}")
+                        cp.send_message(f"§a{tr('economy.send_success', amt, '→', tname)}")
+                    self._gui_player(cp)
+                cfm = MessageForm(title=tr("economy.confirm_offline_title"), content=f"§7→ §c{tname}(offline)\n§7{tr('economy.amount_label')}: §e{amt}\n§7Tax: §c{tax}\n§7→ §a{recv} {coin}\n\n{tr('economy.offline_warn')}"+(f"\n{tr('economy.transfer_note', note)}" if note else ""), button1=tr("economy.confirm_btn2"), button2=tr("economy.cancel_btn"))
+                cfm.on_submit = conf; p.send_form(cfm)
+            self._pick_known(p, tname, go, lambda: self._gui_player(p))
         fm.on_submit = cb; p.send_form(fm)
 
-    def _show_history(self, p: Player, name: str):
-        coin = self.config.coin_name; entries = self.history.get_recent(name, 50)
+    HISTORY_PAGE_SIZE = 20
+
+    def _show_history(self, p: Player, name: str, page: int = 0):
+        coin = self.config.coin_name; size = self.HISTORY_PAGE_SIZE
+        entries = self.history.query(name, page, size + 1)  # 多取一条判断是否有下一页
+        has_next = len(entries) > size; entries = entries[:size]
         content = "\n".join([f"§7[{k[:16]}]§r {v}" for k, v in entries]) if entries else tr("economy.no_history")
-        f = ActionForm(title=tr("economy.history_title", name, coin), content=content)
+        f = ActionForm(title=tr("economy.history_title", name, coin) + (f" §8[{tr('economy.page', page + 1)}]" if page or has_next else ""), content=content)
+        buttons = []
+        if page > 0: f.add_button(tr("economy.prev_page")); buttons.append(page - 1)
+        if has_next: f.add_button(tr("economy.next_page")); buttons.append(page + 1)
         f.add_button(tr("economy.back_btn"))
-        f.on_submit = lambda _, __: (self._gui_op(p) if p.is_op else self._gui_player(p)); p.send_form(f)
+        def cb(_, idx):
+            if idx is not None and idx < len(buttons): self._show_history(p, name, buttons[idx])
+            else: self._gui_op(p) if p.is_op else self._gui_player(p)
+        f.on_submit = cb; p.send_form(f)
 
-    def _ranking(self, p: Player):
-        coin = self.config.coin_name; my = int(self.get_money_internal(p))
-        top = self.ranking.get_top(50)
-        if not top: p.send_message(tr("economy.no_ranking")); return
-        total = sum(v for _, v in top)
-        def fmt(amt):
-            if amt >= 1e6: return f"{amt/1e6:.1f}M"
-            if amt >= 1e3: return f"{amt/1e3:.1f}K"
-            return str(int(amt))
-        content_lines = [tr("economy.ranking_total", fmt(total)), tr("economy.ranking_yours", fmt(my)), "§8"+"═"*20]
-        f = ActionForm(title=tr("economy.ranking_title", len(top)), content="\n".join(content_lines))
+    @staticmethod
+    def _fmt(amt):
+        if amt >= 1e6: return f"{amt/1e6:.1f}M"
+        if amt >= 1e3: return f"{amt/1e3:.1f}K"
+        return str(int(amt))
+
+    def _ranking_view(self):
+        """排行榜公共部分按 (排行榜版本, 语言, 货币名) 缓存; 版本只在前 N 名变化时递增"""
+        i18n = get_i18n()
+        key = (self.ranking.epoch, i18n.locale if i18n else "", self.config.coin_name)
+        if self._ranking_cache is not None and self._ranking_cache[0] == key: return self._ranking_cache
+        top = self.ranking.get_top(self.ranking.TOP_N)
+        total = sum(v for _, v in top); fmt = self._fmt
+        rows = []
         for i, (n, b) in enumerate(top):
             r = i+1; pfx = ["§b☆","§c◆","§a▣"][min(2,r-1)]
-            entry = f"§e[Me] {n}" if n == p.name else n
             pct = (b/total*100) if total > 0 else 0
-            f.add_button(f"{pfx} §l{r}. §r{entry}\n§c├: {fmt(b)} §a{pct:.1f}%")
-        f.add_button(tr("economy.back_btn"))
+            rows.append((n, f"{pfx} §l{r}. §r", f"\n§c├: {fmt(b)} §a{pct:.1f}%"))
+        buttons = [Button(head + n + tail) for n, head, tail in rows] + [Button(tr("economy.back_btn"))]
+        self._ranking_cache = (key, tr("economy.ranking_title", len(top)), tr("economy.ranking_total", fmt(total)), rows, buttons)
+        return self._ranking_cache
+
+    def _ranking(self, p: Player):
+        _, title, total_line, rows, buttons = self._ranking_view()
+        if not rows: p.send_message(tr("economy.no_ranking")); return
+        rank = self.ranking.rank_of(p.name)
+        content_lines = [total_line, tr("economy.ranking_yours", self._fmt(int(self.get_money_internal(p)))), tr("economy.ranking_rank", rank, len(self.ranking)), "§8"+"═"*20]
+        if rank is not None and rank <= len(rows):
+            n, head, tail = rows[rank - 1]
+            buttons = list(buttons); buttons[rank - 1] = Button(f"{head}§e[Me] {n}{tail}")
+        f = ActionForm(title=title, content="\n".join(content_lines), buttons=buttons)
         f.on_submit = lambda _, __: self.open_money_gui(p); p.send_form(f)
 
     def _op_select(self, admin: Player, op: str, label: str):
@@ -464,7 +671,7 @@ class EconomySystem:
                     if self.reduce_money_internal(t, amt): admin.send_message(tr("economy.admin_take", t.name, amt, coin)); self.history.add(t.name, f"admin -{amt}"); t.send_message(tr("economy.admin_take", t.name, amt, coin))
                     else: admin.send_message(tr("economy.not_enough"))
                 elif op == "set": self.set_money_internal(t, amt); admin.send_message(tr("economy.admin_set_to", t.name, coin, amt)); self.history.add(t.name, f"admin ={amt}"); t.send_message(tr("economy.admin_set_to", t.name, coin, amt))
-                self.ranking.update(t.name, self.get_money_internal(t)); self._gui_op(admin)
+                self._gui_op(admin)
             fm.on_submit = cb; admin.send_form(fm)
 
     def _op_offline(self, admin: Player):
@@ -484,43 +691,86 @@ class EconomySystem:
             amt = int(amt_s)
             ops = ["add","reduce","set"]; op = ops[op_idx]
             if op != "set" and amt <= 0: admin.send_message(tr("economy.must_positive")); return
-            if self.plugin.server.get_player(tname): admin.send_message(tr("economy.offline_target_online")); return
-            def conf(cp, ok):
-                if ok:
-                    self.offline_cache.add(tname, op, amt, note)
-                    self.history.add(tname, f"admin({cp.name}) {op}: {amt} {coin}")
-                    cp.send_message(f"§a{tr('economy.offline_cached', tname)}")
-                self._gui_op(cp)
-            cfm = MessageForm(title=tr("economy.confirm_admin_title"), content=f"§7→ §c{tname}(offline)\n§7{tr('economy.op_type_label')}: §e{op}\n§7{tr('economy.amount_label')}: §e{amt} {coin}"+(f"\n{tr('economy.transfer_note', note)}" if note else ""), button1=tr("economy.confirm_btn2"), button2=tr("economy.cancel_btn"))
-            cfm.on_submit = conf; admin.send_form(cfm)
+            def go(tname):
+                if self.plugin.server.get_player(tname): admin.send_message(tr("economy.offline_target_online")); return
+                def conf(cp, ok):
+                    if ok:
+                        self.mailbox.add(tname, op, amt, note)
+                        self.history.add(tname, f"admin({cp.name}) {op}: {amt} {coin}")
+                        cp.send_message(f"§a{tr('economy.offline_cached', tname)}")
+                    self._gui_op(cp)
+                cfm = MessageForm(title=tr("economy.confirm_admin_title"), content=f"§7→ §c{tname}(offline)\n§7{tr('economy.op_type_label')}: §e{op}\n§7{tr('economy.amount_label')}: §e{amt} {coin}"+(f"\n{tr('economy.transfer_note', note)}" if note else ""), button1=tr("economy.confirm_btn2"), button2=tr("economy.cancel_btn"))
+                cfm.on_submit = conf; admin.send_form(cfm)
+            self._pick_known(admin, tname, go, lambda: self._gui_op(admin))
         fm.on_submit = cb; admin.send_form(fm)
 
     def handle_moneys_command(self, sender, args: list) -> bool:
         coin = self.config.coin_name
-        if len(args) < 2: sender.send_message(f"§c/moneys <add|del|set|get|history> <player> [amount]"); return True
+        if args and args[0].lower() == "import": self.importer.handle(sender, args[1:]); return True
+        if args and args[0].lower() == "job": self.jobs.handle(sender, args[1:]); return True
+        if args and args[0].lower() == "stats": self.stats.handle(sender, args[1:]); return True
+        if args and args[0].lower() == "sync":
+            if not self.replication.enabled: sender.send_message(tr("economy.sync_disabled")); return True
+            st = self.replication.status()
+            sender.send_message(tr("economy.sync_status", st["node"], st["transport"], st["sent"], st["received"], st["duplicates"], st["outbox"], st["inbox"], st["superseded"])); return True
+        if len(args) < 2: sender.send_message(f"§c/moneys <add|del|set|get|history|batch|import|job|stats|sync> <player> [amount|page]"); return True
         op = args[0].lower(); tname = args[1]
+        if op == "batch": return self._batch_command(sender, args[1:])
         tg = self.plugin.server.get_player(tname)
         if op == "get":
             bal = self.get_money(tname); sender.send_message(tr("economy.player_balance", tname, int(bal))); return True
         if op == "history":
-            if isinstance(sender, Player): self._show_history(sender, tname)
+            # /moneys history <player> [page] [YYYY-MM-DD起] [YYYY-MM-DD止]
+            page = max(0, int(args[2]) - 1) if len(args) > 2 and args[2].isdigit() else 0
+            since = args[3] if len(args) > 3 else ""; until = args[4] if len(args) > 4 else ""
+            if isinstance(sender, Player) and not since and not until: self._show_history(sender, tname, page)
             else:
-                for k, v in self.history.get_recent(tname, 10): sender.send_message(f"  [{k[:16]}] {v}")
+                entries = self.history.query(tname, page, 10, since, until)
+                if not entries: sender.send_message(tr("economy.no_history"))
+                for k, v in entries: sender.send_message(f"  [{k[:16]}] {v}")
             return True
         if len(args) < 3: sender.send_message(f"§c/moneys {op} <player> <amount>"); return True
         try: amt = int(args[2])
         except: sender.send_message(tr("economy.need_number")); return True
         if op == "add":
-            if tg: self.add_money_internal(tg, amt); sender.send_message(tr("economy.admin_give", tname, amt, coin)); self.history.add(tname, f"admin +{amt}"); tg.send_message(tr("economy.admin_give", tname, amt, coin)); self.ranking.update(tname, self.get_money_internal(tg))
-            else: self.offline_cache.add(tname, "add", amt); sender.send_message(tr("economy.offline_cached", tname))
+            if tg: self.add_money_internal(tg, amt); sender.send_message(tr("economy.admin_give", tname, amt, coin)); self.history.add(tname, f"admin +{amt}"); tg.send_message(tr("economy.admin_give", tname, amt, coin))
+            else: self.mailbox.add(tname, "add", amt); sender.send_message(tr("economy.offline_cached", tname))
         elif op == "del":
             if amt <= 0: sender.send_message(tr("economy.must_positive")); return True
             if tg:
-                if self.reduce_money_internal(tg, amt): sender.send_message(tr("economy.admin_take", tname, amt, coin)); self.history.add(tname, f"admin -{amt}"); tg.send_message(tr("economy.admin_take", tname, amt, coin)); self.ranking.update(tname, self.get_money_internal(tg))
+                if self.reduce_money_internal(tg, amt): sender.send_message(tr("economy.admin_take", tname, amt, coin)); self.history.add(tname, f"admin -{amt}"); tg.send_message(tr("economy.admin_take", tname, amt, coin))
                 else: sender.send_message(tr("economy.not_enough"))
-            else: self.offline_cache.add(tname, "reduce", amt); sender.send_message(tr("economy.offline_cached", tname))
+            else: self.mailbox.add(tname, "reduce", amt); sender.send_message(tr("economy.offline_cached", tname))
         elif op == "set":
             if amt < 0: sender.send_message(tr("economy.must_nonneg")); return True
-            if tg: self.set_money_internal(tg, amt); sender.send_message(tr("economy.admin_set_to", tname, coin, amt)); self.history.add(tname, f"admin ={amt}"); tg.send_message(tr("economy.admin_set_to", tname, coin, amt)); self.ranking.update(tname, amt)
-            else: self.offline_cache.add(tname, "set", amt); sender.send_message(tr("economy.offline_cached", tname))
+            if tg: self.set_money_internal(tg, amt); sender.send_message(tr("economy.admin_set_to", tname, coin, amt)); self.history.add(tname, f"admin ={amt}"); tg.send_message(tr("economy.admin_set_to", tname, coin, amt))
+            else: self.mailbox.add(tname, "set", amt); sender.send_message(tr("economy.offline_cached", tname))
+        return True
+
+    def _batch_command(self, sender, args: list) -> bool:
+        """/moneys batch <add|del|set> <amount> <p1,p2,...|@online>"""
+        coin = self.config.coin_name
+        if len(args) < 3 or args[0].lower() not in ("add", "del", "set"):
+            sender.send_message("§c/moneys batch <add|del|set> <amount> <player1,player2,...|@online>"); return True
+        kind = {"add": "add", "del": "reduce", "set": "set"}[args[0].lower()]
+        try: amt = int(args[1])
+        except: sender.send_message(tr("economy.need_number")); return True
+        spec = " ".join(args[2:])
+        if spec == "@online": names = [p.name for p in self.plugin.server.online_players if not p.name.endswith("_sp")]
+        else: names = list(dict.fromkeys(n.strip() for n in spec.split(",") if n.strip()))
+        if not names: sender.send_message(tr("economy.batch_empty")); return True
+        results = self.apply_batch([{"op": kind, "name": n, "amount": amt} for n in names], "admin")
+        bad = [r for r in results if r.get("error") not in (None, "aborted")]
+        if bad:
+            for r in bad[:10]: sender.send_message(tr("economy.batch_failed_op", r["name"], r["error"]))
+            sender.send_message(tr("economy.batch_aborted", len(bad))); return True
+        online = {p.name: p for p in self.plugin.server.online_players}
+        for r in results:
+            tg = online.get(r["name"])
+            if tg is None: continue
+            if kind == "set": tg.send_message(tr("economy.admin_set_to", r["name"], coin, amt))
+            else: tg.send_message(tr("economy.admin_give" if kind == "add" else "economy.admin_take", r["name"], amt, coin))
+        sender.send_message(tr("economy.batch_done", len(results), coin))
+        queued = sum(1 for r in results if r.get("queued"))
+        if queued: sender.send_message(tr("economy.batch_queued", queued))
         return True
@@ -0,0 +1,242 @@
+"""
+YEssential Economy Accounts - 紧凑账户表
+Economy.storage = "compact" 时启用: 余额以 int64 最小单位(1/100)存于内存映射的 accounts.bin,
+玩家名追加写入 accounts.names; 名称 → 序号的开放寻址哈希表首次查询时才构建, 每账户常驻内存约 16 字节
+"""
+import os, mmap, math, hashlib
+from array import array
+from collections.abc import MutableMapping
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .log import plugin_print
+
+MAGIC = int.from_bytes(b"YEACCT01", "little", signed=True)
+SCALE = 100                 # 1 单位 = 0.01
+_REC = 3                    # 每条记录 3 个 int64: 名称哈希, 名称偏移, 余额
+_HDR = 2                    # 头部占 2 条记录: MAGIC, 账户数, 名称文件长度, 已删除数
+DELETED = -(1 << 63)
+_LIMIT = (1 << 63) - 1
+
+
+def name_hash(name: str) -> int:
+    return int.from_bytes(hashlib.blake2b(name.encode("utf-8"), digest_size=8).digest(), "little", signed=True)
+
+
+def to_units(value: float) -> int:
+    v = float(value)
+    if not math.isfinite(v): raise ValueError(f"invalid balance: {value}")
+    return max(-_LIMIT, min(_LIMIT, round(v * SCALE)))
+
+
+class AccountTable(MutableMapping):
+    """与 Dict[str, float] 同接口的账户表, 同时实现 MoneyLedger 的存储接口(load/append/compact/close)
+    写入直接落在映射页上, 记录数最后更新, 崩溃时多出的半条名称在下次打开时截掉"""
+    GROW = 4096      # 每次至少扩容的记录数
+    HOT_MAX = 4096   # 名称 → 序号 热点缓存上限(在线玩家)
+
+    def __init__(self, data_folder: str):
+        self.data_folder = data_folder
+        self.path = os.path.join(data_folder, "accounts.bin")
+        self.names_path = os.path.join(data_folder, "accounts.names")
+        self._fp = self._mm = self._mv = None
+        self._names_fp = self._names_mm = None
+        self._slots: Optional[array] = None   # 值为 序号+1, 0 表示空槽
+        self._hot: Dict[str, int] = {}
+
+    # ── 文件映射 ────────────────────────────────────────
+    def _map(self):
+        self._mm = mmap.mmap(self._fp.fileno(), 0)
+        self._mv = memoryview(self._mm).cast('q')
+
+    def _unmap(self):
+        if self._mv is not None: self._mv.release(); self._mv = None
+        if self._mm is not None: self._mm.flush(); self._mm.close(); self._mm = None
+
+    def _open(self):
+        if self._mm is not None: return
+        os.makedirs(self.data_folder, exist_ok=True)
+        if not os.path.exists(self.path):
+            with open(self.path, 'wb') as f:
+                head = array('q', [0] * (self.GROW * _REC)); head[0] = MAGIC
+                f.write(head.tobytes())
+            open(self.names_path, 'wb').close()
+        self._fp = open(self.path, 'r+b'); self._map()
+        if self._mv[0] != MAGIC:
+            self._unmap(); self._fp.close(); self._fp = None
+            raise ValueError(f"{self.path} 不是有效的账户表")
+        self._names_fp = open(self.names_path, 'a+b')
+        end = self._mv[2]
+        if os.path.getsize(self.names_path) > end: self._names_fp.truncate(end)
+
+    def _grow(self, records: int):
+        cap = len(self._mv) // _REC
+        if records <= cap: return
+        self._unmap()
+        self._fp.truncate(max(records, cap * 2, cap + self.GROW) * _REC * 8)
+        self._map()
+
+    def _name_at(self, off: int) -> str:
+        mm = self._names_mm
+        if mm is None or off >= len(mm):
+            if mm is not None: mm.close()
+            self._names_mm = mm = mmap.mmap(self._names_fp.fileno(), 0, access=mmap.ACCESS_READ)
+        return mm[off:mm.find(b"\n", off)].decode("utf-8")
+
+    @property
+    def _count(self) -> int:
+        return self._mv[1]
+
+    # ── 索引 ────────────────────────────────────────────
+    def _build_index(self):
+        count = self._count
+        slots = array('q', bytes(8 << max(12, (count * 2).bit_length())))
+        mask = len(slots) - 1
+        hashes = self._mv[_HDR * _REC:(count + _HDR) * _REC:_REC].tolist()  # 哈希列一次拷出, 避免逐条索引映射区
+        for i, h in enumerate(hashes, 1):
+            j = h & mask
+            while slots[j]: j = (j + 1) & mask
+            slots[j] = i
+        self._slots = slots
+
+    def _find(self, name: str, h: Optional[int] = None) -> int:
+        i = self._hot.get(name)
+        if i is not None: return i
+        self._open()
+        if self._slots is None: self._build_index()
+        if h is None: h = name_hash(name)
+        slots, mv = self._slots, self._mv; mask = len(slots) - 1; j = h & mask
+        while True:
+            k = slots[j]
+            if not k: return -1
+            b = (k - 1 + _HDR) * _REC
+            if mv[b] == h and self._name_at(mv[b + 1]) == name:
+                if len(self._hot) >= self.HOT_MAX: self._hot.clear()
+                self._hot[name] = k - 1
+                return k - 1
+            j = (j + 1) & mask
+
+    def _insert(self, name: str, h: int) -> int:
+        data = name.encode("utf-8")
+        if b"\n" in data: raise ValueError(f"invalid account name: {name!r}")
+        i, end = self._count, self._mv[2]
+        self._names_fp.write(data + b"\n"); self._names_fp.flush()
+        self._grow(i + 1 + _HDR)
+        mv = self._mv; b = (i + _HDR) * _REC
+        mv[b], mv[b + 1], mv[b + 2] = h, end, 0
+        mv[2] = end + len(data) + 1
+        mv[1] = i + 1  # 提交点
+        if (i + 1) * 2 > len(self._slots): self._build_index()
+        else:
+            slots = self._slots; mask = len(slots) - 1; j = h & mask
+            while slots[j]: j = (j + 1) & mask
+            slots[j] = i + 1
+        return i
+
+    # ── Mapping 接口 ─────────────────────────────────────
+    def __getitem__(self, name: str) -> float:
+        i = self._find(name)
+        if i < 0: raise KeyError(name)
+        v = self._mv[(i + _HDR) * _REC + 2]
+        if v == DELETED: raise KeyError(name)
+        return v / SCALE
+
+    def __setitem__(self, name: str, value: float):
+        units = to_units(value)
+        h = name_hash(name)
+        i = self._find(name, h)
+        if i < 0: i = self._insert(name, h)
+        b = (i + _HDR) * _REC + 2
+        if self._mv[b] == DELETED: self._mv[3] -= 1
+        self._mv[b] = units
+
+    def __delitem__(self, name: str):
+        i = self._find(name)
+        if i < 0: raise KeyError(name)
+        b = (i + _HDR) * _REC + 2
+        if self._mv[b] == DELETED: raise KeyError(name)
+        self._mv[b] = DELETED; self._mv[3] += 1
+
+    def __contains__(self, name) -> bool:
+        i = self._find(name)
+        return i >= 0 and self._mv[(i + _HDR) * _REC + 2] != DELETED
+
+    def __len__(self) -> int:
+        self._open()
+        return self._count - self._mv[3]
+
+    def __iter__(self) -> Iterator[str]:
+        for name, _ in self.items(): yield name
+
+    def items(self) -> Iterator[Tuple[str, float]]:
+        """按开户顺序顺序扫描映射区, 不经过哈希索引"""
+        self._open()
+        for i in range(self._count):
+            b = (i + _HDR) * _REC
+            v = self._mv[b + 2]
+            if v != DELETED: yield self._name_at(self._mv[b + 1]), v / SCALE
+
+    def units(self, name: str) -> int:
+        """整数最小单位余额, 不存在时为 0"""
+        i = self._find(name)
+        v = self._mv[(i + _HDR) * _REC + 2] if i >= 0 else 0
+        return 0 if v == DELETED else v
+
+    def names(self) -> List[str]:
+        """按序号排列的全部名称(含已删除账户), 名称文件一次读出解码"""
+        self._open()
+        end = self._mv[2]
+        if not end: return []
+        self._names_fp.seek(0); blob = self._names_fp.read(end)
+        return blob.decode("utf-8").split("\n")[:self._count]
+
+    def column(self) -> memoryview:
+        """余额列的可写视图(按序号, 单位 1/SCALE, 已删除为 DELETED); 用完须 release, 否则无法扩容或关闭"""
+        self._open()
+        return self._mv[_HDR * _REC + 2:(self._count + _HDR) * _REC:_REC]
+
+    # ── 存储接口(与 MoneyLedger 相同) ─────────────────────
+    def load(self) -> "AccountTable":
+        fresh = not os.path.exists(self.path)
+        self._open()
+        if fresh: self._import_ledger()
+        return self
+
+    def _import_ledger(self):
+        """首次启用: 从 money.json + money.ledger 一次性导入, 名称一次写入, 记录一次扩容"""
+        from .economy import MoneyLedger
+        data = MoneyLedger(self.data_folder).load()
+        if not data: return
+        blob = bytearray(); rows = []
+        for name, val in data.items():
+            try: enc, units = name.encode("utf-8"), to_units(val)
+            except (ValueError, TypeError): continue
+            if b"\n" in enc: continue
+            rows.append((name_hash(name), len(blob), units)); blob += enc + b"\n"
+        self._names_fp.write(blob); self._names_fp.flush()
+        self._grow(len(rows) + _HDR)
+        mv = self._mv
+        for i, (h, off, units) in enumerate(rows):
+            b = (i + _HDR) * _REC; mv[b], mv[b + 1], mv[b + 2] = h, off, units
+        mv[2] = len(blob); mv[1] = len(rows)
+        self._mm.flush(); self._slots = None
+        plugin_print(f"[Economy] 已导入紧凑账户表: {len(rows)} 账户")
+
+    def append(self, name: str, value: float):
+        pass  # __setitem__ 已直接写入映射页
+
+    def append_many(self, items: Dict[str, float]):
+        pass
+
+    def compact(self, data=None, background: bool = True):
+        if self._mm is not None: self._mm.flush()
+
+    def maybe_compact(self, data=None):
+        self.compact()
+
+    def close(self, data=None):
+        self._unmap()
+        if self._names_mm is not None: self._names_mm.close(); self._names_mm = None
+        for fp in (self._fp, self._names_fp):
+            if fp is not None: fp.close()
+        self._fp = self._names_fp = None
+        self._slots = None; self._hot.clear()
@@ -0,0 +1,79 @@
+"""
+YEssential Economy Guard - 余额变动异常检测
+挂在 EconomySystem 的变动事件上, 每位玩家一个按秒分桶的环形窗口(变动次数 + 净流入),
+每次事件 O(1) 更新滑动合计; 超过 Economy.Guard 中的次数/金额阈值时通知在线 OP 并写日志
+"""
+import time
+from array import array
+from collections import OrderedDict
+
+from .i18n import tr
+from .log import plugin_print
+
+
+class _Window:
+    """window 秒的环形桶, ops/net 为窗口内合计"""
+    __slots__ = ("n", "v", "last", "ops", "net", "alerted")
+
+    def __init__(self, size: int, now: int):
+        self.n = array('i', [0] * size)
+        self.v = array('d', [0.0] * size)
+        self.last = now; self.ops = 0; self.net = 0.0
+        self.alerted = {}   # 告警类型 → 上次告警时间
+
+    def advance(self, now: int):
+        """清空 last 之后到 now 的过期桶; 整窗过期时直接归零, 顺带消除浮点累积误差"""
+        size = len(self.n)
+        if now - self.last >= size:
+            for i in range(size): self.n[i] = 0; self.v[i] = 0.0
+            self.ops = 0; self.net = 0.0; self.last = now; return
+        for s in range(self.last + 1, now + 1):
+            i = s % size
+            self.ops -= self.n[i]; self.net -= self.v[i]; self.n[i] = 0; self.v[i] = 0.0
+        if now > self.last: self.last = now
+
+    def push(self, now: int, delta: float):
+        self.advance(now)
+        i = now % len(self.n)
+        self.n[i] += 1; self.v[i] += delta; self.ops += 1; self.net += delta
+
+
+class EconomyGuard:
+    MAX_TRACKED = 4096  # 同时跟踪的玩家上限, 超出时淘汰最久未变动者
+
+    def __init__(self, economy):
+        self.economy = economy
+        self._win: "OrderedDict[str, _Window]" = OrderedDict()
+        self.alerts = 0
+
+    def _cfg(self) -> dict:
+        return self.economy.config.guard
+
+    def observe(self, name: str, old: float, new: float):
+        cfg = self._cfg()
+        if not cfg.get("enabled", True) or self.economy.source == "import": return  # 只跳过导入任务自身的写入, 导入期间的其他变动照常检测
+        now = int(time.monotonic())
+        w = self._win.get(name)
+        if w is None:
+            w = self._win[name] = _Window(max(1, int(cfg.get("window", 60))), now)
+            if len(self._win) > self.MAX_TRACKED: self._win.popitem(last=False)
+        else: self._win.move_to_end(name)
+        w.push(now, new - old)
+        if w.ops > cfg.get("max_ops", 30): self._alert(name, w, "rate", now, cfg)
+        if w.net > cfg.get("max_gain", 100000): self._alert(name, w, "volume", now, cfg)
+
+    def _alert(self, name: str, w: _Window, kind: str, now: int, cfg: dict):
+        if now - w.alerted.get(kind, -1 << 30) < cfg.get("cooldown", 300): return
+        w.alerted[kind] = now; self.alerts += 1
+        span = len(w.n); coin = self.economy.config.coin_name
+        msg = tr(f"economy.guard_{kind}", name, w.ops, f"{w.net:+.0f}", coin, span)
+        plugin_print(f"[Economy] 异常告警({kind}): {name} {span}s 内 {w.ops} 次变动, 净流入 {w.net:+.0f}", "WARNING")
+        for p in self.economy.plugin.server.online_players:
+            if p.is_op: p.send_message(msg)
+
+    def stats(self, name: str):
+        """(窗口内次数, 净流入), 未跟踪时为 (0, 0.0)"""
+        w = self._win.get(name)
+        if w is None: return 0, 0.0
+        w.advance(int(time.monotonic()))
+        return w.ops, w.net
@@ -0,0 +1,260 @@
+"""
+YEssential Economy History - 金钱历史记录
+每位玩家一个定长环形缓冲区(热数据) + history/YYYY-MM.jsonl 按月追加分段(冷数据)
+分段按需建立 玩家 → [(时间键, 偏移)] 的时间索引, 分页/日期区间查询只读命中的行
+往月分段由后台任务压缩为 YYYY-MM.jsonl.gz(有 compression.zstd 时为 .zst), 仅在查询命中时解压;
+热缓冲区与已加载的分段索引均按 LRU 限量, 常驻内存与服务器运行时长无关;
+写入只追加到热缓冲区(不在内存中的玩家建一个空的"不完整"缓冲区), 查询用到时才从分段回填
+"""
+import os, json, time, gzip, bisect, threading
+from collections import deque, OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from .log import plugin_print
+
+try: from compression import zstd as _zstd  # Python 3.14+
+except ImportError: _zstd = None
+ARCHIVE_EXT = ".jsonl.zst" if _zstd else ".jsonl.gz"
+
+
+def _open_archive(path: str, mode: str, ext: str = ""):
+    """按扩展名选择压缩格式; 写临时文件时由 ext 指定最终扩展名"""
+    return _zstd.open(path, mode) if (ext or path).endswith(".zst") else gzip.open(path, mode)
+
+
+def history_key() -> str:
+    return f"{time.strftime('%Y-%m-%d %H:%M:%S')}-{int(time.time()*1000)%1000:03d}"
+
+
+class _Segment:
+    """单个月份分段: 追加写入, 索引首次查询时扫描一次建立, 之后随追加增量维护
+    归档分段(.gz/.zst)只读, 查询时整段解压到内存, 被 LRU 淘汰时连同索引一起释放"""
+    def __init__(self, path: str):
+        self.path = path
+        self.archived = not path.endswith(".jsonl")
+        self._index: Optional[Dict[str, Tuple[List[str], List[int]]]] = None
+        self._data: Optional[bytes] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._index is not None
+
+    def release(self):
+        self._index = None; self._data = None
+
+    def _lines(self):
+        if self.archived:
+            if self._data is None:
+                with _open_archive(self.path, 'rb') as f: self._data = f.read()
+            return self._data.splitlines(keepends=True)
+        return open(self.path, 'rb') if os.path.exists(self.path) else []
+
+    def _build(self):
+        index: Dict[str, Tuple[List[str], List[int]]] = {}
+        lines = self._lines(); offset = 0
+        for line in lines:
+            try:
+                rec = json.loads(line)
+                keys, offs = index.setdefault(rec["p"], ([], []))
+                keys.append(rec["k"]); offs.append(offset)
+            except (ValueError, KeyError): pass
+            offset += len(line)
+        if hasattr(lines, "close"): lines.close()
+        self._index = index
+
+    def indexed(self, name: str, offset: int, key: str):
+        if self._index is None: return
+        keys, offs = self._index.setdefault(name, ([], []))
+        keys.append(key); offs.append(offset)
+
+    def offsets(self, name: str, since: str = "", until: str = "") -> List[int]:
+        if self._index is None: self._build()
+        keys, offs = self._index.get(name, ([], []))
+        lo = bisect.bisect_left(keys, since) if since else 0
+        hi = bisect.bisect_right(keys, until) if until else len(keys)
+        return offs[lo:hi]
+
+    def read(self, offsets: List[int]) -> List[Tuple[str, str]]:
+        out = []
+        if self.archived:
+            if self._data is None: self._build()
+            for off in offsets:
+                rec = json.loads(self._data[off:self._data.find(b"\n", off)])
+                out.append((rec["k"], rec["m"]))
+            return out
+        with open(self.path, 'rb') as f:
+            for off in offsets:
+                f.seek(off)
+                rec = json.loads(f.readline())
+                out.append((rec["k"], rec["m"]))
+        return out
+
+
+class MoneyHistory:
+    HOT_SIZE = 50         # 每位玩家热缓冲区条数
+    HOT_PLAYERS = 1024    # 保留热缓冲区的玩家数(LRU)
+    LOADED_SEGMENTS = 3   # 同时保留索引的往月分段数(LRU), 当月分段常驻
+
+    def __init__(self, data_folder: str):
+        self.path = os.path.join(data_folder, "money_history.json")
+        self.dir = os.path.join(data_folder, "history")
+        self._hot: "OrderedDict[str, deque]" = OrderedDict()
+        self._partial: set = set()   # 热缓冲区只含本次加载后新写入记录的玩家
+        self._segments: Dict[str, _Segment] = {}
+        self._loaded: "OrderedDict[str, None]" = OrderedDict()
+        self._archiving = threading.Lock()
+        self._archived: deque = deque()   # 后台已压缩完成、待主线程换入的 (月份, 归档路径, 明文路径)
+        self._fp = None
+        self._fp_month = ""
+        self.load()
+
+    # ── 存储 ────────────────────────────────────────────
+    def load(self):
+        os.makedirs(self.dir, exist_ok=True)
+        for fn in sorted(os.listdir(self.dir), key=lambda fn: fn.endswith(".jsonl")):
+            # 明文分段优先: 同月份两者并存说明上次归档在删除明文前中断, 归档会被重新生成
+            if fn.endswith((".jsonl", ".jsonl.gz", ".jsonl.zst")): self._segments[fn[:7]] = _Segment(os.path.join(self.dir, fn))
+        self._migrate_legacy()
+
+    def _migrate_legacy(self):
+        """旧版 money_history.json → 按月分段, 完成后改名为 .migrated"""
+        if not os.path.exists(self.path): return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f: legacy = json.load(f)
+            rows = sorted(((k, n, m) for n, entries in legacy.items() for k, m in entries.items()))
+            for k, n, m in rows: self._append(n, k, m)
+            self.save()
+            os.replace(self.path, self.path + ".migrated")
+            plugin_print(f"[Economy] 历史记录已迁移为按月分段: {len(rows)} 条")
+        except Exception as e: plugin_print(f"[Economy] 历史记录迁移失败: {e}", "WARNING")
+
+    def save(self):
+        if self._fp is not None:
+            try: self._fp.flush()
+            except Exception: pass
+
+    def _segment(self, month: str) -> _Segment:
+        seg = self._segments.get(month)
+        if seg is None: seg = self._segments[month] = _Segment(os.path.join(self.dir, f"{month}.jsonl"))
+        return seg
+
+    def _append(self, name: str, key: str, msg: str):
+        month = key[:7]
+        if self._fp_month != month:
+            if self._fp is not None: self._fp.close()
+            self._fp = open(os.path.join(self.dir, f"{month}.jsonl"), 'ab')
+            self._fp_month = month
+        line = (json.dumps({"p": name, "k": key, "m": msg}, ensure_ascii=False) + "\n").encode("utf-8")
+        offset = self._fp.tell()
+        self._fp.write(line)
+        self._segment(month).indexed(name, offset, key)
+
+    # ── 写入 ────────────────────────────────────────────
+    def add(self, name: str, msg: str):
+        key = history_key()
+        hot = self._hot_of(name)
+        try: self._append(name, key, msg); self._fp.flush()
+        except Exception as e: plugin_print(f"[Economy] 历史记录写入失败: {e}", "WARNING")
+        hot.append((key, msg))
+
+    def add_many(self, entries: List[Tuple[str, str]]):
+        """批量写入 [(玩家, 内容)], 共用一个时间键, 只 flush 一次"""
+        if not entries: return
+        key = history_key()
+        hots = [self._hot_of(name) for name, _ in entries]
+        try:
+            for name, msg in entries: self._append(name, key, msg)
+            self._fp.flush()
+        except Exception as e: plugin_print(f"[Economy] 历史记录写入失败: {e}", "WARNING")
+        for hot, (_, msg) in zip(hots, entries): hot.append((key, msg))
+
+    # ── 查询 ────────────────────────────────────────────
+    def _hot_of(self, name: str, fill: bool = False) -> deque:
+        """fill=False(写入)时不读分段; fill=True(查询)时保证缓冲区包含该玩家最近的 HOT_SIZE 条"""
+        hot = self._hot.get(name)
+        if hot is None or (fill and name in self._partial):
+            if fill:
+                # 新写入的记录已在分段中, 回填结果即完整的最近记录
+                hot = deque(reversed(self._query_segments(name, 0, self.HOT_SIZE)), maxlen=self.HOT_SIZE)
+                self._partial.discard(name)
+            else:
+                hot = deque(maxlen=self.HOT_SIZE); self._partial.add(name)
+            self._hot[name] = hot; self._hot.move_to_end(name)
+            if len(self._hot) > self.HOT_PLAYERS: self._partial.discard(self._hot.popitem(last=False)[0])
+        else: self._hot.move_to_end(name)
+        return hot
+
+    def _touch(self, month: str, seg: _Segment):
+        if month == self._fp_month: return
+        self._loaded[month] = None; self._loaded.move_to_end(month)
+        while len(self._loaded) > self.LOADED_SEGMENTS:
+            old, _ = self._loaded.popitem(last=False)
+            if old in self._segments: self._segments[old].release()
+
+    def _adopt(self):
+        """主线程换入已完成的归档再删除明文; 查询只在主线程进行, 换入后旧分段不再有读者"""
+        while self._archived:
+            month, dst, src = self._archived.popleft()
+            old = self._segments.get(month)
+            if old is None or old.path != src: continue
+            self._segments[month] = _Segment(dst)
+            try: os.remove(src)
+            except OSError as e: plugin_print(f"[Economy] 历史分段 {month} 明文删除失败: {e}", "WARNING")
+
+    def _months(self, since: str, until: str) -> List[str]:
+        self._adopt()
+        return [m for m in sorted(self._segments, reverse=True)
+                if (not since or m >= since[:7]) and (not until or m <= until[:7])]
+
+    def _query_segments(self, name: str, skip: int, limit: int, since: str = "", until: str = "") -> List[Tuple[str, str]]:
+        out: List[Tuple[str, str]] = []
+        for month in self._months(since, until):
+            seg = self._segments[month]
+            offs = seg.offsets(name, since, until); self._touch(month, seg)
+            if skip >= len(offs): skip -= len(offs); continue
+            end = len(offs) - skip
+            take = offs[max(0, end - (limit - len(out))):end]
+            skip = 0
+            out.extend(reversed(seg.read(take)))
+            if len(out) >= limit: break
+        return out
+
+    def query(self, name: str, page: int = 0, size: int = 10, since: str = "", until: str = "") -> List[Tuple[str, str]]:
+        """按时间倒序分页; since/until 为 'YYYY-MM-DD' 前缀(含边界)"""
+        until = until + "\uffff" if until else ""
+        if not since and not until and (page + 1) * size <= self.HOT_SIZE:
+            # 热缓冲区要么已满, 要么就是该玩家的全部记录
+            return list(reversed(self._hot_of(name, fill=True)))[page*size:(page+1)*size]
+        return self._query_segments(name, page * size, size, since, until)
+
+    def count(self, name: str, since: str = "", until: str = "") -> int:
+        until = until + "\uffff" if until else ""
+        n = 0
+        for month in self._months(since, until):
+            seg = self._segments[month]
+            n += len(seg.offsets(name, since, until)); self._touch(month, seg)   # 与查询一样计入 LRU, 载入的索引可被淘汰
+        return n
+
+    def get_recent(self, name: str, n=50):
+        return self.query(name, 0, n)
+
+    # ── 归档 ────────────────────────────────────────────
+    def archive(self, background: bool = True):
+        """把当月之前的明文分段压缩为归档; 压缩在后台线程, 分段对象的替换与明文删除由主线程在 _adopt 中完成"""
+        self._adopt()
+        current = time.strftime("%Y-%m")
+        todo = [(m, seg.path) for m, seg in self._segments.items() if m < current and m != self._fp_month and not seg.archived]
+        if not todo or not self._archiving.acquire(blocking=False): return
+        def work():
+            try:
+                for month, src in todo:
+                    dst = os.path.join(self.dir, month + ARCHIVE_EXT); tmp = dst + ".tmp"
+                    try:
+                        with open(src, 'rb') as fi, _open_archive(tmp, 'wb', ARCHIVE_EXT) as fo:
+                            while chunk := fi.read(1 << 20): fo.write(chunk)
+                        os.replace(tmp, dst)
+                        self._archived.append((month, dst, src))
+                    except Exception as e: plugin_print(f"[Economy] 历史分段 {month} 归档失败: {e}", "WARNING")
+            finally: self._archiving.release()
+        if background: threading.Thread(target=work, daemon=True).start()
+        else: work()
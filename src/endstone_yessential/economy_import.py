@@ -0,0 +1,260 @@
+"""
+YEssential Economy Import - 流式导入旧经济数据
+/moneys import <文件>: 后台线程增量解析 LLMoney / 计分板导出(JSON 对象/数组, JSONL, CSV), 内存只保留当前批次;
+主线程每 tick 应用一批(apply_batch 一次持久化), 每批后按行号写断点, 中断后同一文件自动续传;
+计分板模式下离线行排入信箱, JSON 信箱按每 tick 的分片写入预算分摊; 导入的余额不跨服发布(各服各自导入)
+"""
+import os, csv, json, math, time, queue, threading
+from typing import Iterator, Optional, Tuple
+
+from .i18n import tr
+from .log import plugin_print
+
+NAME_KEYS = ("name", "player", "playerName", "player_name", "realName")
+VALUE_KEYS = ("money", "balance", "score", "value", "amount")
+MAX_TOKEN = 16 << 20  # 单个 JSON 值的上限, 超出视为文件损坏
+
+
+class _JsonStream:
+    """在滑动缓冲区上用 raw_decode 逐个解码 JSON 值"""
+    def __init__(self, fp, chunk: int = 1 << 16):
+        self.fp, self.chunk = fp, chunk
+        self.buf, self.pos, self.eof = "", 0, False
+        self._dec = json.JSONDecoder()
+
+    def _more(self) -> bool:
+        if self.eof: return False
+        if self.pos > len(self.buf) // 2: self.buf = self.buf[self.pos:]; self.pos = 0
+        if len(self.buf) - self.pos > MAX_TOKEN: raise ValueError("JSON token too large")
+        data = self.fp.read(self.chunk)
+        if not data: self.eof = True; return False
+        self.buf += data
+        return True
+
+    def peek(self) -> str:
+        """跳过空白, 返回下一个字符(文件结束时为空串)"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n": self.pos += 1
+            if self.pos < len(self.buf): return self.buf[self.pos]
+            if not self._more(): return ""
+
+    def expect(self, ch: str):
+        if self.peek() != ch: raise ValueError(f"expected {ch!r} near char {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                obj, end = self._dec.raw_decode(self.buf, self.pos)
+                # 值恰好停在缓冲区末尾时可能被截断(如数字), 读入更多再确认
+                if end < len(self.buf) or self.eof: self.pos = end; return obj
+            except json.JSONDecodeError:
+                if self.eof: raise
+            self._more()
+
+
+def iter_json(fp, lines: bool = False) -> Iterator[Tuple[Optional[str], object]]:
+    """顶层对象 {"名": 值} 产出 (名, 值); 顶层数组与 JSONL(lines=True) 产出 (None, 元素)"""
+    js = _JsonStream(fp)
+    head = "" if lines else js.peek()
+    if head in ("{", "["):
+        close = "}" if head == "{" else "]"
+        js.expect(head)
+        if js.peek() == close: return
+        while True:
+            if head == "{":
+                key = js.value(); js.expect(":")
+                yield str(key), js.value()
+            else: yield None, js.value()
+            c = js.peek()
+            if c == close: return
+            js.expect(",")
+    while js.peek(): yield None, js.value()
+
+
+def iter_csv(fp) -> Iterator[Tuple[Optional[str], object]]:
+    """两列(名称, 余额)或带表头的 CSV; 表头按 NAME_KEYS / VALUE_KEYS 识别列"""
+    reader = csv.reader(fp)
+    ni, vi = 0, 1
+    for i, row in enumerate(reader):
+        if i == 0 and row:
+            cols = [c.strip() for c in row]
+            if any(c in NAME_KEYS or c in VALUE_KEYS for c in cols):
+                ni = next((cols.index(k) for k in NAME_KEYS if k in cols), 0)
+                vi = next((cols.index(k) for k in VALUE_KEYS if k in cols), 1)
+                continue
+        yield None, (row[ni], row[vi]) if len(row) > max(ni, vi) else None
+
+
+def normalize(key: Optional[str], val) -> Optional[Tuple[str, float]]:
+    """一行 → (名称, 余额); 非法返回 None"""
+    if key is None:
+        if isinstance(val, dict):
+            key = next((val[k] for k in NAME_KEYS if k in val), None)
+            val = next((val[k] for k in VALUE_KEYS if k in val), None)
+        elif isinstance(val, (list, tuple)) and len(val) == 2: key, val = val
+        else: return None
+    elif isinstance(val, dict): val = next((val[k] for k in VALUE_KEYS if k in val), None)
+    if not isinstance(key, str): return None
+    name = key.strip()
+    if not name or len(name) > 64 or any(ord(c) < 32 for c in name): return None
+    try: amount = float(val)
+    except (TypeError, ValueError): return None
+    if isinstance(val, bool) or not math.isfinite(amount) or amount < 0: return None
+    return name, amount
+
+
+class _Job:
+    def __init__(self, sender, path: str, resume_from: int):
+        self.sender, self.path, self.resume_from = sender, path, resume_from
+        self.queue: "queue.Queue" = queue.Queue(maxsize=8)
+        self.stop = threading.Event()
+        self.rows = resume_from; self.applied = 0; self.invalid = 0; self.dup = 0
+        self.pending: list = []; self.pending_rows = resume_from   # 待写入信箱的离线行, 写完后断点才推进到 pending_rows
+        self.error = ""; self.started = time.time(); self.task = None; self.reported = 0
+
+
+class EconomyImporter:
+    BATCH_SIZE = 1000        # 每 tick 应用的行数
+    MAILBOX_PER_TICK = 200   # JSON 信箱每 tick 最多写入的分片数(每个分片一次文件替换)
+    PROGRESS_EVERY = 50000   # 进度汇报间隔(行)
+
+    def __init__(self, economy):
+        self.economy = economy
+        self.ckpt_path = os.path.join(economy.data_folder, "import.ckpt")
+        self.job: Optional[_Job] = None
+
+    # ── 断点 ────────────────────────────────────────────
+    def _fingerprint(self, path: str) -> dict:
+        st = os.stat(path)
+        return {"path": os.path.abspath(path), "size": st.st_size, "mtime": int(st.st_mtime)}
+
+    def _load_ckpt(self, path: str) -> int:
+        try:
+            with open(self.ckpt_path, 'r', encoding='utf-8') as f: ck = json.load(f)
+            fp = self._fingerprint(path)
+            if all(ck.get(k) == v for k, v in fp.items()): return int(ck.get("rows", 0))
+        except (OSError, ValueError): pass
+        return 0
+
+    def _save_ckpt(self, job: _Job):
+        try:
+            ck = dict(self._fingerprint(job.path), rows=job.rows)
+            tmp = self.ckpt_path + ".tmp"
+            with open(tmp, 'w', encoding='utf-8') as f: json.dump(ck, f)
+            os.replace(tmp, self.ckpt_path)
+        except OSError as e: plugin_print(f"[Economy] 导入断点写入失败: {e}", "WARNING")
+
+    # ── 命令 ────────────────────────────────────────────
+    def handle(self, sender, args: list):
+        """/moneys import <文件|status|cancel> [restart]"""
+        sub = args[0] if args else "status"
+        if sub == "status":
+            if self.job: self._report(sender, self.job)
+            else: sender.send_message(tr("economy.import_idle"))
+            return
+        if sub == "cancel":
+            if not self.job: sender.send_message(tr("economy.import_idle")); return
+            self._stop(self.job); sender.send_message(tr("economy.import_cancelled", self.job.rows)); self.job = None; return
+        if self.job: sender.send_message(tr("economy.import_busy")); return
+        path = sub if os.path.isabs(sub) else os.path.join(self.economy.data_folder, sub)
+        if not os.path.isfile(path): sender.send_message(tr("economy.import_not_found", path)); return
+        resume = 0 if len(args) > 1 and args[1] == "restart" else self._load_ckpt(path)
+        job = self.job = _Job(sender, path, resume)
+        threading.Thread(target=self._parse, args=(job,), daemon=True).start()
+        job.task = self.economy.plugin.server.scheduler.run_task(self.economy.plugin, self._pump, 1, 1)
+        sender.send_message(tr("economy.import_started", os.path.basename(path), resume))
+
+    # ── 后台解析 ────────────────────────────────────────
+    def _put(self, job: _Job, item) -> bool:
+        while not job.stop.is_set():
+            try: job.queue.put(item, timeout=0.5); return True
+            except queue.Full: continue
+        return False
+
+    def _parse(self, job: _Job):
+        try:
+            with open(job.path, 'r', encoding='utf-8-sig', newline='') as fp:
+                ext = os.path.splitext(job.path)[1].lower()
+                rows = iter_csv(fp) if ext == ".csv" else iter_json(fp, ext in (".jsonl", ".ndjson"))
+                batch: dict = {}; n = 0
+                for key, val in rows:
+                    if job.stop.is_set(): return
+                    n += 1
+                    if n <= job.resume_from: continue
+                    row = normalize(key, val)
+                    if row is None: job.invalid += 1
+                    else:
+                        if row[0] in batch: job.dup += 1
+                        batch[row[0]] = row[1]
+                    if len(batch) >= self.BATCH_SIZE:
+                        if not self._put(job, (n, batch)): return
+                        batch = {}
+                if batch or n > job.resume_from: self._put(job, (n, batch))
+        except Exception as e: job.error = str(e)
+        finally: self._put(job, None)
+
+    # ── 主线程应用 ──────────────────────────────────────
+    def _apply(self, job: _Job, batch: dict):
+        eco = self.economy
+        if eco.config.is_scoreboard:
+            # 计分板只能写在线玩家; 离线玩家以 set 操作排入信箱, 上线时入账
+            online = {p.name for p in eco.plugin.server.online_players}
+            ops = {n: v for n, v in batch.items() if n in online}
+            job.pending.extend((n, "set", v) for n, v in batch.items() if n not in online)
+        else: ops = batch
+        if ops: eco.apply_batch([{"op": "set", "name": n, "amount": v} for n, v in ops.items()], "import", history=False, replicate=False)
+
+    def _flush_mailbox(self, job: _Job):
+        """SQLite 信箱一个事务写完; JSON 信箱每 tick 最多写 MAILBOX_PER_TICK 个分片, 其余留到下一 tick"""
+        eco = self.economy
+        k = len(job.pending) if eco.db is not None else self.MAILBOX_PER_TICK
+        eco.mailbox.add_many(job.pending[:k], remote=True); del job.pending[:k]
+
+    def _pump(self):
+        job = self.job
+        if job is None: return
+        try:
+            if job.pending: self._flush_mailbox(job)
+            else:
+                try: item = job.queue.get_nowait()
+                except queue.Empty: return
+                if item is None: self._finish(job); return
+                job.pending_rows, batch = item
+                self._apply(job, batch); job.applied += len(batch)
+                if job.pending: self._flush_mailbox(job)
+        except Exception as e:
+            job.error = str(e); self._finish(job); return
+        if job.pending: return
+        job.rows = job.pending_rows
+        self._save_ckpt(job)
+        if job.applied - job.reported >= self.PROGRESS_EVERY: job.reported = job.applied; self._report(job.sender, job)
+
+    def _report(self, sender, job: _Job):
+        rate = job.applied / max(1e-6, time.time() - job.started)
+        self._tell(sender, tr("economy.import_progress", job.rows, job.applied, job.invalid, job.dup, int(rate)))
+
+    def close(self):
+        """插件关闭: 停止任务, 断点保留, 下次执行同一命令续传"""
+        if self.job: self._stop(self.job); self.job = None
+
+    def _stop(self, job: _Job):
+        job.stop.set()
+        if job.task is not None: job.task.cancel()
+
+    def _finish(self, job: _Job):
+        self._stop(job); self.job = None
+        if job.error:
+            self._tell(job.sender, tr("economy.import_failed", job.rows, job.error))
+            plugin_print(f"[Economy] 导入中断于第 {job.rows} 行: {job.error}", "WARNING"); return
+        try: os.remove(self.ckpt_path)
+        except OSError: pass
+        self.economy.save_money()
+        self._tell(job.sender, tr("economy.import_done", job.applied, job.invalid, job.dup, int(time.time() - job.started)))
+        plugin_print(f"[Economy] 导入完成: {job.applied} 行, 跳过 {job.invalid} 行非法数据")
+
+    @staticmethod
+    def _tell(sender, msg: str):
+        try: sender.send_message(msg)
+        except Exception: plugin_print(msg)
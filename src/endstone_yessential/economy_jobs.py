@@ -0,0 +1,202 @@
+"""
+YEssential Economy Jobs - 全账户批量任务
+利息 / 财富税 / 低于阈值重置: 余额一次载入数组(NumPy 可用时向量化, 否则纯 Python),
+规则整体计算后一次写回存储, 每个任务只记一条汇总历史(键 #jobs); Economy.Jobs 中配置 at 即每日定时执行
+"""
+import os, json, time
+from typing import List, Optional, Tuple
+
+from .i18n import tr
+from .log import plugin_print
+from .economy_accounts import AccountTable, DELETED, SCALE
+
+try: import numpy as _np
+except ImportError: _np = None
+
+RULES = ("interest", "tax", "reset_under")
+HISTORY_KEY = "#jobs"
+
+
+def _bounds(job: dict) -> Tuple[float, float]:
+    lo = job.get("min"); hi = job.get("max")
+    return (float("-inf") if lo is None else float(lo)), (float("inf") if hi is None else float(hi))
+
+
+def parse_at(at) -> Optional[Tuple[int, int]]:
+    """"H:MM" / "HH:MM" → (时, 分); 非法返回 None"""
+    try:
+        h, m = (int(x) for x in str(at).strip().split(":"))
+        return (h, m) if 0 <= h < 24 and 0 <= m < 60 else None
+    except ValueError: return None
+
+
+def compute_np(job: dict, bal):
+    """bal: float64 数组 → 新余额数组; 未命中规则的账户保持原值"""
+    lo, hi = _bounds(job); rule = job["rule"]
+    sel = (bal >= lo) & (bal <= hi)
+    if rule == "interest":
+        gain = _np.round(bal * float(job.get("rate", 0)), 2)
+        if job.get("cap") is not None: gain = _np.minimum(gain, float(job["cap"]))
+        new = _np.where(sel & (bal > 0), bal + gain, bal)
+    elif rule == "tax":
+        th = float(job.get("threshold", 0))
+        new = _np.where(sel & (bal > th), bal - _np.round((bal - th) * float(job.get("rate", 0)), 2), bal)
+    else:
+        new = _np.where(sel & (bal < float(job.get("threshold", 0))), float(job.get("value", 0)), bal)
+    return _np.maximum(new, 0.0)
+
+
+def compute_py(job: dict, bal: List[float]) -> List[float]:
+    lo, hi = _bounds(job); rule = job["rule"]
+    rate = float(job.get("rate", 0)); th = float(job.get("threshold", 0))
+    if rule == "interest":
+        cap = job.get("cap"); cap = float("inf") if cap is None else float(cap)
+        out = [b + min(round(b * rate, 2), cap) if lo <= b <= hi and b > 0 else b for b in bal]
+    elif rule == "tax":
+        out = [b - round((b - th) * rate, 2) if lo <= b <= hi and b > th else b for b in bal]
+    else:
+        val = float(job.get("value", 0))
+        out = [val if lo <= b <= hi and b < th else b for b in bal]
+    return [max(0.0, v) for v in out]
+
+
+class EconomyJobs:
+    CHECK_TICKS = 1200  # 每分钟检查一次定时任务
+
+    def __init__(self, economy):
+        self.economy = economy
+        self.path = os.path.join(economy.data_folder, "jobs.json")
+        self._last: dict = {}   # 任务名 → 上次执行日期
+        self._at: dict = {}     # 配置中的 at 原文 → (时, 分) | None, 每个取值只解析一次
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f: self._last = json.load(f)
+        except Exception as e: plugin_print(f"[Economy] jobs.json 读取失败: {e}", "WARNING")
+        plugin = economy.plugin
+        plugin.server.scheduler.run_task(plugin, self.tick, self.CHECK_TICKS, self.CHECK_TICKS)
+
+    def jobs(self) -> List[dict]:
+        return [j for j in self.economy.config.jobs if isinstance(j, dict) and j.get("name") and j.get("rule") in RULES]
+
+    def find(self, name: str) -> Optional[dict]:
+        return next((j for j in self.jobs() if j["name"] == name), None)
+
+    # ── 定时 ────────────────────────────────────────────
+    def _at_of(self, job: dict) -> Optional[Tuple[int, int]]:
+        raw = job.get("at")
+        if not raw: return None
+        if raw not in self._at:
+            self._at[raw] = parse_at(raw)
+            if self._at[raw] is None: plugin_print(f"[Economy] 定时任务 {job['name']} 的 at 无效: {raw!r}, 应为 HH:MM", "WARNING")
+        return self._at[raw]
+
+    def tick(self):
+        """到点且今日未执行过即运行; 错过的时刻(停服)在当天之后补跑"""
+        lt = time.localtime(); today, now = time.strftime("%Y-%m-%d", lt), (lt.tm_hour, lt.tm_min)
+        for job in self.jobs():
+            at = self._at_of(job)
+            if at is None or not job.get("enabled", True) or now < at or self._last.get(job["name"]) == today: continue
+            self._last[job["name"]] = today; self._save_last()
+            try: self.run(job)
+            except Exception as e: plugin_print(f"[Economy] 定时任务 {job['name']} 失败: {e}", "WARNING")
+
+    def _save_last(self):
+        try:
+            tmp = self.path + ".tmp"
+            with open(tmp, 'w', encoding='utf-8') as f: json.dump(self._last, f)
+            os.replace(tmp, self.path)
+        except OSError as e: plugin_print(f"[Economy] jobs.json 写入失败: {e}", "WARNING")
+
+    # ── 执行 ────────────────────────────────────────────
+    def run(self, job: dict, dry: bool = False) -> Tuple[int, float, float]:
+        """返回 (变动账户数, 净变动, 耗时秒); dry=True 只计算不写回"""
+        t0 = time.perf_counter(); eco = self.economy
+        if eco.config.is_scoreboard: n, net = self._run_online(job, dry)
+        elif isinstance(eco.money_data, AccountTable): n, net = self._run_table(job, eco.money_data, dry)
+        else: n, net = self._run_dict(job, dry)
+        cost = time.perf_counter() - t0
+        if not dry and n:
+            if not eco.config.is_scoreboard: eco.stats.invalidate()  # 绕过了变动事件, 统计重新取基准
+            eco.history.add(HISTORY_KEY, f"{job['name']}({job['rule']}): {n} accounts, net {net:+.2f} {eco.config.coin_name}")
+            plugin_print(f"[Economy] 批量任务 {job['name']}: {n} 账户, 净变动 {net:+.2f}, 耗时 {cost * 1000:.0f}ms")
+        return n, net, cost
+
+    def _run_dict(self, job: dict, dry: bool) -> Tuple[int, float]:
+        eco = self.economy; data = eco.money_data
+        names = list(data.keys())
+        if _np is not None:
+            bal = _np.fromiter(data.values(), dtype=_np.float64, count=len(names))
+            new = compute_np(job, bal); idx = _np.flatnonzero(new != bal)
+            net = float((new[idx] - bal[idx]).sum())
+            changes = dict(zip([names[i] for i in idx.tolist()], new[idx].tolist()))
+        else:
+            bal = list(data.values()); new = compute_py(job, bal)
+            changes = {names[i]: v for i, v in enumerate(new) if v != bal[i]}
+            net = sum(v - data[n] for n, v in changes.items())
+        for n in job.get("exclude", ()):
+            if n in changes: net -= changes.pop(n) - data[n]
+        if dry or not changes: return len(changes), net
+        data.update(changes)
+        if eco.db is not None: eco.store.append_many(changes)   # 一个事务
+        elif not eco.store.compact(data, force=True): eco.store.append_many(changes)  # 一次快照; 已有压缩进行中时退回追加账本
+        eco._emit_bulk(changes)
+        return len(changes), net
+
+    def _run_table(self, job: dict, table: AccountTable, dry: bool) -> Tuple[int, float]:
+        """紧凑账户表: 直接在映射的余额列上计算并原地写回"""
+        eco = self.economy; skip = set(job.get("exclude", ()))
+        names = table.names()
+        with table.column() as col:
+            if _np is not None:
+                units = _np.asarray(col)
+                live = units != DELETED
+                bal = _np.where(live, units, 0) / SCALE
+                new = compute_np(job, bal)
+                new_units = _np.clip(_np.round(new * SCALE), -(2 ** 62), 2 ** 62).astype(_np.int64)
+                idx = _np.flatnonzero(live & (new_units != units))
+                if skip: idx = _np.array([i for i in idx.tolist() if names[i] not in skip], dtype=_np.int64)
+                net = float((new_units[idx] - units[idx]).sum()) / SCALE
+                changes = dict(zip([names[i] for i in idx.tolist()], (new_units[idx] / SCALE).tolist()))
+                if not dry: units[idx] = new_units[idx]
+                del units
+            else:
+                units = col.tolist(); changes = {}; net = 0.0
+                bal = [u / SCALE for u in units]; new = compute_py(job, bal)
+                for i, u in enumerate(units):
+                    if u == DELETED or names[i] in skip: continue
+                    nu = round(new[i] * SCALE)
+                    if nu == u: continue
+                    changes[names[i]] = nu / SCALE; net += (nu - u) / SCALE
+                    if not dry: col[i] = nu
+        if dry or not changes: return len(changes), net
+        table.compact()
+        eco._emit_bulk(changes)
+        return len(changes), net
+
+    def _run_online(self, job: dict, dry: bool) -> Tuple[int, float]:
+        """计分板模式只能读写在线玩家, 走 apply_batch"""
+        eco = self.economy; skip = set(job.get("exclude", ()))
+        players = [p for p in eco.plugin.server.online_players if not p.name.endswith("_sp") and p.name not in skip]
+        bal = [float(eco.get_money_internal(p)) for p in players]
+        new = compute_py(job, bal)
+        ops = [{"op": "set", "name": p.name, "amount": v} for p, b, v in zip(players, bal, new) if v != b]
+        net = sum(v - b for b, v in zip(bal, new))
+        if ops and not dry: eco.apply_batch(ops, f"job:{job['name']}", history=False)
+        return len(ops), net
+
+    # ── 命令 ────────────────────────────────────────────
+    def handle(self, sender, args: list):
+        """/moneys job <list|run|preview> [任务名]"""
+        sub = args[0].lower() if args else "list"; coin = self.economy.config.coin_name
+        if sub == "list":
+            jobs = self.jobs()
+            if not jobs: sender.send_message(tr("economy.job_none")); return
+            sender.send_message(tr("economy.job_list_header", "NumPy" if _np is not None else "Python"))
+            for j in jobs: sender.send_message(tr("economy.job_list_item", j["name"], j["rule"], j.get("at") or "-", self._last.get(j["name"], "-")))
+            return
+        if sub not in ("run", "preview") or len(args) < 2: sender.send_message("§c/moneys job <list|run|preview> [name]"); return
+        job = self.find(args[1])
+        if job is None: sender.send_message(tr("economy.job_unknown", args[1])); return
+        n, net, cost = self.run(job, dry=sub == "preview")
+        key = "economy.job_preview" if sub == "preview" else "economy.job_done"
+        sender.send_message(tr(key, job["name"], n, f"{net:+.2f}", coin, int(cost * 1000)))
@@ -0,0 +1,164 @@
+"""
+YEssential Economy Mailbox - 离线信箱
+取代 OfflineMoneyCache + EconomyNotify: 每位玩家一个分片 mailbox/<玩家>.json,
+入队时即把 add/reduce 折叠为一个净增量, set 截断之前的操作; 上线时一次写入余额并推送消息
+跨服同步折叠进来的部分单独记账(remote / set_remote), 上线写入时不再发布回其他节点
+"""
+import os, json, time
+from typing import Dict, Optional
+from urllib.parse import quote, unquote
+from endstone import Player
+
+from .i18n import tr
+from .log import plugin_print
+
+
+def new_entry() -> dict:
+    # set: 覆盖基准(None 表示以当前余额为基准); delta: 在基准上的净增量
+    # set_at: 覆盖发生的时间(毫秒, 跨服按此先后生效); remote / set_remote: delta 中来自其他节点的部分 / 覆盖是否来自其他节点
+    return {"set": None, "delta": 0.0, "ops": 0, "msgs": [], "dropped": 0, "since": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "set_at": 0, "remote": 0.0, "set_remote": False}
+
+
+def fold(entry: dict, op_type: str, amount: float, remote: bool = False, at: int = 0):
+    if op_type == "set":
+        local = entry["delta"] - entry.get("remote", 0.0) if remote else 0.0   # 远端覆盖不吞掉本服尚未发布的增量, 上线时照常发布
+        entry["set"] = float(amount); entry["delta"] = local; entry["remote"] = 0.0
+        entry["set_at"] = at or int(time.time() * 1000); entry["set_remote"] = remote
+    elif op_type in ("add", "reduce"):
+        d = amount if op_type == "add" else -amount
+        entry["delta"] += d
+        if remote: entry["remote"] = entry.get("remote", 0.0) + d
+    else: return
+    entry["ops"] += 1
+
+
+def publish_of(entry: dict) -> tuple:
+    """上线写入时交给跨服同步发布的部分: (本服覆盖值 | None, 本服净增量, 覆盖时间)"""
+    local = entry["delta"] - entry.get("remote", 0.0)
+    if entry["set"] is not None and not entry.get("set_remote"): return entry["set"], local, entry.get("set_at", 0)
+    return None, local, 0
+
+
+def resolve(entry: dict, balance: float) -> Optional[float]:
+    """折叠结果作用于当前余额, 不会扣成负数; 无余额操作返回 None"""
+    if not entry["ops"]: return None
+    base = entry["set"] if entry["set"] is not None else balance
+    return max(0.0, base + entry["delta"])
+
+
+class OfflineMailbox:
+    MAX_MESSAGES = 20  # 每人保留的最近消息条数, 更早的只计数
+
+    def __init__(self, data_folder: str, server=None):
+        self.data_folder = data_folder
+        self.dir = os.path.join(data_folder, "mailbox")
+        self.server = server
+        self._names: set = set()
+        self.load()
+
+    # ── 分片存储 ────────────────────────────────────────
+    def load(self):
+        os.makedirs(self.dir, exist_ok=True)
+        self._names = {unquote(fn[:-5]) for fn in os.listdir(self.dir) if fn.endswith(".json")}
+        self._migrate_legacy()
+
+    def names(self) -> set:
+        return set(self._names)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.dir, quote(name, safe="") + ".json")
+
+    def _read(self, name: str) -> Optional[dict]:
+        if name not in self._names: return None
+        try:
+            with open(self._path(name), 'r', encoding='utf-8') as f: return json.load(f)
+        except Exception as e:
+            plugin_print(f"[Economy] 信箱读取失败 {name}: {e}", "WARNING"); return None
+
+    def _write(self, name: str, entry: dict):
+        try:
+            tmp = self._path(name) + ".tmp"
+            with open(tmp, 'w', encoding='utf-8') as f: json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp, self._path(name)); self._names.add(name)
+        except Exception as e: plugin_print(f"[Economy] 信箱写入失败 {name}: {e}", "WARNING")
+
+    def _drop(self, name: str):
+        if name not in self._names: return
+        self._names.discard(name)
+        try: os.remove(self._path(name))
+        except OSError: pass
+
+    def _migrate_legacy(self):
+        """offline_money.json + offline_notify.json → 分片, 完成后改名为 .migrated"""
+        ops_path = os.path.join(self.data_folder, "offline_money.json")
+        notify_path = os.path.join(self.data_folder, "offline_notify.json")
+        entries: Dict[str, dict] = {}
+        try:
+            for path in (ops_path, notify_path):
+                if not os.path.exists(path): continue
+                with open(path, 'r', encoding='utf-8') as f: data = json.load(f)
+                for name, items in data.items():
+                    entry = entries.get(name) or self._read(name) or new_entry(); entries[name] = entry
+                    for item in items:
+                        if path == ops_path: fold(entry, item.get("type", "add"), item.get("amount", 0))
+                        else: self._push_msg(entry, item)
+            for name, entry in entries.items(): self._write(name, entry)
+            for path in (ops_path, notify_path):
+                if os.path.exists(path): os.replace(path, path + ".migrated")
+            if entries: plugin_print(f"[Economy] 离线缓存/通知已迁移到信箱: {len(entries)} 位玩家")
+        except Exception as e: plugin_print(f"[Economy] 离线信箱迁移失败: {e}", "WARNING")
+
+    # ── 入队 ────────────────────────────────────────────
+    def _push_msg(self, entry: dict, msg: str):
+        entry["msgs"].append(msg)
+        if len(entry["msgs"]) > self.MAX_MESSAGES:
+            entry["dropped"] += len(entry["msgs"]) - self.MAX_MESSAGES
+            del entry["msgs"][:-self.MAX_MESSAGES]
+
+    def add(self, name: str, op_type: str, amount: float, note: str = "", msg: str = "", remote: bool = False, at: int = 0):
+        """离线余额操作(可附带一条通知), 只改写该玩家的分片; remote=True 表示来自跨服同步"""
+        entry = self._read(name) or new_entry()
+        fold(entry, op_type, amount, remote, at)
+        if msg: self._push_msg(entry, msg)
+        self._write(name, entry)
+
+    def add_many(self, ops, remote: bool = False):
+        """批量离线余额操作 [(玩家, add|reduce|set, 数额)]: 按玩家分组折叠, 每个分片只读写一次; remote=True 上线时不跨服发布"""
+        grouped: Dict[str, list] = {}
+        for name, op_type, amount in ops: grouped.setdefault(name, []).append((op_type, amount))
+        for name, items in grouped.items():
+            entry = self._read(name) or new_entry()
+            for op_type, amount in items: fold(entry, op_type, amount, remote)
+            self._write(name, entry)
+        return len(grouped)
+
+    def send(self, p, msg: str):
+        if isinstance(p, Player): p.send_message(msg); return
+        name = str(p)
+        online = self.server.get_player(name) if self.server else None
+        if online: online.send_message(msg); return
+        entry = self._read(name) or new_entry()
+        self._push_msg(entry, msg); self._write(name, entry)
+
+    def get(self, name: str) -> Optional[dict]:
+        return self._read(name)
+
+    def clear(self, name: str):
+        self._drop(name)
+
+    # ── 上线投递 ────────────────────────────────────────
+    def apply(self, player: Player, economy) -> Optional[dict]:
+        """余额只写一次, 消息按序推送; 无信件时不触盘"""
+        name = player.name
+        entry = self._read(name)
+        if entry is None: return None
+        old = economy.get_money_internal(player)
+        new = resolve(entry, old)
+        if new is not None:
+            economy._commit(player, old, new, publish_of(entry))
+            player.send_message(tr("economy.mailbox_applied", entry["ops"], f"{new - old:+.0f}", economy.config.coin_name))
+        self._drop(name)
+        if entry["dropped"]: player.send_message(tr("economy.mailbox_dropped", entry["dropped"]))
+        for m in entry["msgs"]: player.send_message(m)
+        return entry
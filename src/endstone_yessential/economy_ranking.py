@@ -0,0 +1,182 @@
+"""
+YEssential Economy Ranking - 财富排行榜
+MoneyRanking 在 update 时增量维护一个可索引跳表(RankIndex),
+取前 N 名与查询任意玩家名次均为 O(log n), 无需每次全量排序
+"""
+import os, json, random, threading
+from typing import Dict, List, Optional, Tuple
+
+from .log import plugin_print
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+    def __init__(self, key, level: int):
+        self.key = key
+        self.next: list = [None] * level
+        self.width: List[int] = [1] * level
+
+
+class RankIndex:
+    """可索引跳表(每层链接记录跨越的节点数), 键为 (-余额, 名称), 升序即名次顺序"""
+    MAX_LEVEL = 24
+
+    def __init__(self):
+        self._head = _Node(None, self.MAX_LEVEL)
+        self._size = 0
+
+    def __len__(self): return self._size
+
+    def _path(self, key) -> Tuple[list, List[int]]:
+        chain = [None] * self.MAX_LEVEL; steps = [0] * self.MAX_LEVEL
+        node = self._head
+        for level in reversed(range(self.MAX_LEVEL)):
+            nxt = node.next[level]
+            while nxt is not None and nxt.key < key:
+                steps[level] += node.width[level]
+                node = nxt; nxt = node.next[level]
+            chain[level] = node
+        return chain, steps
+
+    def insert(self, key):
+        chain, steps_at = self._path(key)
+        level = 1
+        while level < self.MAX_LEVEL and random.random() < 0.5: level += 1
+        node = _Node(key, level)
+        steps = 0
+        for i in range(level):
+            prev = chain[i]
+            node.next[i] = prev.next[i]; prev.next[i] = node
+            node.width[i] = prev.width[i] - steps
+            prev.width[i] = steps + 1
+            steps += steps_at[i]
+        for i in range(level, self.MAX_LEVEL): chain[i].width[i] += 1
+        self._size += 1
+
+    def remove(self, key) -> bool:
+        chain, _ = self._path(key)
+        node = chain[0].next[0]
+        if node is None or node.key != key: return False
+        for i in range(len(node.next)):
+            prev = chain[i]
+            prev.width[i] += node.width[i] - 1
+            prev.next[i] = node.next[i]
+        for i in range(len(node.next), self.MAX_LEVEL): chain[i].width[i] -= 1
+        self._size -= 1
+        return True
+
+    @classmethod
+    def from_sorted(cls, keys: list) -> "RankIndex":
+        """由已排序的键线性构建, 免去逐个 insert 的查找"""
+        idx = cls(); last = [idx._head] * cls.MAX_LEVEL; pos = [0] * cls.MAX_LEVEL
+        for i, key in enumerate(keys, 1):
+            level = 1
+            while level < cls.MAX_LEVEL and random.random() < 0.5: level += 1
+            node = _Node(key, level)
+            for l in range(level):
+                last[l].next[l] = node; last[l].width[l] = i - pos[l]; last[l] = node; pos[l] = i
+        for l in range(cls.MAX_LEVEL): last[l].width[l] = len(keys) + 1 - pos[l]
+        idx._size = len(keys)
+        return idx
+
+    def rank(self, key) -> int:
+        """key 之前的元素个数(0 起名次)"""
+        _, steps = self._path(key)
+        return sum(steps)
+
+    def slice(self, start: int, n: int) -> list:
+        if start >= self._size or n <= 0: return []
+        node, i = self._head, start + 1
+        for level in reversed(range(self.MAX_LEVEL)):
+            while node.next[level] is not None and node.width[level] <= i:
+                i -= node.width[level]; node = node.next[level]
+        out = []
+        while node is not None and len(out) < n:
+            out.append(node.key); node = node.next[0]
+        return out
+
+
+class MoneyRanking:
+    TOP_N = 50  # 排行榜展示名次; epoch 仅在前 TOP_N 名变化时递增, 供界面缓存判断失效
+    REPLAY_MAX = 10000  # 重建进行中再次批量更新时, 少于此数的变动在换入时逐条补上, 否则重新开始重建
+
+    def __init__(self, data_folder: str):
+        self.path = os.path.join(data_folder, "money_ranking.json")
+        self._cache: Dict[str, float] = {}
+        self._index = RankIndex()
+        self.epoch = 0
+        self._stale = False  # bulk_update 后索引在后台线程重建, 查询时换入
+        self._rebuild: Optional[dict] = None
+        self._dirty = False; self.load()
+    def load(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f: self._cache = json.load(f)
+        except: self._cache = {}
+        self._reindex()
+    def _reindex(self):
+        for name, val in list(self._cache.items()):
+            if not isinstance(val, (int, float)): del self._cache[name]
+        self._index = RankIndex.from_sorted(sorted((-val, name) for name, val in self._cache.items()))
+        self._stale = False; self.epoch += 1
+    def _fresh(self):
+        """换入后台重建好的索引(未完成则等待), 并补上重建期间的变动"""
+        if not self._stale: return
+        job = self._rebuild; self._rebuild = None
+        job["thread"].join()
+        index, snap = job["index"], job["snapshot"]
+        for name in job["pending"]:
+            old = snap.get(name)
+            if old is not None: index.remove((-old, name))
+            if name in self._cache: index.insert((-self._cache[name], name))
+        self._index = index; self._stale = False; self.epoch += 1
+    def save(self, background: bool = True):
+        # 主线程只拷贝一次 dict, 序列化与写盘放到后台线程
+        snapshot = dict(self._cache)
+        def work():
+            try:
+                tmp = self.path + ".tmp"
+                with open(tmp, 'w', encoding='utf-8') as f: json.dump(snapshot, f, ensure_ascii=False)
+                os.replace(tmp, self.path)
+            except Exception as e: plugin_print(f"[Economy] 排行榜写入失败: {e}", "WARNING")
+        if background: threading.Thread(target=work, daemon=True).start()
+        else: work()
+    def update(self, name, val):
+        old = self._cache.get(name)
+        if old == val: return
+        if self._stale: self._rebuild["pending"].add(name); self._cache[name] = val; self._dirty = True; return
+        top = old is not None and self._index.rank((-old, name)) < self.TOP_N
+        if old is not None: self._index.remove((-old, name))
+        self._index.insert((-val, name))
+        if top or self._index.rank((-val, name)) < self.TOP_N: self.epoch += 1
+        self._cache[name] = val; self._dirty = True
+    def bulk_update(self, changes: Dict[str, float]):
+        """批量任务写回: 主线程只合并缓存并拷贝快照, 排序与建索引在后台线程完成"""
+        if not changes: return
+        self._cache.update(changes); self._dirty = True; self.epoch += 1
+        if self._stale and len(changes) < self.REPLAY_MAX: self._rebuild["pending"].update(changes); return  # 并入进行中的重建
+        job = {"snapshot": dict(self._cache), "pending": set(), "index": None}
+        def work(): job["index"] = RankIndex.from_sorted(sorted((-v, n) for n, v in job["snapshot"].items()))
+        job["thread"] = threading.Thread(target=work, daemon=True)
+        self._rebuild = job; self._stale = True; job["thread"].start()
+    def batch_save(self, background: bool = True):
+        if self._dirty: self.save(background); self._dirty = False
+    def get_top(self, n=50) -> List[Tuple[str, float]]:
+        self._fresh()
+        return [(name, -neg) for neg, name in self._index.slice(0, n)]
+    def get_range(self, start: int, n: int) -> List[Tuple[str, float]]:
+        self._fresh()
+        return [(name, -neg) for neg, name in self._index.slice(start, n)]
+    def balances(self) -> List[float]:
+        return list(self._cache.values())
+    def snapshot(self) -> Dict[str, float]:
+        return dict(self._cache)
+    def get(self, name: str, default: Optional[float] = None) -> Optional[float]:
+        return self._cache.get(name, default)
+    def rank_of(self, name: str) -> Optional[int]:
+        """1 起名次, 未上榜返回 None"""
+        val = self._cache.get(name)
+        if val is None: return None
+        self._fresh()
+        return self._index.rank((-val, name)) + 1
+    def __len__(self): return len(self._cache)
@@ -0,0 +1,381 @@
+"""
+YEssential Economy Replication - 跨服余额同步
+本服的余额变动按 tick 合并为 账户 → 净增量, 一条消息发布到可插拔的传输层(共享 SQLite 文件 / 本地套接字中转 / Redis 兼容的流);
+各账户带 (启动序号, 计数) 序列号, 接收端按 来源节点 + 账户 去重后把增量叠加到本地余额, 两服并发加款会合并而不是互相覆盖;
+增量与 set 共用 (时间毫秒, 节点) 戳: set 以绝对值发布, 各节点按戳后写者胜出; 早于生效 set 的增量被丢弃,
+晚于它的增量(含 set 到达前已叠加的)保留在其之上, 无论消息到达顺序如何各节点都收敛到同一余额;
+远端扣款不会把余额扣成负数;
+计分板校准、信箱中折叠的远端增量等不是本服产生的变动, 经 expect() 声明后不再发布
+"""
+import os, json, time, uuid, queue, socket, sqlite3, selectors, threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from .log import plugin_print
+
+
+# ── 传输层 ──────────────────────────────────────────────
+class Transport:
+    """publish / poll 只在复制线程中调用; durable=True 的传输返回可持久化的游标, 重启后从断点继续"""
+    durable = False
+
+    def publish(self, payload: str): raise NotImplementedError
+    def poll(self, timeout: float) -> List[Tuple[object, str]]: raise NotImplementedError
+    def close(self): pass
+
+
+class SqliteTransport(Transport):
+    """多个服务器共用一个 SQLite 文件(WAL), 消息表按自增 id 顺序读取"""
+    durable = True
+    KEEP = 100000  # 保留的消息条数
+
+    def __init__(self, path: str, node: str, cursor=None):
+        self.path, self.node, self.cursor = path, node, cursor
+        self.conn: Optional[sqlite3.Connection] = None
+        self._sent = 0
+
+    def _db(self) -> sqlite3.Connection:
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.path, isolation_level=None, timeout=5)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS bus (id INTEGER PRIMARY KEY AUTOINCREMENT, node TEXT NOT NULL, payload TEXT NOT NULL)")
+            if self.cursor is None: self.cursor = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM bus").fetchone()[0]
+        return self.conn
+
+    def publish(self, payload: str):
+        db = self._db()
+        db.execute("INSERT INTO bus (node, payload) VALUES (?, ?)", (self.node, payload))
+        self._sent += 1
+        if self._sent % 1000 == 0: db.execute("DELETE FROM bus WHERE id <= (SELECT MAX(id) FROM bus) - ?", (self.KEEP,))
+
+    def poll(self, timeout: float):
+        db = self._db()
+        last = db.execute("SELECT COALESCE(MAX(id), 0) FROM bus").fetchone()[0]  # 先定上界, 之后插入的消息留给下一轮
+        rows = db.execute("SELECT id, payload FROM bus WHERE id > ? AND id <= ? AND node != ? ORDER BY id LIMIT 500", (self.cursor, last, self.node)).fetchall()
+        self.cursor = rows[-1][0] if len(rows) == 500 else max(self.cursor, last)  # 跳过本服自己的消息
+        if not rows: time.sleep(timeout)
+        return rows
+
+    def close(self):
+        if self.conn is not None: self.conn.close(); self.conn = None
+
+
+class SocketTransport(Transport):
+    """本地中转: broker=True 的服监听 UNIX 套接字(系统不支持时用 127.0.0.1 TCP), 把收到的帧转发给其余连接;
+    帧格式为 4 字节长度 + UTF-8 正文, 不持久化"""
+
+    def __init__(self, path: str, host: str, port: int, broker: bool):
+        self.unix = bool(path) and hasattr(socket, "AF_UNIX")
+        self.addr = path if self.unix else (host, port)
+        self.broker = broker
+        self.sel = selectors.DefaultSelector()
+        self.server: Optional[socket.socket] = None
+        self.peers: Dict[socket.socket, bytearray] = {}
+
+    def _family(self): return socket.AF_UNIX if self.unix else socket.AF_INET
+
+    def _connect(self):
+        if self.broker:
+            if self.server is not None: return
+            if self.unix and os.path.exists(self.addr): os.remove(self.addr)
+            s = socket.socket(self._family(), socket.SOCK_STREAM)
+            if not self.unix: s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            s.bind(self.addr); s.listen(16); s.setblocking(False)
+            self.sel.register(s, selectors.EVENT_READ); self.server = s
+        elif not self.peers:
+            s = socket.create_connection(self.addr, timeout=5) if not self.unix else socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            if self.unix: s.settimeout(5); s.connect(self.addr)
+            s.setblocking(False); self._add(s)
+
+    def _add(self, s: socket.socket):
+        self.peers[s] = bytearray(); self.sel.register(s, selectors.EVENT_READ)
+
+    def _drop(self, s: socket.socket):
+        self.peers.pop(s, None)
+        try: self.sel.unregister(s)
+        except (KeyError, ValueError): pass
+        s.close()
+        if not self.broker: raise ConnectionError("broker disconnected")
+
+    def _send(self, frame: bytes, skip=None):
+        for s in list(self.peers):
+            if s is skip: continue
+            try: s.setblocking(True); s.sendall(frame); s.setblocking(False)
+            except OSError: self._drop(s)
+
+    def publish(self, payload: str):
+        self._connect()
+        data = payload.encode("utf-8")
+        self._send(len(data).to_bytes(4, "big") + data)
+
+    def poll(self, timeout: float):
+        self._connect(); out = []
+        for key, _ in self.sel.select(timeout):
+            s = key.fileobj
+            if s is self.server:
+                conn, _ = s.accept(); conn.setblocking(False); self._add(conn); continue
+            try: chunk = s.recv(65536)
+            except BlockingIOError: continue
+            except OSError: chunk = b""
+            if not chunk: self._drop(s); continue
+            buf = self.peers[s]; buf += chunk
+            while len(buf) >= 4 and len(buf) >= 4 + int.from_bytes(buf[:4], "big"):
+                n = int.from_bytes(buf[:4], "big"); frame = bytes(buf[:4 + n]); del buf[:4 + n]
+                if self.broker: self._send(frame, skip=s)   # 中转给其他服
+                out.append((None, frame[4:].decode("utf-8")))
+        return out
+
+    def close(self):
+        for s in list(self.peers): s.close()
+        self.peers.clear()
+        if self.server is not None:
+            self.server.close(); self.server = None
+            if self.unix and os.path.exists(self.addr): os.remove(self.addr)
+        self.sel.close()
+
+
+class RedisTransport(Transport):
+    """Redis 兼容服务(Redis / Valkey / KeyDB / Dragonfly)的 Stream: XADD 发布, XREAD BLOCK 拉取; 自带最小 RESP 客户端"""
+    durable = True
+    KEEP = 100000
+
+    def __init__(self, host: str, port: int, key: str, node: str, password: str = "", db: int = 0, cursor=None):
+        self.host, self.port, self.key, self.node = host, port, key, node
+        self.password, self.db, self.cursor = password, db, cursor
+        self.sock: Optional[socket.socket] = None; self.fp = None
+
+    def _cmd(self, *args):
+        if self.sock is None:
+            self.sock = socket.create_connection((self.host, self.port), timeout=10); self.fp = self.sock.makefile("rb")
+            if self.password: self._cmd("AUTH", self.password)
+            if self.db: self._cmd("SELECT", self.db)
+            if self.cursor is None:
+                last = self._cmd("XREVRANGE", self.key, "+", "-", "COUNT", 1)
+                self.cursor = last[0][0].decode() if last else "0-0"
+        parts = [str(a).encode("utf-8") if not isinstance(a, bytes) else a for a in args]
+        self.sock.sendall(b"*%d\r\n" % len(parts) + b"".join(b"$%d\r\n%s\r\n" % (len(p), p) for p in parts))
+        return self._read()
+
+    def _read(self):
+        line = self.fp.readline()
+        if not line: raise ConnectionError("redis closed connection")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+": return body.decode()
+        if kind == b"-": raise RuntimeError(body.decode())
+        if kind == b":": return int(body)
+        if kind == b"$":
+            n = int(body)
+            if n < 0: return None
+            data = self.fp.read(n + 2); return data[:-2]
+        if kind == b"*":
+            n = int(body)
+            return None if n < 0 else [self._read() for _ in range(n)]
+        raise RuntimeError(f"bad RESP reply: {line!r}")
+
+    def publish(self, payload: str):
+        self._cmd("XADD", self.key, "MAXLEN", "~", self.KEEP, "*", "n", self.node, "p", payload)
+
+    def poll(self, timeout: float):
+        if self.sock is None: self._cmd("PING")
+        self.sock.settimeout(timeout + 10)
+        reply = self._cmd("XREAD", "COUNT", 500, "BLOCK", max(1, int(timeout * 1000)), "STREAMS", self.key, self.cursor)
+        out = []
+        for _, entries in reply or []:
+            for eid, fields in entries:
+                self.cursor = eid.decode()
+                f = dict(zip(fields[::2], fields[1::2]))
+                if f.get(b"n", b"").decode() != self.node: out.append((self.cursor, f.get(b"p", b"").decode("utf-8")))
+        return out
+
+    def close(self):
+        if self.sock is not None:
+            try: self.sock.close()
+            except OSError: pass
+            self.sock = self.fp = None
+
+
+# ── 复制 ────────────────────────────────────────────────
+class EconomyReplication:
+    POLL_TIMEOUT = 0.2     # 复制线程每轮等待新消息的时间(秒)
+    APPLY_PER_TICK = 50    # 每 tick 最多应用的消息数
+    KEEP_MS = 3600 * 1000  # 增量记录保留时长: 更晚到达、戳更早的 set 需要把这些增量重新叠加上去
+
+    def __init__(self, economy):
+        self.economy = economy
+        self.cfg = economy.config.replication
+        self.enabled = bool(self.cfg.get("enabled", False))
+        self.state_path = os.path.join(economy.data_folder, "replication.json")
+        self.cursor_path = os.path.join(economy.data_folder, "replication.cursor")
+        self.node = ""; self.applied: Dict[str, Dict[str, list]] = {}  # 来源节点 → 账户 → 已应用的最大序列号
+        self.sets: Dict[str, list] = {}                                # 账户 → 最后生效的覆盖戳 [时间毫秒, 节点]
+        self.since: Dict[str, list] = {}                               # 账户 → 该覆盖之后已叠加的增量 [[时间毫秒, 节点, 增量]]
+        self.incarnation = int(time.time() * 1000)                    # 本次启动的序号前缀, 保证重启后序列号仍递增
+        self._seq: Dict[str, int] = {}; self._out: Dict[str, list] = {}  # 账户 → [覆盖值 | None, 净增量, 覆盖时间]
+        self._expect: Optional[Tuple[str, object]] = None
+        self._outq: deque = deque(); self._inq: "queue.Queue" = queue.Queue()
+        self._applying = False; self._stop = threading.Event(); self._thread = None
+        self.sent = self.received = self.duplicates = self.superseded = 0
+        if not self.enabled: return
+        self._load()
+        self.transport = self._make_transport()
+        economy.add_listener(self.observe)
+        plugin = economy.plugin
+        plugin.server.scheduler.run_task(plugin, self.tick, 1, 1)
+        plugin.server.scheduler.run_task(plugin, self.save, 1200, 1200)
+        self._thread = threading.Thread(target=self._loop, daemon=True); self._thread.start()
+        plugin_print(f"[Economy] 跨服同步已启用: 节点 {self.node}, 传输 {type(self.transport).__name__}")
+
+    # ── 状态 ────────────────────────────────────────────
+    def _load(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f: st = json.load(f)
+            self.node = st.get("node", ""); self.applied = st.get("applied", {}); self.sets = st.get("sets", {})
+            self.since = st.get("since", {})
+        except (OSError, ValueError): pass
+        self.node = self.cfg.get("node") or self.node or uuid.uuid4().hex[:12]
+        self.cursor = None
+        try:
+            with open(self.cursor_path, 'r', encoding='utf-8') as f: self.cursor = json.load(f)
+        except (OSError, ValueError): pass
+
+    def save(self):
+        cut = int(time.time() * 1000) - self.KEEP_MS
+        for name in list(self.since):
+            kept = [e for e in self.since[name] if e[0] >= cut]
+            if kept: self.since[name] = kept
+            else: del self.since[name]
+        try:
+            tmp = self.state_path + ".tmp"
+            with open(tmp, 'w', encoding='utf-8') as f: json.dump({"node": self.node, "applied": self.applied, "sets": self.sets, "since": self.since}, f, ensure_ascii=False)
+            os.replace(tmp, self.state_path)
+        except OSError as e: plugin_print(f"[Economy] replication.json 写入失败: {e}", "WARNING")
+
+    def _save_cursor(self, cursor):
+        try:
+            tmp = self.cursor_path + ".tmp"
+            with open(tmp, 'w', encoding='utf-8') as f: json.dump(cursor, f)
+            os.replace(tmp, self.cursor_path)
+        except OSError: pass
+
+    def _make_transport(self) -> Transport:
+        c = self.cfg; kind = c.get("transport", "sqlite")
+        if kind == "redis":
+            return RedisTransport(c.get("host", "127.0.0.1"), int(c.get("port", 6379)), c.get("key", "yessential:economy"),
+                                  self.node, c.get("password", ""), int(c.get("db", 0)), self.cursor)
+        if kind == "socket":
+            return SocketTransport(c.get("path", ""), c.get("host", "127.0.0.1"), int(c.get("port", 19140)), bool(c.get("broker", False)))
+        path = c.get("path") or os.path.join(self.economy.data_folder, "replication.db")
+        return SqliteTransport(path, self.node, self.cursor)
+
+    # ── 主线程 ──────────────────────────────────────────
+    def expect(self, name: str, publish):
+        """由经济系统在派发 name 的变动事件前调用: False 不发布; (覆盖值 | None, 增量, 覆盖时间) 按此发布"""
+        self._expect = (name, publish)
+
+    def observe(self, name: str, old: float, new: float):
+        exp, self._expect = self._expect, None
+        if self._applying: return
+        if exp is not None and exp[0] == name:
+            if exp[1] is False: return
+            base, delta, at = exp[1]
+        else: base, delta, at = None, new - old, 0
+        if base is not None:
+            # 戳晚于本地已见过的一切覆盖与增量: 本地直接写入的绝对值在其他节点上同样是最新的
+            hist = self.since.pop(name, None)
+            at = max(at, self.sets.get(name, [0])[0] + 1, max((e[0] for e in hist), default=0) + 1 if hist else 0)
+            self.sets[name] = [at, self.node]
+            self._out[name] = [base, delta, at]   # 覆盖截断本 tick 之前的增量
+        elif delta:
+            cur = self._out.setdefault(name, [None, 0.0, 0]); cur[1] += delta
+
+    def tick(self):
+        """每 tick: 本 tick 的变动合并为一条消息交给复制线程; 应用已收到的远端消息"""
+        if self._out:
+            batch = {}; now = int(time.time() * 1000)
+            for name, (base, delta, at) in self._out.items():
+                if base is None and not delta: continue
+                self._seq[name] = n = self._seq.get(name, 0) + 1
+                if base is None:
+                    at = max(now, self.sets.get(name, [0])[0] + 1)   # 本地已叠加的增量不能早于本地生效的覆盖
+                    self.since.setdefault(name, []).append([at, self.node, delta])
+                    batch[name] = [n, delta, at]
+                else: batch[name] = [n, delta, base, at]
+            self._out = {}
+            if batch: self._outq.append(json.dumps({"n": self.node, "i": self.incarnation, "d": batch}, ensure_ascii=False))
+        cursor = None
+        for _ in range(self.APPLY_PER_TICK):
+            try: cur, payload = self._inq.get_nowait()
+            except queue.Empty: break
+            try: self._apply(json.loads(payload))
+            except Exception as e: plugin_print(f"[Economy] 同步消息应用失败: {e}", "WARNING")
+            if cur is not None: cursor = cur
+        if cursor is not None: self._save_cursor(cursor)
+
+    def _apply(self, msg: dict):
+        origin, inc = msg.get("n"), msg.get("i", 0)
+        if not origin or origin == self.node: return
+        seen = self.applied.setdefault(origin, {})
+        eco = self.economy; server = eco.plugin.server; now = int(time.time() * 1000)
+        self._applying = True
+        try:
+            for name, (n, delta, *rest) in msg.get("d", {}).items():
+                seq = [inc, n]
+                if name in seen and seen[name] >= seq: self.duplicates += 1; continue
+                seen[name] = seq; self.received += 1
+                base, at = rest if len(rest) == 2 else (None, rest[0] if rest else now)
+                stamp = [at, origin]
+                if stamp < self.sets.get(name, [0, ""]): self.superseded += 1; continue   # 早于已生效的覆盖, 已被覆盖掉
+                extra = 0.0
+                if base is not None:
+                    # 覆盖生效: 戳更晚的增量(已叠加的 + 本服待发布的)重新叠加到覆盖值上, 更早的随之作废
+                    self.sets[name] = stamp
+                    kept = [e for e in self.since.pop(name, ()) if [e[0], e[1]] > stamp]
+                    if kept: self.since[name] = kept
+                    extra = sum(e[2] for e in kept)
+                    pending = self._out.get(name)
+                    if pending is not None:
+                        extra += pending[1]
+                        if pending[0] is not None: self._out[name] = [None, pending[1], 0]   # 本服较早的覆盖作废, 其后的增量照常发布
+                else: self.since.setdefault(name, []).append([at, origin, delta])
+                p = server.get_player(name)
+                if eco.config.is_scoreboard and p is None:
+                    # 计分板只能写在线玩家; 标记为远端折叠, 上线写入时不再发布回来(信箱结算不会扣成负数)
+                    if base is not None: eco.mailbox.add(name, "set", base + delta + extra, remote=True, at=at)
+                    elif delta: eco.mailbox.add(name, "add" if delta > 0 else "reduce", abs(delta), remote=True)
+                    continue
+                target = p if p is not None else name
+                cur = eco.get_money_internal(target)
+                new = base + delta + extra if base is not None else cur + delta
+                if base is None and delta < 0 and new < 0: new = min(cur, 0.0)   # 远端扣款未经本地余额校验, 不扣成负数
+                eco._commit(target, cur, new)
+        finally: self._applying = False
+
+    # ── 复制线程 ────────────────────────────────────────
+    def _loop(self):
+        backoff = 0.0
+        while not self._stop.is_set():
+            try:
+                while self._outq:
+                    self.transport.publish(self._outq[0]); self._outq.popleft(); self.sent += 1
+                for item in self.transport.poll(self.POLL_TIMEOUT): self._inq.put(item)
+                backoff = 0.0
+            except Exception as e:
+                if backoff == 0.0: plugin_print(f"[Economy] 同步传输异常, 稍后重连: {e}", "WARNING")
+                self.transport.close()
+                if isinstance(self.transport, SocketTransport): self.transport = self._make_transport()
+                backoff = min(30.0, backoff * 2 or 1.0); self._stop.wait(backoff)
+        self.transport.close()  # 连接只在本线程使用, 也在本线程关闭
+
+    def status(self) -> dict:
+        return {"node": self.node, "transport": type(self.transport).__name__ if self.enabled else None,
+                "sent": self.sent, "received": self.received, "duplicates": self.duplicates, "superseded": self.superseded,
+                "outbox": len(self._outq), "inbox": self._inq.qsize()}
+
+    def close(self):
+        if not self.enabled: return
+        self.tick()
+        deadline = time.time() + 2
+        while self._outq and time.time() < deadline: time.sleep(0.05)   # 给复制线程发出剩余消息
+        self._stop.set()
+        if self._thread is not None: self._thread.join(timeout=2)
+        self.save()
@@ -0,0 +1,218 @@
+"""
+YEssential Economy SQLite - 经济系统 SQLite 存储引擎
+Economy.storage = "sqlite" 时启用: WAL 模式, 索引表, 与 JSON 版同接口
+首次启用自动从 money.json / money_history.json / mailbox/ / money_ranking.json 一次性迁移
+"""
+import os, json, time, sqlite3
+from typing import Dict
+
+from .economy import MoneyLedger, MoneyHistory, MoneyRanking
+from .economy_history import history_key, _open_archive
+from .economy_mailbox import OfflineMailbox, new_entry, fold
+from .log import plugin_print
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS money (name TEXT PRIMARY KEY, balance REAL NOT NULL) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS history (id INTEGER PRIMARY KEY, name TEXT NOT NULL, ts TEXT NOT NULL, msg TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS idx_history_name_ts ON history (name, ts);
+CREATE TABLE IF NOT EXISTS mailbox (name TEXT PRIMARY KEY, entry TEXT NOT NULL) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS ranking (name TEXT PRIMARY KEY, balance REAL NOT NULL) WITHOUT ROWID;
+"""
+
+
+class EconomyDB:
+    """economy.db 连接: 仅主线程使用, 自动提交; 批量写入用 transaction()"""
+    def __init__(self, data_folder: str):
+        self.path = os.path.join(data_folder, "economy.db")
+        os.makedirs(data_folder, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, isolation_level=None, cached_statements=256)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def execute(self, sql: str, params=()):
+        return self.conn.execute(sql, params)
+
+    def executemany(self, sql: str, rows):
+        return self.conn.executemany(sql, rows)
+
+    def transaction(self):
+        return _Transaction(self.conn)
+
+    def get_meta(self, key: str, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key: str, value: str):
+        self.conn.execute("INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value", (key, value))
+
+    def checkpoint(self):
+        try: self.conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        except sqlite3.Error: pass
+
+    def close(self):
+        try: self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)"); self.conn.close()
+        except sqlite3.Error: pass
+
+    # ── JSON → SQLite 一次性迁移 ──────────────────────────
+    def migrate_from_json(self, data_folder: str):
+        if self.get_meta("json_migrated"): return
+        def read(name):
+            path = os.path.join(data_folder, name)
+            try:
+                if os.path.exists(path):
+                    with open(path, 'r', encoding='utf-8') as f: return json.load(f)
+            except Exception as e: plugin_print(f"[Economy] 迁移读取 {name} 失败: {e}", "WARNING")
+            return {}
+        money = MoneyLedger(data_folder).load()
+        history, ranking = read("money_history.json"), read("money_ranking.json")
+        mailbox = OfflineMailbox(data_folder)  # 顺带把旧版 offline_*.json 折叠为分片
+        mail = {n: mailbox.get(n) for n in mailbox.names()}
+        with self.transaction():
+            self.executemany("INSERT OR REPLACE INTO money (name, balance) VALUES (?, ?)", money.items())
+            self.executemany("INSERT INTO history (name, ts, msg) VALUES (?, ?, ?)",
+                             ((n, k, m) for n, entries in history.items() for k, m in entries.items()))
+            self.executemany("INSERT INTO history (name, ts, msg) VALUES (?, ?, ?)", _history_segments(data_folder))
+            self.executemany("INSERT OR REPLACE INTO mailbox (name, entry) VALUES (?, ?)",
+                             ((n, json.dumps(e, ensure_ascii=False)) for n, e in mail.items() if e))
+            self.executemany("INSERT OR REPLACE INTO ranking (name, balance) VALUES (?, ?)", ranking.items())
+            self.set_meta("json_migrated", time.strftime("%Y-%m-%d %H:%M:%S"))
+        if money or history or mail or ranking:
+            plugin_print(f"[Economy] 已从 JSON 迁移到 SQLite: {len(money)} 账户, {sum(len(v) for v in history.values())} 条历史")
+
+
+def _history_segments(data_folder: str):
+    """JSON 模式下的 history/YYYY-MM.jsonl 分段, 以及已归档的 .jsonl.gz / .jsonl.zst 往月分段"""
+    seg_dir = os.path.join(data_folder, "history")
+    if not os.path.isdir(seg_dir): return
+    months: Dict[str, str] = {}
+    for fn in sorted(os.listdir(seg_dir), key=lambda fn: fn.endswith(".jsonl")):
+        # 同月份明文与归档并存时以明文为准(归档在删除明文前中断)
+        if fn.endswith((".jsonl", ".jsonl.gz", ".jsonl.zst")): months[fn[:7]] = fn
+    for month in sorted(months):
+        path = os.path.join(seg_dir, months[month])
+        with (open(path, 'rb') if path.endswith(".jsonl") else _open_archive(path, 'rb')) as f:
+            for line in f:
+                try: rec = json.loads(line); yield rec["p"], rec["k"], rec["m"]
+                except (ValueError, KeyError): continue
+
+
+class _Transaction:
+    def __init__(self, conn): self.conn = conn
+    def __enter__(self): self.conn.execute("BEGIN"); return self.conn
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("COMMIT" if exc_type is None else "ROLLBACK")
+        return False
+
+
+class SqliteMoneyStore:
+    """与 MoneyLedger 同接口的余额存储: 每次变动一次 UPSERT"""
+    _UPSERT = "INSERT INTO money (name, balance) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET balance = excluded.balance"
+
+    def __init__(self, db: EconomyDB):
+        self.db = db
+    def load(self) -> Dict[str, float]:
+        return dict(self.db.execute("SELECT name, balance FROM money"))
+    def append(self, name: str, value: float):
+        try: self.db.execute(self._UPSERT, (name, value))
+        except sqlite3.Error as e: plugin_print(f"[Economy] 余额写入失败: {e}", "WARNING")
+    def append_many(self, items: Dict[str, float]):
+        if not items: return
+        try:
+            with self.db.transaction(): self.db.executemany(self._UPSERT, items.items())
+        except sqlite3.Error as e: plugin_print(f"[Economy] 余额写入失败: {e}", "WARNING")
+    def compact(self, data: Dict[str, float], background: bool = True):
+        self.db.checkpoint()
+    def maybe_compact(self, data: Dict[str, float]):
+        self.db.checkpoint()
+    def close(self, data: Dict[str, float]):
+        self.db.close()
+
+
+class SqliteOfflineMailbox(OfflineMailbox):
+    """信箱分片存为 mailbox 表的一行(JSON), 接口与文件版相同"""
+    def __init__(self, db: EconomyDB, server=None):
+        self.db = db
+        super().__init__("", server)
+    def load(self):
+        self._names = {n for (n,) in self.db.execute("SELECT name FROM mailbox")}
+        self._migrate_legacy()
+    def _migrate_legacy(self):
+        """旧版 offline_ops / offline_notify 两表 → mailbox"""
+        tables = {n for (n,) in self.db.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ('offline_ops', 'offline_notify')")}
+        if not tables: return
+        entries: Dict[str, dict] = {}
+        if "offline_ops" in tables:
+            for n, t, a in self.db.execute("SELECT name, type, amount FROM offline_ops ORDER BY id"):
+                fold(entries.setdefault(n, self._read(n) or new_entry()), t, a)
+        if "offline_notify" in tables:
+            for n, m in self.db.execute("SELECT name, msg FROM offline_notify ORDER BY id"):
+                self._push_msg(entries.setdefault(n, self._read(n) or new_entry()), m)
+        with self.db.transaction():
+            for n, e in entries.items(): self._write(n, e)
+            for t in tables: self.db.execute(f"DROP TABLE {t}")
+        if entries: plugin_print(f"[Economy] 离线缓存/通知已迁移到信箱: {len(entries)} 位玩家")
+    def _read(self, name: str):
+        if name not in self._names: return None
+        row = self.db.execute("SELECT entry FROM mailbox WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+    def _write(self, name: str, entry: dict):
+        try:
+            self.db.execute("INSERT INTO mailbox (name, entry) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET entry = excluded.entry", (name, json.dumps(entry, ensure_ascii=False)))
+            self._names.add(name)
+        except sqlite3.Error as e: plugin_print(f"[Economy] 信箱写入失败 {name}: {e}", "WARNING")
+    def add_many(self, ops, remote: bool = False):
+        with self.db.transaction(): return super().add_many(ops, remote)
+    def _drop(self, name: str):
+        if name not in self._names: return
+        self._names.discard(name)
+        self.db.execute("DELETE FROM mailbox WHERE name = ?", (name,))
+
+
+class SqliteMoneyHistory(MoneyHistory):
+    def __init__(self, db: EconomyDB):
+        self.db = db
+    def load(self): pass
+    def save(self): pass
+    def add(self, name: str, msg: str):
+        self.db.execute("INSERT INTO history (name, ts, msg) VALUES (?, ?, ?)", (name, history_key(), msg))
+    def add_many(self, entries):
+        key = history_key()
+        try:
+            with self.db.transaction():
+                self.db.executemany("INSERT INTO history (name, ts, msg) VALUES (?, ?, ?)", ((n, key, m) for n, m in entries))
+        except sqlite3.Error as e: plugin_print(f"[Economy] 历史记录写入失败: {e}", "WARNING")
+    def query(self, name: str, page: int = 0, size: int = 10, since: str = "", until: str = ""):
+        return list(self.db.execute("SELECT ts, msg FROM history WHERE name = ? AND ts >= ? AND ts <= ? ORDER BY ts DESC, id DESC LIMIT ? OFFSET ?",
+                                    (name, since, (until + "\uffff") if until else "\uffff", size, page * size)))
+    def count(self, name: str, since: str = "", until: str = "") -> int:
+        return self.db.execute("SELECT COUNT(*) FROM history WHERE name = ? AND ts >= ? AND ts <= ?",
+                               (name, since, (until + "\uffff") if until else "\uffff")).fetchone()[0]
+    def get_recent(self, name: str, n=50):
+        return self.query(name, 0, n)
+    def archive(self, background: bool = True):
+        pass  # 按 (name, ts) 索引查询, 无需归档
+
+
+class SqliteMoneyRanking(MoneyRanking):
+    """排行榜缓存仍在内存中维护, 落盘只写变动过的行"""
+    def __init__(self, db: EconomyDB):
+        self.db = db
+        self._changed: set = set()
+        super().__init__("")
+    def load(self):
+        self._cache = dict(self.db.execute("SELECT name, balance FROM ranking"))
+        self._reindex()
+    def update(self, name, val):
+        if self._cache.get(name) != val: self._changed.add(name)
+        super().update(name, val)
+    def bulk_update(self, changes: Dict[str, float]):
+        self._changed.update(changes); super().bulk_update(changes)
+    def save(self, background: bool = True):
+        rows = [(n, self._cache[n]) for n in self._changed if n in self._cache]
+        self._changed.clear()
+        try:
+            with self.db.transaction():
+                self.db.executemany("INSERT INTO ranking (name, balance) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET balance = excluded.balance", rows)
+        except sqlite3.Error as e: plugin_print(f"[Economy] 排行榜写入失败: {e}", "WARNING")
@@ -0,0 +1,197 @@
+"""
+YEssential Economy Stats - 经济统计
+货币总量、账户数、对数分桶余额直方图与基尼系数估计, 由余额变动事件 O(1) 增量维护;
+精确重算(排序求基尼)在后台线程中分块执行, 主线程只拷贝一次余额快照, 结果回到主线程后作为新的基准;
+不使用进程池: 嵌入在服务端中的解释器派生子进程要复制整个服务端进程, spawn 则会重新启动服务端程序本身
+"""
+import math, time, heapq
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from .i18n import tr
+from .log import plugin_print
+from .economy_accounts import AccountTable, DELETED, SCALE
+
+CHUNK = 1 << 16              # 重算时每次排序的元素数: 单次 C 层排序持有 GIL 的时间有上限, 主线程不被长时间阻塞
+SUB = 4                      # 每个 2 倍区间细分的桶数
+BUCKETS = 1 + SUB * 64       # 桶 0: (0, 1); 桶 i: [2^((i-1)/SUB), 2^(i/SUB))
+
+
+def bucket(v: float) -> int:
+    return 0 if v < 1 else min(BUCKETS - 1, 1 + int(SUB * math.log2(v)))
+
+
+def bucket_floor(i: int) -> float:
+    return 0.0 if i == 0 else 2 ** ((i - 1) / SUB)
+
+
+def units(v: float) -> int:
+    return round(v * SCALE)
+
+
+def grouped_gini(count: int, hist: List[int], sums: List[int]) -> float:
+    """按桶分组的洛伦兹曲线梯形面积(桶内视为均分), 零余额账户排在最前"""
+    total = sum(sums)
+    if count <= 0 or total <= 0: return 0.0
+    area = 0.0; cum = 0.0
+    for n, s in zip(hist, sums):
+        if not n: continue
+        share = s / total
+        area += n / count * (2 * cum + share); cum += share
+    return max(0.0, 1.0 - area)
+
+
+def exact_stats(values: List[float], chunk: int = CHUNK) -> dict:
+    """完整重算(在后台线程中运行): 直方图 + 排序求精确基尼; 分块排序后归并, 不做整表的单次排序"""
+    hist = [0] * BUCKETS; sums = [0] * BUCKETS
+    runs: List[List[float]] = []
+    for start in range(0, len(values), chunk):
+        run = sorted(v for v in values[start:start + chunk] if v > 0)
+        for v in run:
+            i = bucket(v); hist[i] += 1; sums[i] += units(v)
+        runs.append(run)
+    n = len(values); funded = sum(len(r) for r in runs)
+    total = math.fsum(math.fsum(r) for r in runs)
+    weighted = math.fsum(i * v for i, v in enumerate(heapq.merge(*runs), n - funded + 1))
+    gini = (2 * weighted / (n * total) - (n + 1) / n) if n and total > 0 else 0.0
+    return {"count": n, "funded": funded, "supply": sum(sums), "hist": hist, "sums": sums, "gini": max(0.0, gini)}
+
+
+class EconomyStats:
+    POLL_TICKS = 20  # 检查重算结果的间隔
+
+    def __init__(self, economy):
+        self.economy = economy
+        self.funded = 0; self.supply = 0                      # 正余额账户数, 总量(1/SCALE 单位)
+        self.hist = [0] * BUCKETS; self.sums = [0] * BUCKETS
+        self.exact: Optional[dict] = None                     # 最近一次精确重算的结果
+        self._pending: Optional[dict] = None                  # 重算进行中: 快照之后的增量
+        self._future = None; self._sender = None; self._task = None
+        self._values: Optional[List[float]] = None; self._started = 0.0; self._again = False
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self.ready = False
+
+    # ── 增量 ────────────────────────────────────────────
+    def _move(self, st: dict, v: float, sign: int):
+        if v <= 0: return
+        i = bucket(v); u = units(v)
+        st["hist"][i] += sign; st["sums"][i] += sign * u; st["funded"] += sign; st["supply"] += sign * u
+
+    def observe(self, name: str, old: float, new: float):
+        if old == new: return
+        live = {"hist": self.hist, "sums": self.sums, "funded": self.funded, "supply": self.supply}
+        self._move(live, old, -1); self._move(live, new, 1)
+        self.funded, self.supply = live["funded"], live["supply"]
+        if self._pending is not None: self._move(self._pending, old, -1); self._move(self._pending, new, 1)
+
+    # ── 精确重算 ────────────────────────────────────────
+    def _snapshot(self) -> List[float]:
+        eco = self.economy
+        if eco.config.is_scoreboard: return eco.ranking.balances()
+        data = eco.money_data
+        if isinstance(data, AccountTable):
+            with data.column() as col: return [u / SCALE for u in col.tolist() if u != DELETED]
+        return list(data.values())
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None: self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="yessential-stats")
+        return self._pool
+
+    def recompute(self, sender=None) -> bool:
+        """后台完整重算; 已在进行中时返回 False"""
+        if self._future is not None: return False
+        self._values = self._snapshot()
+        self._pending = {"hist": [0] * BUCKETS, "sums": [0] * BUCKETS, "funded": 0, "supply": 0}
+        self._sender = sender; self._started = time.perf_counter()
+        self._future = self._executor().submit(exact_stats, self._values)
+        plugin = self.economy.plugin
+        self._task = plugin.server.scheduler.run_task(plugin, self._poll, self.POLL_TICKS, self.POLL_TICKS)
+        return True
+
+    def invalidate(self):
+        """余额被绕过事件整体改写(批量任务)后调用: 立即重算, 进行中的重算结束后再算一次"""
+        if not self.recompute(): self._again = True
+
+    def _poll(self):
+        fut = self._future
+        if fut is None or not fut.done(): return
+        try: ex, err = fut.result(), None
+        except Exception as e: ex, err = None, e
+        self._task.cancel(); self._task = None; self._future = None; self._values = None
+        pend, self._pending = self._pending, None
+        sender, self._sender = self._sender, None
+        if err is not None:
+            plugin_print(f"[Economy] 统计重算失败: {err}", "WARNING")
+            if sender is not None: self._tell(sender, tr("economy.stats_failed", str(err)))
+        else:
+            # 精确结果 + 快照之后的增量 = 当前真实值, 与增量维护的值比对后替换
+            drift = (self.supply - (ex["supply"] + pend["supply"])) / SCALE if self.ready else 0.0
+            self.hist = [a + b for a, b in zip(ex["hist"], pend["hist"])]
+            self.sums = [a + b for a, b in zip(ex["sums"], pend["sums"])]
+            self.funded, self.supply = ex["funded"] + pend["funded"], ex["supply"] + pend["supply"]
+            ex["at"] = time.strftime("%Y-%m-%d %H:%M:%S"); ex["seconds"] = time.perf_counter() - self._started
+            self.exact = ex; self.ready = True
+            if sender is not None: self._tell(sender, tr("economy.stats_verified", f"{ex['gini']:.4f}", f"{self.gini():.4f}", f"{drift:+.2f}", f"{ex['seconds']:.2f}"))
+        if self._again: self._again = False; self.recompute()
+
+    # ── 查询 API ────────────────────────────────────────
+    def count(self) -> int:
+        eco = self.economy
+        return len(eco.ranking) if eco.config.is_scoreboard else len(eco.money_data)
+
+    def gini(self) -> float:
+        return grouped_gini(max(self.count(), self.funded), self.hist, self.sums)
+
+    def quantile(self, q: float) -> float:
+        """按桶估计的分位数余额(桶内线性插值)"""
+        n = max(self.count(), self.funded); zeros = n - self.funded
+        k = q * n
+        if k <= zeros or not self.funded: return 0.0
+        k -= zeros
+        for i, c in enumerate(self.hist):
+            if c and k <= c:
+                lo, hi = bucket_floor(i), bucket_floor(i + 1)
+                return lo + (hi - lo) * k / c
+            k -= c
+        return bucket_floor(BUCKETS - 1)
+
+    def summary(self) -> Dict[str, object]:
+        n = max(self.count(), self.funded); supply = self.supply / SCALE
+        return {"ready": self.ready, "supply": supply, "accounts": n, "funded": self.funded,
+                "mean": supply / n if n else 0.0, "median": self.quantile(0.5), "p99": self.quantile(0.99),
+                "gini": self.gini(), "exact_gini": self.exact["gini"] if self.exact else None,
+                "exact_at": self.exact["at"] if self.exact else None,
+                "histogram": [(bucket_floor(i), bucket_floor(i + 1), c, s / SCALE) for i, (c, s) in enumerate(zip(self.hist, self.sums)) if c]}
+
+    def decades(self) -> List[tuple]:
+        """直方图按 10 倍区间合并: [(下界, 账户数, 总额)]"""
+        out: Dict[int, list] = {}
+        for i, (c, s) in enumerate(zip(self.hist, self.sums)):
+            if not c: continue
+            d = 0 if i == 0 else int(math.log10(bucket_floor(i)) + 1e-9) + 1
+            row = out.setdefault(d, [0, 0]); row[0] += c; row[1] += s
+        return [(0 if d == 0 else 10 ** (d - 1), c, s / SCALE) for d, (c, s) in sorted(out.items())]
+
+    def close(self):
+        if self._task is not None: self._task.cancel()
+        if self._pool is not None: self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # ── 命令 ────────────────────────────────────────────
+    def handle(self, sender, args: list):
+        """/moneys stats [verify]"""
+        if args and args[0].lower() == "verify":
+            sender.send_message(tr("economy.stats_verifying" if self.recompute(sender) else "economy.stats_busy")); return
+        if not self.ready: sender.send_message(tr("economy.stats_warming")); return
+        coin = self.economy.config.coin_name; s = self.summary(); fmt = self.economy._fmt
+        sender.send_message(tr("economy.stats_header", coin))
+        sender.send_message(tr("economy.stats_supply", fmt(s["supply"]), coin, s["accounts"], s["funded"]))
+        sender.send_message(tr("economy.stats_center", fmt(s["mean"]), fmt(s["median"]), fmt(s["p99"])))
+        sender.send_message(tr("economy.stats_gini", f"{s['gini']:.4f}", f"{s['exact_gini']:.4f}" if s["exact_gini"] is not None else "-", s["exact_at"] or "-"))
+        for lo, c, total in self.decades():
+            pct = total / s["supply"] * 100 if s["supply"] else 0
+            sender.send_message(f"§7 ≥{fmt(lo):>6}  §e{c:>8}  §a{fmt(total):>8} §8({pct:.1f}%)")
+
+    @staticmethod
+    def _tell(sender, msg: str):
+        try: sender.send_message(msg)
+        except Exception: plugin_print(msg)
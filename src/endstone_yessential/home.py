@@ -1,38 +1,116 @@
 import os
 import json
-from typing import Dict, Any, List
+from collections import OrderedDict
+from typing import Dict, Any, List, Set
+from urllib.parse import quote
 import ast
 from endstone import Player
-from endstone.level import Location
 from endstone.form import ActionForm, ModalForm, TextInput
 
 from .log import plugin_print
 from .i18n import tr
 
 class HomeSystem:
+    """
+    家园按玩家分片存储在 homes/<玩家名>.json, 进服或首次访问时载入;
+    在线玩家常驻内存, 离线玩家的分片按 LRU 保留最多 cache_size 个, 设置/删除只重写该玩家的分片
+    """
     def __init__(self, plugin):
         self.plugin = plugin
         self.data_folder = plugin.data_folder
-        self.home_path = os.path.join(self.data_folder, "homes.json")
-        self.home_data: Dict[str, Dict[str, Dict[str, float]]] = {}
-        self.load_homes()
+        self.home_path = os.path.join(self.data_folder, "homes.json")      # 旧版单文件, 启动时迁移
+        self.shard_dir = os.path.join(self.data_folder, "homes")
+        self._shards: "OrderedDict[str, Dict[str, Dict[str, float]]]" = OrderedDict()  # 小写玩家名 → 家园, LRU 顺序
+        self._online: Set[str] = set()
+        os.makedirs(self.shard_dir, exist_ok=True)
+        self._migrate()
 
-    def load_homes(self):
+    @property
+    def cache_size(self) -> int:
+        return int(self.plugin.config_manager.get("Home", {}).get("cache_size", 256))
+
+    def _shard_path(self, player_name: str) -> str:
+        # 玩家名不区分大小写; 转义后可安全用作文件名
+        return os.path.join(self.shard_dir, quote(player_name.lower(), safe="") + ".json")
+
+    @staticmethod
+    def _layer(player_name: str) -> str:
+        return f"home:{player_name.lower()}"
+
+    def _migrate(self):
+        """旧版 homes.json 一次性拆分为分片, 原文件改名保留"""
         if not os.path.exists(self.home_path):
-            self.home_data = {}
-            self.save_homes()
-        else:
+            return
+        try:
+            with open(self.home_path, "r", encoding="utf-8") as f:
+                legacy = json.load(f)
+            for player_name, homes in legacy.items():
+                if homes and not os.path.exists(self._shard_path(player_name)):
+                    self._write(player_name, homes)
+            os.replace(self.home_path, self.home_path + ".migrated")
+            plugin_print(f"[Home] homes.json 已拆分为 {len(legacy)} 个玩家分片")
+        except Exception as e:
+            plugin_print(f"Failed to migrate home data: {e}")
+
+    def homes_of(self, player_name: str) -> Dict[str, Dict[str, float]]:
+        """玩家的家园(可修改的引用); 未载入时读取分片"""
+        key = player_name.lower()
+        homes = self._shards.get(key)
+        if homes is not None:
+            self._shards.move_to_end(key)
+            return homes
+        homes = {}
+        path = self._shard_path(player_name)
+        if os.path.exists(path):
             try:
-                with open(self.home_path, "r", encoding="utf-8") as f:
-                    self.home_data = json.load(f)
+                with open(path, "r", encoding="utf-8") as f:
+                    homes = json.load(f)
             except Exception as e:
-                plugin_print(f"Failed to load home data: {e}")
-                self.home_data = {}
+                plugin_print(f"Failed to load home data of {player_name}: {e}")
+        self._shards[key] = homes
+        for home_name, data in homes.items():
+            self._index(player_name, home_name, data)
+        self._evict()
+        return homes
+
+    def _evict(self):
+        """超出 cache_size 时从最久未用的离线玩家开始卸载(最近访问的一个总是保留)"""
+        excess = len(self._shards) - len(self._online) - self.cache_size
+        if excess <= 0:
+            return
+        newest = next(reversed(self._shards))
+        for key in [k for k in self._shards if k not in self._online and k != newest][:excess]:
+            del self._shards[key]
+            self.plugin.spatial.drop_layer(self._layer(key))
 
-    def save_homes(self):
+    def on_join(self, player: Player):
+        self._online.add(player.name.lower())
+        self.homes_of(player.name)
+
+    def on_quit(self, player: Player):
+        self._online.discard(player.name.lower())
+        self._evict()
+
+    def _index(self, player_name: str, home_name: str, data: dict):
+        """家园放入空间索引, 每个玩家一个图层"""
+        self.plugin.spatial.put(("home", player_name.lower(), home_name), self._layer(player_name),
+                                data.get("dimension", "Overworld"), data["x"], data["y"], data["z"])
+
+    def _write(self, player_name: str, homes: dict):
+        path = self._shard_path(player_name)
+        if not homes:
+            if os.path.exists(path):
+                os.remove(path)
+            return
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(homes, f, indent=4, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def save_homes(self, player_name: str, homes: dict):
+        """只重写该玩家的分片"""
         try:
-            with open(self.home_path, "w", encoding="utf-8") as f:
-                json.dump(self.home_data, f, indent=4, ensure_ascii=False)
+            self._write(player_name, homes)
         except Exception as e:
             plugin_print(f"Failed to save home data: {e}")
 
@@ -45,11 +123,10 @@ class HomeSystem:
                 pass
         plugin_print(f"Debug: home_name = {repr(home_name)}")
         player_name = player.name
-        if player_name not in self.home_data:
-            self.home_data[player_name] = {}
+        homes = self.homes_of(player_name)
 
         loc = player.location
-        self.home_data[player_name][home_name] = {
+        homes[home_name] = {
             "x": loc.x,
             "y": loc.y,
             "z": loc.z,
@@ -57,14 +134,17 @@ class HomeSystem:
             "pitch": loc.pitch,
             "yaw": loc.yaw
         }
-        self.save_homes()
+        self._index(player_name, home_name, homes[home_name])
+        self.save_homes(player_name, homes)
         player.send_message(tr("home.set", home_name))
 
     def del_home(self, player: Player, home_name: str):
         player_name = player.name
-        if player_name in self.home_data and home_name in self.home_data[player_name]:
-            del self.home_data[player_name][home_name]
-            self.save_homes()
+        homes = self.homes_of(player_name)
+        if home_name in homes:
+            del homes[home_name]
+            self.plugin.spatial.remove(("home", player_name.lower(), home_name))
+            self.save_homes(player_name, homes)
             player.send_message(tr("home.deleted", home_name))
             # 删除后重新打开主界面
             self.open_home_gui(player)
@@ -72,28 +152,30 @@ class HomeSystem:
             player.send_message(tr("home.not_found", home_name))
 
     def teleport_home(self, player: Player, home_name: str):
-        player_name = player.name
-        if player_name in self.home_data and home_name in self.home_data[player_name]:
-            data = self.home_data[player_name][home_name]
-            dim = self._resolve_dimension(data.get("dimension", "Overworld"))
-            if dim is None:
-                dim = player.location.dimension
-            loc = Location(dim, data["x"], data["y"], data["z"], data["pitch"], data["yaw"])
-            player.teleport(loc)
-            player.send_message(tr("home.teleported", home_name))
+        homes = self.homes_of(player.name)
+        if home_name in homes:
+            data = homes[home_name]
+            self.plugin.teleport.teleport(player, data, "home", tr("home.teleported", home_name))
         else:
             player.send_message(tr("home.not_found", home_name))
 
-    def _resolve_dimension(self, dim_name: str):
-        try:
-            return self.plugin.server.level.get_dimension(dim_name)
-        except Exception:
-            dims = self.plugin.server.level.dimensions
-            return dims[0] if dims else None
+    def teleport_nearest(self, player: Player):
+        """/home nearest: 传送到当前维度最近的家(同名家园优先)"""
+        homes = self.homes_of(player.name)
+        if "nearest" in homes:
+            self.teleport_home(player, "nearest")
+            return
+        loc = player.location
+        found = self.plugin.spatial.nearest(self._layer(player.name), loc.dimension.name, loc.x, loc.y, loc.z)
+        if not found:
+            player.send_message(tr("home.none_nearby"))
+            return
+        dist, key = found[0]
+        player.send_message(tr("home.nearest", key[2], int(dist)))
+        self.teleport_home(player, key[2])
 
     def open_home_gui(self, player: Player):
-        player_name = player.name
-        homes = self.home_data.get(player_name, {})
+        homes = self.homes_of(player.name)
 
         form = ActionForm(title=tr("home.title"))
         form.add_button(tr("home.set_new"), on_click=lambda p: self.open_set_home_gui(p))
@@ -0,0 +1,230 @@
+"""
+YEssential HTTP API - 本机只读 JSON 接口
+主线程按固定间隔把排行榜 / 红包 / 跨服状态 / 经济统计发布为不可变快照(预先序列化并计算 ETag), 内容未变的资源沿用上次结果;
+余额表由服务线程持有: 启动时取一次全量, 之后主线程只把两次发布之间变动的账户(来自变动事件与批量任务)交给服务线程合并;
+asyncio 服务运行在独立线程, 请求处理不接触游戏状态也不占用 tick; 支持 If-None-Match → 304
+"""
+import json, time, asyncio, hashlib, threading
+from typing import Dict, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from .log import plugin_print
+from .servers import _DATA as _SERVER_DATA
+from .economy_accounts import AccountTable, DELETED, SCALE
+
+_STATUS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 503: "Service Unavailable"}
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+
+
+def _dumps(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _matches(header: Optional[str], etag: str) -> bool:
+    if not header: return False
+    tags = [t.strip() for t in header.split(",")]
+    return "*" in tags or etag in tags or ("W/" + etag) in tags
+
+
+class _Snapshot:
+    """一次发布的全部内容, 发布后不再修改"""
+    __slots__ = ("resources", "ranks", "coin", "at")
+
+    def __init__(self, resources: Dict[str, Tuple[bytes, str]], ranks: Dict[str, int], coin: str, at: float):
+        self.resources = resources; self.ranks = ranks; self.coin = coin; self.at = at
+
+
+class HttpApi:
+    READ_TIMEOUT = 10     # 单个连接等待请求的秒数
+    MAX_HEADER = 8192
+
+    def __init__(self, plugin):
+        self.plugin = plugin
+        self._snap: Optional[_Snapshot] = None
+        self._last: Dict[str, Tuple[bytes, str]] = {}    # 资源路径 → 上次发布的 (正文, ETag), 内容不变时沿用
+        self._delta: Dict[str, float] = {}               # 上次发布后变动的账户 → 新余额(主线程)
+        self._balances: Dict[str, float] = {}            # 余额表, 只在服务线程读写
+        self._top_epoch = -1; self._ranks: Dict[str, int] = {}
+        self._rp_key = None; self._rp_until = 0          # 红包快照的 (数据版本, 开关) 与最早到期时间(毫秒)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None; self._thread: Optional[threading.Thread] = None
+        self._task = None; self.requests = 0; self.not_modified = 0
+        self.enabled = bool(self.config.get("EnabledModule", False))
+        if not self.enabled: return
+        plugin.economy.add_listener(self.observe); plugin.economy.add_bulk_listener(self.observe_bulk)
+        self.start()
+        self.publish()
+        refresh = max(1, int(self.config.get("refresh", 40)))
+        self._task = plugin.server.scheduler.run_task(plugin, self.publish, refresh, refresh)
+
+    @property
+    def config(self) -> dict:
+        return self.plugin.config_manager.get("HttpApi", {})
+
+    # ── 主线程: 发布快照 ─────────────────────────────────
+    def observe(self, name: str, old: float, new: float):
+        self._delta[name] = new
+
+    def observe_bulk(self, changes: Dict[str, float]):
+        self._delta.update(changes)
+
+    def _initial(self):
+        """启动时的全量余额(仅此一次); 紧凑账户表只拷出名称与余额列, 组装字典在服务线程完成"""
+        eco = self.plugin.economy
+        if eco.config.is_scoreboard: return eco.ranking.snapshot()
+        data = eco.money_data
+        if isinstance(data, AccountTable):
+            with data.column() as col: return data.names(), col.tolist()
+        return dict(data)
+
+    def _merge(self, changes):
+        """服务线程: 把全量或增量并入余额表"""
+        if isinstance(changes, tuple):
+            changes = {n: u / SCALE for n, u in zip(*changes) if u != DELETED}
+        self._balances.update(changes)
+
+    def _hand_over(self, changes):
+        loop = self._loop
+        if loop is None: return
+        try: loop.call_soon_threadsafe(self._merge, changes)
+        except RuntimeError: pass   # 服务线程已停止
+
+    def _put(self, out: Dict[str, Tuple[bytes, str]], path: str, obj):
+        body = _dumps(obj); prev = self._last.get(path)
+        out[path] = prev if prev is not None and prev[0] == body else (body, _etag(body))
+
+    def _ranking(self, out: dict, coin: str):
+        ranking = self.plugin.economy.ranking
+        if ranking.epoch == self._top_epoch and "/ranking" in self._last: out["/ranking"] = self._last["/ranking"]; return
+        top = ranking.get_top(int(self.config.get("top", 100)))
+        self._ranks = {n: i for i, (n, _) in enumerate(top, 1)}; self._top_epoch = ranking.epoch
+        self._put(out, "/ranking", {"coin": coin, "accounts": len(ranking),
+                                    "top": [{"rank": i, "name": n, "balance": v} for i, (n, v) in enumerate(top, 1)]})
+
+    def _redpackets(self, out: dict):
+        """红包数据只在写盘(版本号变化)或有红包到期时重新汇总"""
+        rp = getattr(self.plugin, "redpacket", None)
+        if rp is None: self._put(out, "/redpackets", {"enabled": False}); return
+        now = int(time.time() * 1000); key = (rp.db.version, rp.is_enabled())
+        if key == self._rp_key and now < self._rp_until and "/redpackets" in self._last: out["/redpackets"] = self._last["/redpackets"]; return
+        active = []; sent = claimed = 0; until = float("inf")
+        for p in list(rp.db.all_packets().values()):
+            sent += p.get("amount", 0); claimed += p.get("amount", 0) - p.get("remainingAmount", 0)
+            if p.get("remaining", 0) > 0 and p.get("expireAt", 0) > now:
+                active.append({k: p.get(k) for k in ("id", "sender", "amount", "count", "remaining", "remainingAmount", "targetType", "packetType", "expireAt")})
+                until = min(until, p.get("expireAt", 0))
+        self._rp_key = key; self._rp_until = until
+        self._put(out, "/redpackets", {"enabled": key[1], "packets": len(rp.db.all_packets()), "active": len(active),
+                                       "sent": sent, "claimed": claimed, "pending": sum(p["remainingAmount"] for p in active), "list": active})
+
+    def _servers(self) -> list:
+        out = []
+        for srv in self.plugin.config_manager.get("CrossServerTransfer", {}).get("servers", []):
+            ip, port = srv.get("server_ip", "0.0.0.0"), srv.get("server_port", 19132)
+            d = _SERVER_DATA.get(f"{ip}:{port}", {})
+            out.append({"name": srv.get("server_name", ""), "ip": ip, "port": port, "online": d.get("latency", -1) >= 0,
+                        **{k: v for k, v in d.items() if k != "expire"}})
+        return out
+
+    def publish(self):
+        eco = self.plugin.economy; coin = eco.config.coin_name; now = time.time()
+        out: Dict[str, Tuple[bytes, str]] = {}
+        try:
+            self._ranking(out, coin)
+            self._redpackets(out)
+            self._put(out, "/servers", {"servers": self._servers()})
+            self._put(out, "/stats", {"coin": coin, **eco.stats.summary()} if eco.stats.ready else {"coin": coin, "ready": False})
+            self._put(out, "/", {"plugin": "YEssential", "online": sum(1 for p in self.plugin.server.online_players if not p.name.endswith("_sp")),
+                                 "resources": ["/ranking", "/balance/<name>", "/redpackets", "/servers", "/stats"]})
+        except Exception as e:
+            plugin_print(f"[HttpApi] 快照发布失败: {e}", "WARNING"); return
+        if self._delta:
+            delta, self._delta = self._delta, {}   # 交出整个增量字典, 主线程不做拷贝
+            self._hand_over(delta)
+        self._last = out
+        self._snap = _Snapshot(out, self._ranks, coin, now)   # 单次引用赋值, 服务线程看到的总是完整快照
+
+    # ── 服务线程 ────────────────────────────────────────
+    def start(self):
+        host = self.config.get("host", "127.0.0.1"); port = int(self.config.get("port", 8765))
+        ready = threading.Event(); err = []
+        self._delta = {}; initial = self._initial()   # 此后的变动都进入增量, 在全量之后合并
+
+        def run():
+            loop = self._loop = asyncio.new_event_loop(); asyncio.set_event_loop(loop)
+            try:
+                server = loop.run_until_complete(asyncio.start_server(self._client, host, port, limit=self.MAX_HEADER))
+            except OSError as e:
+                err.append(e); ready.set(); loop.close(); return
+            ready.set()
+            if initial is not None: self._merge(initial)
+            try: loop.run_forever()
+            finally:
+                server.close()
+                pending = asyncio.all_tasks(loop)   # 关闭仍保持连接的客户端
+                for t in pending: t.cancel()
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True)); loop.close()
+
+        self._thread = threading.Thread(target=run, name="YEssential-HttpApi", daemon=True)
+        self._thread.start(); ready.wait(5)
+        if err: plugin_print(f"[HttpApi] 无法监听 {host}:{port}: {err[0]}", "WARNING"); self._thread = None; self._loop = None
+        else: plugin_print(f"[HttpApi] 已在 http://{host}:{port}/ 提供只读接口")
+
+    def stop(self):
+        if self._task is not None: self._task.cancel(); self._task = None
+        loop, self._loop = self._loop, None
+        if loop is not None and self._thread is not None:
+            try: loop.call_soon_threadsafe(loop.stop)
+            except RuntimeError: pass
+            self._thread.join(2)
+        self._thread = None
+        if self.enabled: self.plugin.economy.remove_listener(self.observe); self.plugin.economy.remove_bulk_listener(self.observe_bulk)
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try: head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.READ_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError): break
+                except asyncio.LimitOverrunError: writer.write(self._response(400, b"", None, False)); break
+                lines = head.decode("latin-1").split("\r\n")
+                parts = lines[0].split(" ")
+                headers = {}
+                for line in lines[1:]:
+                    k, sep, v = line.partition(":")
+                    if sep: headers[k.strip().lower()] = v.strip()
+                keep = len(parts) == 3 and parts[2] == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                if len(parts) != 3: writer.write(self._response(400, b"", None, False)); break
+                writer.write(self._handle(parts[0], parts[1], headers, keep))
+                await writer.drain()
+                if not keep: break
+        except (ConnectionError, asyncio.CancelledError): pass   # 停止时取消仍保持的连接
+        finally: writer.close()
+
+    def _handle(self, method: str, target: str, headers: dict, keep: bool) -> bytes:
+        self.requests += 1
+        if method not in ("GET", "HEAD"): return self._response(405, _dumps({"error": "method not allowed"}), None, keep)
+        snap = self._snap
+        if snap is None: return self._response(503, _dumps({"error": "warming up"}), None, keep)
+        path = unquote(urlsplit(target).path).rstrip("/") or "/"
+        if path.startswith("/balance/"):
+            name = path[len("/balance/"):]; val = self._balances.get(name)
+            if val is None: return self._response(404, _dumps({"error": "unknown player", "name": name}), None, keep, method == "HEAD")
+            body = _dumps({"name": name, "balance": val, "coin": snap.coin, "rank": snap.ranks.get(name), "at": int(snap.at)})
+            res = (body, _etag(body))
+        else:
+            res = snap.resources.get(path)
+            if res is None: return self._response(404, _dumps({"error": "not found"}), None, keep, method == "HEAD")
+        body, tag = res
+        if _matches(headers.get("if-none-match"), tag):
+            self.not_modified += 1; return self._response(304, b"", tag, keep)
+        return self._response(200, body, tag, keep, method == "HEAD")
+
+    @staticmethod
+    def _response(code: int, body: bytes, etag: Optional[str], keep: bool, head_only: bool = False) -> bytes:
+        lines = [f"HTTP/1.1 {code} {_STATUS[code]}", "Cache-Control: no-cache", f"Connection: {'keep-alive' if keep else 'close'}"]
+        if etag: lines.append(f"ETag: {etag}")
+        if code != 304:
+            lines += ["Content-Type: application/json; charset=utf-8", f"Content-Length: {len(body)}"]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (b"" if head_only or code == 304 else body)
@@ -1,11 +1,13 @@
 from endstone import Player
 from endstone.level import Location
 from .i18n import tr
+from .teleport import DIM_NAMES
 from endstone.form import ActionForm
 
 class HubSystem:
     def __init__(self, plugin):
         self.plugin = plugin
+        self.index_location()
     
     @property
     def config(self):
@@ -19,15 +21,16 @@ class HubSystem:
     
     def is_enabled(self) -> bool:
         return self.config.get("EnabledModule", True)
+
+    def index_location(self):
+        """回城点放入空间索引(启动、/sethub 与重载配置时)"""
+        hub_config = self.config
+        self.plugin.spatial.put(("hub",), "hub", DIM_NAMES.get(hub_config.get("dimid", 0), "Overworld"),
+                                hub_config.get("x", 0), hub_config.get("y", -60), hub_config.get("z", 0))
     
     def get_hub_location(self):
         hub_config = self.config
-        level = self.plugin.server.level
-        if level is None:
-            return None
-
-        dimid = hub_config.get("dimid", 0)
-        dimension = self._get_dimension(level, dimid)
+        dimension = self.plugin.teleport.dimension(hub_config.get("dimid", 0))
         if dimension is None:
             return None
 
@@ -69,8 +72,19 @@ class HubSystem:
             player.send_message(tr("hub.no_location"))
             return
         
-        player.teleport(location)
-        player.send_message(tr("hub.teleported"))
+        self.plugin.teleport.teleport(player, location, "hub", tr("hub.teleported"))
+
+    def mass_teleport(self, sender, spec: str):
+        """/hub <all|选择器|玩家名,...>: 排队批量传送"""
+        location = self.get_hub_location()
+        if location is None:
+            sender.send_message(tr("hub.no_location"))
+            return
+        players = self.plugin.teleport.select(sender, spec)
+        if players is None:
+            sender.send_message(tr("teleport.bad_selector", spec))
+        elif not self.plugin.teleport.mass(players, location, "hub", sender, "hub"):
+            sender.send_message(tr("teleport.mass_none"))
     
     def set_hub(self, player: Player):
         if not player.is_op:
@@ -85,23 +99,13 @@ class HubSystem:
             "dimid": self._get_dimension_id(player.location.dimension)
         }
         self.plugin.config_manager.set("Hub", hub_data)
+        self.index_location()
         player.send_message(tr("hub.set"))
         player.send_message(f"§bX: §f{round(player.location.x, 1)}")
         player.send_message(f"§bY: §f{round(player.location.y, 1)}")
         player.send_message(f"§bZ: §f{round(player.location.z, 1)}")
         player.send_message(f"§b维度: §f{self._get_dimension_name(hub_data['dimid'])}")
     
-    def _get_dimension(self, level, dimid: int):
-        """根据 dimid 获取 Dimension 对象"""
-        names = {0: "Overworld", 1: "Nether", 2: "The End"}
-        dim_name = names.get(dimid, "Overworld")
-        try:
-            return level.get_dimension(dim_name)
-        except Exception:
-            self.plugin.logger.warning(f"Hub: dimension lookup failed for dimid={dimid}, falling back to first dimension")
-            dims = level.dimensions
-            return dims[0] if dims else None
-
     def _get_dimension_name(self, dimid: int) -> str:
         names = {0: tr("hub.dim_overworld"), 1: tr("hub.dim_nether"), 2: tr("hub.dim_end")}
         return names.get(dimid, tr("hub.dim_unknown"))
@@ -83,17 +83,60 @@ default_translations = {
         "economy.ranking_title": "§6■ 财富排行榜 ■ §8[前%s名]",
         "economy.ranking_total": "§7服务器总财富: §6%s",
         "economy.ranking_yours": "§a你的余额: %s",
+        "economy.ranking_rank": "§a你的排名: §e#%s §7/ %s",
         "economy.no_ranking": "§c暂无排行榜数据。",
         "economy.transfer_content": "§7转账给 §a%s\n§7金额: §e%s %s\n§7税率: §e%s\n§7税额: §c%s\n§7到账: §a%s",
         "economy.offline_warn": "§c⚠ 对方将在上线时收到金币。",
         "economy.offline_target_online": "§c目标玩家在线，请使用在线操作。",
         "economy.offline_cached": "§a已缓存离线操作 → %s",
+        "economy.unknown_player": "§c玩家 {0} 从未进入过服务器",
+        "economy.did_you_mean_title": "§6选择玩家",
+        "economy.did_you_mean": "§7未找到 §e{0}§7, 你要找的是:",
+        "economy.mailbox_applied": "§a离线期间共 %s 笔余额变动, 已合并入账: §e%s %s",
+        "economy.mailbox_dropped": "§7(另有 %s 条较早的通知已省略)",
+        "economy.batch_empty": "§c未指定任何玩家。",
+        "economy.batch_failed_op": "§c%s: %s",
+        "economy.batch_aborted": "§c批量操作已取消: %s 条校验失败, 未做任何修改。",
+        "economy.batch_done": "§a批量操作完成: %s 个账户 (%s)。",
+        "economy.batch_queued": "§e其中 {0} 个离线账户的操作已存入信箱, 上线时入账。",
+        "economy.import_started": "§a开始导入 %s (从第 %s 行继续)",
+        "economy.import_progress": "§7导入进度: 已读 %s 行, 已写入 %s, 非法 %s, 重复 %s, %s 行/秒",
+        "economy.import_done": "§a导入完成: 写入 %s 行, 跳过非法 %s 行, 重复 %s 行, 用时 %s 秒",
+        "economy.import_failed": "§c导入中断于第 %s 行: %s (再次执行同一命令可续传)",
+        "economy.import_busy": "§c已有导入任务在进行中。",
+        "economy.import_idle": "§7当前没有导入任务。",
+        "economy.import_not_found": "§c找不到文件: %s",
+        "economy.import_cancelled": "§e导入已取消, 停在第 %s 行 (再次执行可续传)。",
+        "economy.guard_rate": "§c[经济告警] §e{0} §c{4} 秒内余额变动 {1} 次 (净 {2} {3})",
+        "economy.guard_volume": "§c[经济告警] §e{0} §c{4} 秒内净流入 {2} {3} ({1} 次变动)",
+        "economy.job_none": "§7未配置批量任务 (Economy.Jobs)",
+        "economy.job_list_header": "§6批量任务 §7(计算: {0})",
+        "economy.job_list_item": "§e{0} §7规则 {1} · 定时 {2} · 上次 {3}",
+        "economy.job_unknown": "§c未找到批量任务: {0}",
+        "economy.job_preview": "§7[预览] §e{0}§7: 将变动 {1} 个账户, 净 {2} {3} ({4}ms)",
+        "economy.job_done": "§a批量任务 §e{0} §a完成: {1} 个账户, 净 {2} {3} ({4}ms)",
+        "economy.stats_header": "§6===== {0} 经济统计 =====",
+        "economy.stats_supply": "§7货币总量 §e{0} {1} §7· 账户 §e{2} §7(余额>0: {3})",
+        "economy.stats_center": "§7平均 §e{0} §7· 中位数≈ §e{1} §7· P99≈ §e{2}",
+        "economy.stats_gini": "§7基尼系数≈ §e{0} §7(精确 {1}, 于 {2})",
+        "economy.stats_warming": "§7统计基准正在后台计算, 请稍后再试",
+        "economy.stats_verifying": "§7已开始后台精确重算...",
+        "economy.stats_busy": "§c已有重算在进行中",
+        "economy.stats_verified": "§a精确重算完成: 基尼 {0} (估计 {1}), 增量总量偏差 {2}, 用时 {3}s",
+        "economy.stats_failed": "§c统计重算失败: {0}",
+        "economy.sync_disabled": "§7跨服同步未启用 (Economy.Replication.enabled)",
+        "economy.sync_status": "§6跨服同步 §7节点 §e{0} §7· {1}\n§7已发送 {2} 批 · 已应用 {3} 项 · 重复 {4} · 被覆盖 {7} · 待发 {5} · 待应用 {6}",
         "economy.transfer_note": "§7备注:§f%s",
+        "economy.page": "第 %s 页",
+        "economy.prev_page": "§e上一页",
+        "economy.next_page": "§e下一页",
 
         "home.set": "§a家园 §e%s §a已设置。",
         "home.deleted": "§c家园 §e%s §c已删除。",
         "home.not_found": "§c家园 §e%s §c不存在。",
         "home.teleported": "§a已传送到家园 §e%s§a。",
+        "home.nearest": "§7最近的家: §e{0} §7({1} 格)",
+        "home.none_nearby": "§c当前维度没有你的家园。",
         "home.title": "§6家园系统",
         "home.set_new": "§a设置新家",
         "home.options_title": "§6家园: %s",
@@ -112,6 +155,74 @@ default_translations = {
         "warp.admin_only": "§c只有管理员可以%s传送点。",
         "warp.set_title": "§6设置传送点",
         "warp.name_label": "请输入传送点名称",
+        "warp.ambiguous": "§e{0} §7匹配多个传送点: §f{1}",
+        "warp.suggest": "§7你是不是要找: §f{0}",
+        "warp.search": "§b搜索传送点",
+        "warp.search_title": "§6搜索传送点",
+        "warp.search_label": "输入名称、前缀或部分字母",
+        "warp.result_title": "§6搜索: {0}",
+        "warp.result_info": "§7找到 §e{0} §7个传送点",
+        "warp.page_info": "§7共 §e{0} §7个传送点",
+        "warp.no_result": "§c没有匹配 {0} 的传送点。",
+        "warp.prev": "§7上一页",
+        "warp.next": "§7下一页",
+        "warp.all": "§7全部传送点",
+        "warp.near_title": "§6附近的传送点",
+        "warp.near_info": "§7找到 §e{0} §7个 · 半径 §f{1} §7· 中心 §f{2}",
+        "warp.none_near": "§c附近没有传送点。",
+        "shop.title": "§l§6商店",
+        "shop.content": "§7共 §e{0} §7件商品 · 余额 §e{1} {2}",
+        "shop.balance": "§7余额: §e{0} {1}",
+        "shop.search_btn": "§b搜索商品",
+        "shop.search_title": "§6搜索商品",
+        "shop.search_label": "输入商品名称或物品 ID",
+        "shop.result_title": "§6搜索: {0}",
+        "shop.no_result": "§c没有找到与 §e{0} §c相关的商品",
+        "shop.prev": "§7上一页",
+        "shop.next": "§7下一页",
+        "shop.back": "§c返回",
+        "shop.buy_title": "§6购买",
+        "shop.detail": "§e{0} §7x{1}\n§7单价: §6{2} {3}\n§7余额: §e{4}\n\n购买份数",
+        "shop.bought": "§a购买成功: §e{0} §7x{1}§a, 花费 §6{2} {3}",
+        "shop.no_room": "§c背包空间不足, 最多还能买 §e{0} §c份",
+        "shop.not_found": "§c商品 §e{0} §c不存在",
+        "shop.broken": "§c商品 §e{0} §c配置有误, 请联系管理员",
+        "shop.disabled": "§c商店未开启",
+        "shop.reloaded": "§a商店目录已重载: {0} 件商品",
+        "market.title": "§l§6交易所",
+        "market.content": "§7挂单 §e{0} §7· 在交易物品 §e{1} §7· 本次运行成交 §e{2} §7笔",
+        "market.browse": "§b浏览市场",
+        "market.sell_hand": "§a出售手持物品",
+        "market.buy_item": "§6求购物品",
+        "market.my_orders": "§e我的订单 §8({0})",
+        "market.claim_btn": "§d领取物品 §8({0})",
+        "market.buy": "买入",
+        "market.sell": "卖出",
+        "market.buy_btn": "§a买入",
+        "market.sell_btn": "§c卖出",
+        "market.book_header": "§e{0} §7· 单价单位 {1}\n§c卖盘 §7/ §a买盘",
+        "market.order_title": "§6{0} {1}",
+        "market.item_label": "物品 ID",
+        "market.price_label": "单价",
+        "market.qty_label": "数量",
+        "market.placed": "§a订单 §e#{0} §a已挂出: {1} §e{2} §7x{3} §a@ §6{4} {5}§a, 即时成交 {6} 个",
+        "market.filled": "§a{0} §e{1} §a全部成交, 共 {2} 个",
+        "market.sold_msg": "§a交易所: 你的 §e{0} §7x{1} §a以 {2} 成交, 到账 §6{3} {4}",
+        "market.cancelled": "§e订单 #{0} ({1}) 已撤销, 剩余 {2} 个的托管已退回",
+        "market.expired": "§e订单 #{0} ({1}) 已过期, 剩余 {2} 个的托管已退回",
+        "market.claimed": "§a已从领取箱取出 {0} 个物品",
+        "market.claim_rest": "§7, 背包已满, 还有 {0} 个待领取 (/market claim)",
+        "market.empty": "§7市场上暂无挂单",
+        "market.empty_hand": "§c请先手持要出售的物品",
+        "market.no_orders": "§7你没有进行中的订单",
+        "market.cancel_hint": "§7点击订单可撤销",
+        "market.cancel_title": "§c撤销订单",
+        "market.no_such_order": "§c订单 §e{0} §c不存在或不属于你",
+        "market.bad_order": "§c价格或数量无效",
+        "market.bad_item": "§c未知物品: §e{0}",
+        "market.too_many": "§c最多同时挂 {0} 个订单",
+        "market.not_enough_items": "§c背包中的 §e{0} §c不足 {1} 个",
+        "market.disabled": "§c交易所未开启",
 
         "tpa.sent": "§7已向 §a%s §7发送传送请求。",
         "tpa.request_title": "§6传送请求",
@@ -152,7 +263,7 @@ default_translations = {
 
         "back.title": "§6死亡回溯",
         "back.recorded": "§c死亡点已记录，输入 /back 返回。记录了 %s 个死亡点。",
-        "back.teleported": "§a已传送到死亡点。",
+        "back.teleported": "§a已返回记录的位置。",
         "back.empty": "§c当前没有记录的死亡点。",
         "back.no_death": "§c你似乎还没有死亡过。",
         "back.invalid_index": "§c无效的死亡点索引。",
@@ -192,6 +303,24 @@ default_translations = {
         "hub.set": "§a回城点已设置：",
         "hub.no_perm": "§c你没有权限设置回城点。",
         "hub.pos_info": "§e目标位置：\n§bX: §f%s\n§bY: §f%s\n§bZ: §f%s\n§b维度: §f%s",
+        "teleport.cooldown": "§c传送冷却中, 请 {0} 秒后再试。",
+        "teleport.need_money": "§c传送需要 {0} {1}, 余额不足。",
+        "teleport.cost": "§e本次传送花费 {0} {1}。",
+        "teleport.no_target": "§c无法解析传送目标。",
+        "teleport.stats_header": "§6[传送统计] §7预热 {0} tick · 已缓存维度 {1} 个",
+        "teleport.stats_line": "§e{0}§7: 次数 §f{1} §7失败 §c{2} §7平均 §f{3}ms §7最大 §f{4}ms §7调用 §f{5}ms",
+        "teleport.stats_empty": "§7暂无传送记录。",
+        "teleport.stats_reset": "§a传送统计已清空。",
+        "teleport.bad_selector": "§c无法解析目标: {0} (可用 all / @a / @a[r=,rm=,tag=,name=,c=] / 玩家名,玩家名)",
+        "teleport.mass_none": "§c没有可传送的在线玩家。",
+        "teleport.mass_queued": "§6[批量传送] §e{0}§7: 已排队 §f{1} §7人, 预计 §f{2} §7秒",
+        "teleport.mass_progress": "§6[批量传送] §e{0}§7: §f{1}/{2} §7· 预计剩余 §f{3} §7秒",
+        "teleport.mass_done": "§6[批量传送] §e{0}§7: 完成, 传送 §a{1} §7人, 跳过 §c{2} §7人, 用时 §f{3} §7秒",
+        "teleport.mass_cancelled": "§6[批量传送] §e{0}§7: 已取消 ({1}/{2})",
+        "teleport.mass_arrived": "§a已被传送至 {0}。",
+        "teleport.queue_empty": "§7批量传送队列为空。",
+        "teleport.queue_header": "§6[批量传送] §7任务 §f{0} §7个 · 当前预算 §f{1} §7人/tick · TPS §f{2}",
+        "teleport.queue_cancelled": "§a已清空批量传送队列, {0} 人未传送。",
 
         "servers.title": "§6跨服传送",
         "servers.disabled": "§c该模块未启用。",
@@ -496,17 +625,60 @@ default_translations = {
         "economy.ranking_title": "§6■ Wealth Leaderboard ■ §8[Top %s]",
         "economy.ranking_total": "§7Server Total: §6%s",
         "economy.ranking_yours": "§aYour Balance: %s",
+        "economy.ranking_rank": "§aYour Rank: §e#%s §7/ %s",
         "economy.no_ranking": "§cNo ranking data.",
         "economy.transfer_content": "§7To §a%s\n§7Amount: §e%s %s\n§7Tax: §e%s\n§7Tax Amt: §c%s\n§7Receive: §a%s",
         "economy.offline_warn": "§c⚠ They will receive coins on login.",
         "economy.offline_target_online": "§cPlayer is online, use online transfer.",
         "economy.offline_cached": "§aCached offline op → %s",
+        "economy.unknown_player": "§cPlayer {0} has never joined this server",
+        "economy.did_you_mean_title": "§6Choose Player",
+        "economy.did_you_mean": "§7No player named §e{0}§7. Did you mean:",
+        "economy.mailbox_applied": "§a%s balance change(s) while you were offline were applied: §e%s %s",
+        "economy.mailbox_dropped": "§7(%s older notification(s) omitted)",
+        "economy.batch_empty": "§cNo players specified.",
+        "economy.batch_failed_op": "§c%s: %s",
+        "economy.batch_aborted": "§cBatch aborted: %s op(s) failed validation, nothing was changed.",
+        "economy.batch_done": "§aBatch applied to %s account(s) (%s).",
+        "economy.batch_queued": "§e{0} offline account(s) were queued in the mailbox and apply on next join.",
+        "economy.import_started": "§aImporting %s (resuming after row %s)",
+        "economy.import_progress": "§7Import: %s rows read, %s applied, %s invalid, %s duplicate, %s rows/s",
+        "economy.import_done": "§aImport finished: %s applied, %s invalid skipped, %s duplicates, %ss",
+        "economy.import_failed": "§cImport stopped at row %s: %s (run the same command again to resume)",
+        "economy.import_busy": "§cAn import is already running.",
+        "economy.import_idle": "§7No import is running.",
+        "economy.import_not_found": "§cFile not found: %s",
+        "economy.import_cancelled": "§eImport cancelled at row %s (run again to resume).",
+        "economy.guard_rate": "§c[Economy Alert] §e{0}§c: {1} balance changes in {4}s (net {2} {3})",
+        "economy.guard_volume": "§c[Economy Alert] §e{0}§c: net {2} {3} in {4}s ({1} changes)",
+        "economy.job_none": "§7No batch jobs configured (Economy.Jobs)",
+        "economy.job_list_header": "§6Batch jobs §7(engine: {0})",
+        "economy.job_list_item": "§e{0} §7rule {1} · at {2} · last {3}",
+        "economy.job_unknown": "§cUnknown batch job: {0}",
+        "economy.job_preview": "§7[Preview] §e{0}§7: would change {1} accounts, net {2} {3} ({4}ms)",
+        "economy.job_done": "§aJob §e{0} §adone: {1} accounts, net {2} {3} ({4}ms)",
+        "economy.stats_header": "§6===== {0} Economy Stats =====",
+        "economy.stats_supply": "§7Supply §e{0} {1} §7· accounts §e{2} §7(funded: {3})",
+        "economy.stats_center": "§7Mean §e{0} §7· median≈ §e{1} §7· p99≈ §e{2}",
+        "economy.stats_gini": "§7Gini≈ §e{0} §7(exact {1} at {2})",
+        "economy.stats_warming": "§7Statistics baseline is being computed, try again shortly",
+        "economy.stats_verifying": "§7Exact recomputation started in background...",
+        "economy.stats_busy": "§cA recomputation is already running",
+        "economy.stats_verified": "§aRecomputed: Gini {0} (estimate {1}), supply drift {2}, took {3}s",
+        "economy.stats_failed": "§cStatistics recomputation failed: {0}",
+        "economy.sync_disabled": "§7Cross-server sync is disabled (Economy.Replication.enabled)",
+        "economy.sync_status": "§6Cross-server sync §7node §e{0} §7· {1}\n§7sent {2} batches · applied {3} · duplicates {4} · superseded {7} · outbox {5} · inbox {6}",
         "economy.transfer_note": "§7Note:§f%s",
+        "economy.page": "Page %s",
+        "economy.prev_page": "§ePrevious Page",
+        "economy.next_page": "§eNext Page",
 
         "home.set": "§aHome §e%s §aset.",
         "home.deleted": "§cHome §e%s §cdeleted.",
         "home.not_found": "§cHome §e%s §cnot found.",
         "home.teleported": "§aTeleported to home §e%s§a.",
+        "home.nearest": "§7Nearest home: §e{0} §7({1} blocks)",
+        "home.none_nearby": "§cYou have no homes in this dimension.",
         "home.title": "§6Home System",
         "home.set_new": "§aSet New Home",
         "home.options_title": "§6Home: %s",
@@ -525,6 +697,74 @@ default_translations = {
         "warp.admin_only": "§cOnly admins can %s warps.",
         "warp.set_title": "§6Set Warp",
         "warp.name_label": "Enter warp name",
+        "warp.ambiguous": "§e{0} §7matches several warps: §f{1}",
+        "warp.suggest": "§7Did you mean: §f{0}",
+        "warp.search": "§bSearch warps",
+        "warp.search_title": "§6Search Warps",
+        "warp.search_label": "Name, prefix or part of it",
+        "warp.result_title": "§6Search: {0}",
+        "warp.result_info": "§7Found §e{0} §7warps",
+        "warp.page_info": "§7{0} warps in total",
+        "warp.no_result": "§cNo warp matches {0}.",
+        "warp.prev": "§7Previous page",
+        "warp.next": "§7Next page",
+        "warp.all": "§7All warps",
+        "warp.near_title": "§6Nearby Warps",
+        "warp.near_info": "§7Found §e{0} §7· radius §f{1} §7· around §f{2}",
+        "warp.none_near": "§cNo warps nearby.",
+        "shop.title": "§l§6Shop",
+        "shop.content": "§e{0} §7listings · balance §e{1} {2}",
+        "shop.balance": "§7Balance: §e{0} {1}",
+        "shop.search_btn": "§bSearch",
+        "shop.search_title": "§6Search Shop",
+        "shop.search_label": "Item name or ID",
+        "shop.result_title": "§6Search: {0}",
+        "shop.no_result": "§cNo listings match §e{0}",
+        "shop.prev": "§7Previous page",
+        "shop.next": "§7Next page",
+        "shop.back": "§cBack",
+        "shop.buy_title": "§6Buy",
+        "shop.detail": "§e{0} §7x{1}\n§7Price: §6{2} {3}\n§7Balance: §e{4}\n\nQuantity",
+        "shop.bought": "§aBought §e{0} §7x{1}§a for §6{2} {3}",
+        "shop.no_room": "§cNot enough inventory space, you can buy at most §e{0}",
+        "shop.not_found": "§cListing §e{0} §cnot found",
+        "shop.broken": "§cListing §e{0} §cis misconfigured, contact an admin",
+        "shop.disabled": "§cShop is disabled",
+        "shop.reloaded": "§aShop catalog reloaded: {0} listings",
+        "market.title": "§l§6Market",
+        "market.content": "§7Open orders §e{0} §7· items §e{1} §7· trades this session §e{2}",
+        "market.browse": "§bBrowse",
+        "market.sell_hand": "§aSell held item",
+        "market.buy_item": "§6Place buy order",
+        "market.my_orders": "§eMy orders §8({0})",
+        "market.claim_btn": "§dClaim items §8({0})",
+        "market.buy": "Buy",
+        "market.sell": "Sell",
+        "market.buy_btn": "§aBuy",
+        "market.sell_btn": "§cSell",
+        "market.book_header": "§e{0} §7· prices in {1}\n§cAsks §7/ §aBids",
+        "market.order_title": "§6{0} {1}",
+        "market.item_label": "Item ID",
+        "market.price_label": "Unit price",
+        "market.qty_label": "Quantity",
+        "market.placed": "§aOrder §e#{0} §aplaced: {1} §e{2} §7x{3} §a@ §6{4} {5}§a, {6} filled immediately",
+        "market.filled": "§a{0} §e{1} §afully filled, {2} items",
+        "market.sold_msg": "§aMarket: sold §e{0} §7x{1} §a@ {2}, received §6{3} {4}",
+        "market.cancelled": "§eOrder #{0} ({1}) cancelled, escrow for the remaining {2} returned",
+        "market.expired": "§eOrder #{0} ({1}) expired, escrow for the remaining {2} returned",
+        "market.claimed": "§aClaimed {0} items",
+        "market.claim_rest": "§7, inventory full, {0} still waiting (/market claim)",
+        "market.empty": "§7No open orders",
+        "market.empty_hand": "§cHold the item you want to sell",
+        "market.no_orders": "§7You have no open orders",
+        "market.cancel_hint": "§7Tap an order to cancel it",
+        "market.cancel_title": "§cCancel order",
+        "market.no_such_order": "§cOrder §e{0} §cnot found or not yours",
+        "market.bad_order": "§cInvalid price or quantity",
+        "market.bad_item": "§cUnknown item: §e{0}",
+        "market.too_many": "§cYou can have at most {0} open orders",
+        "market.not_enough_items": "§cYou do not have {1} §e{0}",
+        "market.disabled": "§cMarket is disabled",
 
         "tpa.sent": "§7Sent teleport request to §a%s§7.",
         "tpa.request_title": "§6Teleport Request",
@@ -559,7 +799,7 @@ default_translations = {
 
         "back.title": "§6Death Back",
         "back.recorded": "§cDeath point recorded. /back to return. %s points recorded.",
-        "back.teleported": "§aTeleported to death point.",
+        "back.teleported": "§aReturned to the recorded location.",
         "back.empty": "§cNo death points recorded.",
         "back.no_death": "§cYou haven't died yet.",
         "back.invalid_index": "§cInvalid death point index.",
@@ -596,6 +836,24 @@ default_translations = {
         "hub.set": "§aHub set:",
         "hub.no_perm": "§cNo permission to set hub.",
         "hub.pos_info": "§eTarget:\n§bX: §f%s\n§bY: §f%s\n§bZ: §f%s\n§bDim: §f%s",
+        "teleport.cooldown": "§cTeleport on cooldown, try again in {0}s.",
+        "teleport.need_money": "§cTeleport costs {0} {1}, insufficient balance.",
+        "teleport.cost": "§eTeleport cost {0} {1}.",
+        "teleport.no_target": "§cUnable to resolve teleport target.",
+        "teleport.stats_header": "§6[Teleport stats] §7prewarm {0} ticks · {1} dimensions cached",
+        "teleport.stats_line": "§e{0}§7: count §f{1} §7failed §c{2} §7avg §f{3}ms §7max §f{4}ms §7call §f{5}ms",
+        "teleport.stats_empty": "§7No teleports recorded yet.",
+        "teleport.stats_reset": "§aTeleport stats reset.",
+        "teleport.bad_selector": "§cInvalid targets: {0} (use all / @a / @a[r=,rm=,tag=,name=,c=] / name,name)",
+        "teleport.mass_none": "§cNo online players matched.",
+        "teleport.mass_queued": "§6[Mass teleport] §e{0}§7: queued §f{1} §7players, ETA §f{2}s",
+        "teleport.mass_progress": "§6[Mass teleport] §e{0}§7: §f{1}/{2} §7· ETA §f{3}s",
+        "teleport.mass_done": "§6[Mass teleport] §e{0}§7: done, moved §a{1}§7, skipped §c{2}§7, took §f{3}s",
+        "teleport.mass_cancelled": "§6[Mass teleport] §e{0}§7: cancelled ({1}/{2})",
+        "teleport.mass_arrived": "§aYou were teleported to {0}.",
+        "teleport.queue_empty": "§7Mass teleport queue is empty.",
+        "teleport.queue_header": "§6[Mass teleport] §7{0} jobs · budget §f{1} §7players/tick · TPS §f{2}",
+        "teleport.queue_cancelled": "§aMass teleport queue cleared, {0} players not moved.",
 
         "servers.title": "§6Server Transfer",
         "servers.disabled": "§cModule not enabled.",
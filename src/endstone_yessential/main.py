@@ -28,6 +28,12 @@ from .crash import CrashSystem
 from .cleanmgr import CleanmgrSystem
 from .suicide import SuicideSystem
 from .sign import SignSystem
+from .players import PlayerRegistry
+from .http_api import HttpApi
+from .shop import ShopSystem
+from .market import MarketSystem
+from .teleport import TeleportService
+from .spatial import SpatialIndex
 from .i18n import init_i18n, get_i18n, tr
 from .update_checker import UpdateChecker
 from .log import plugin_print, set_debug, debug
@@ -45,7 +51,7 @@ class YEssentialPlugin(Plugin):
     commands = {
         "yest": {
             "description": "YEssential 主命令",
-            "usages": ["/yest", "/yest reload"],
+            "usages": ["/yest", "/yest reload", "/yest tpstats [reset]", "/yest tpqueue [cancel]"],
             "aliases": ["yessential"],
             "permissions": ["yessential.command.yest"],
         },
@@ -61,17 +67,17 @@ class YEssentialPlugin(Plugin):
         },
         "moneys": {
             "description": "管理员金钱操作",
-            "usages": ["/moneys <add|del|set|get|history> <player: target> [amount: int]"],
+            "usages": ["/moneys <add|del|set|get|history> <player: target> [amount: int]", "/moneys batch <op: str> <amount: int> <players: message>", "/moneys import <file: str> [mode: str]", "/moneys job <action: str> [name: str]", "/moneys stats [mode: str]", "/moneys sync"],
             "permissions": ["yessential.command.money.admin"],
         },
         "home": {
             "description": "家园系统",
-            "usages": ["/home", "/home set <name: str>", "/home del <name: str>", "/home <name: str>"],
+            "usages": ["/home", "/home set <name: str>", "/home del <name: str>", "/home nearest", "/home <name: str>"],
             "permissions": ["yessential.command.home"],
         },
         "warp": {
             "description": "传送点系统",
-            "usages": ["/warp", "/warp set <name: str>", "/warp del <name: str>", "/warp <name: str>"],
+            "usages": ["/warp", "/warp set <name: str>", "/warp del <name: str>", "/warp near [radius: int] [center: str]", "/warp <name: str>", "/warp <name: str> <targets: target>"],
             "permissions": ["yessential.command.warp"],
         },
         "rtp": {
@@ -121,7 +127,7 @@ class YEssentialPlugin(Plugin):
         },
         "hub": {
             "description": "回城菜单",
-            "usages": ["/hub"],
+            "usages": ["/hub", "/hub <targets: target>"],
             "permissions": ["yessential.command.hub"],
         },
         "sethub": {
@@ -204,6 +210,16 @@ class YEssentialPlugin(Plugin):
             "usages": ["/redpacket", "/redpacket history", "/redpacket list", "/redpacket open", "/redpacket send"],
             "permissions": ["yessential.command.rp"],
         },
+        "shop": {
+            "description": "物品商店",
+            "usages": ["/shop", "/shop search <keyword: message>", "/shop buy <id: str> [count: int]", "/shop reload", "/shop <category: str>"],
+            "permissions": ["yessential.command.shop"],
+        },
+        "market": {
+            "description": "玩家交易所",
+            "usages": ["/market", "/market sell <price: float> [count: int]", "/market buy <item: str> <price: float> <count: int>", "/market book <item: str>", "/market orders", "/market cancel <id: int>", "/market claim"],
+            "permissions": ["yessential.command.market"],
+        },
         "redpackethelp": {
             "description": "红包功能详解",
             "usages": ["/redpackethelp"],
@@ -219,6 +235,7 @@ class YEssentialPlugin(Plugin):
         "yessential.command.home": {"description": "允许使用家园系统命令", "default": True},
         "yessential.command.warp": {"description": "允许使用传送点系统命令", "default": True},
         "yessential.command.warp.admin": {"description": "允许管理传送点", "default": "op"},
+        "yessential.command.teleport.mass": {"description": "允许批量传送玩家(/warp <名称> all, /hub all)", "default": "op"},
         "yessential.command.rtp": {"description": "允许使用随机传送命令", "default": True},
         "yessential.command.tpa": {"description": "允许使用传送请求命令", "default": True},
         "yessential.command.notice": {"description": "允许使用公告系统命令", "default": True},
@@ -240,6 +257,9 @@ class YEssentialPlugin(Plugin):
         "yessential.command.sign": {"description": "允许使用签到命令", "default": True},
         "yessential.command.signset": {"description": "允许管理签到系统", "default": "op"},
         "yessential.command.rtpreset": {"description": "允许重置 RTP 冷却", "default": "op"},
+        "yessential.command.shop": {"description": "允许使用商店命令", "default": True},
+        "yessential.command.shop.admin": {"description": "允许重载商店目录", "default": "op"},
+        "yessential.command.market": {"description": "允许使用交易所命令", "default": True},
     }
 
     def on_load(self):
@@ -281,6 +301,9 @@ class YEssentialPlugin(Plugin):
 
         # 1. 初始化子系统
         self.economy = EconomySystem(self)
+        self.players = PlayerRegistry(self)
+        self.teleport = TeleportService(self)
+        self.spatial = SpatialIndex()
         self.home = HomeSystem(self)
         self.warp = WarpSystem(self)
         self.rtp = RTPSystem(self)
@@ -299,6 +322,9 @@ class YEssentialPlugin(Plugin):
         self.cleanmgr = CleanmgrSystem(self)
         self.suicide = SuicideSystem(self)
         self.sign_system = SignSystem(self)
+        self.shop = ShopSystem(self)
+        self.market = MarketSystem(self)
+        self.http_api = HttpApi(self)
 
         # 注册菜单触发监听器（独立 listener，与 JS 版 registerEvents 一致）
         from .cd import MenuTriggerListener
@@ -338,6 +364,15 @@ class YEssentialPlugin(Plugin):
     def on_disable(self):
         plugin_print(tr("logo.disabling", plugin_name))
         self.motd.stop_rotation()
+        if hasattr(self, 'http_api') and self.http_api:
+            self.http_api.stop()
+        # 经济账本落盘(压缩为快照)
+        if hasattr(self, 'economy') and self.economy:
+            self.economy.close()
+        if hasattr(self, 'players') and self.players:
+            self.players.batch_save(background=False)
+        if hasattr(self, 'market') and self.market:
+            self.market.flush(background=False)
         plugin_print(tr("logo.disabled", plugin_name))
 
     # ══════════════════════════════════════════════════════════
@@ -352,12 +387,15 @@ class YEssentialPlugin(Plugin):
         # Fcam 清理
         if hasattr(self, 'fcam') and self.fcam:
             self.fcam.on_player_quit(player)
-        # 排行榜缓存保存
+        # 排行榜缓存保存 + 释放计分板镜像
         if hasattr(self, 'economy') and self.economy:
             try:
-                self.economy.ranking.update(player.name, self.economy.get_money_internal(player))
+                self.economy.on_player_quit(player)
             except:
                 pass
+        # 离线玩家的家园分片按 LRU 卸载
+        if hasattr(self, 'home') and self.home:
+            self.home.on_quit(player)
 
     @event_handler
     def on_player_join(self, event: PlayerJoinEvent):
@@ -367,6 +405,18 @@ class YEssentialPlugin(Plugin):
 
         player.send_message(tr("welcome", player.name))
 
+        # 已知玩家登记(离线转账目标校验)
+        if hasattr(self, 'players') and self.players:
+            self.players.seen(player)
+
+        # 交易所领取箱(离线期间买到或退回的物品)
+        if hasattr(self, 'market') and self.market:
+            self.market.on_join(player)
+
+        # 载入家园分片
+        if hasattr(self, 'home') and self.home:
+            self.home.on_join(player)
+
         # Fcam 地址映射
         if hasattr(self, 'fcam') and self.fcam:
             self.fcam.on_player_join(player)
@@ -458,9 +508,23 @@ class YEssentialPlugin(Plugin):
                     return True
                 self.config_manager.load_config()
                 self.cd.config_manager.load()  # 重新读取菜单配置
+                self.shop.load()  # 重新读取商品目录
+                self.hub.index_location()  # 回城点可能已在配置中修改
                 self.i18n.init()  # 重新读取 Language 设置
                 sender.send_message(tr("reload"))
                 return True
+            elif len(args) > 0 and args[0] == "tpstats":
+                if not sender.has_permission("yessential.command.yest.admin"):
+                    sender.send_message(tr("no_permission"))
+                    return True
+                self.teleport.handle_stats(sender, args[1:])
+                return True
+            elif len(args) > 0 and args[0] == "tpqueue":
+                if not sender.has_permission("yessential.command.teleport.mass"):
+                    sender.send_message(tr("no_permission"))
+                    return True
+                self.teleport.handle_queue(sender, args[1:])
+                return True
             else:
                 sender.send_message(tr("version", plugin_version))
                 return True
@@ -530,6 +594,8 @@ class YEssentialPlugin(Plugin):
                 self.home.set_home(sender, args[1])
             elif len(args) == 2 and args[0] == "del":
                 self.home.del_home(sender, args[1])
+            elif len(args) == 1 and args[0] == "nearest":
+                self.home.teleport_nearest(sender)
             elif len(args) == 1:
                 self.home.teleport_home(sender, args[0])
             else:
@@ -544,10 +610,14 @@ class YEssentialPlugin(Plugin):
                 self.warp.set_warp(sender, args[1])
             elif len(args) == 2 and args[0] == "del" and sender.has_permission("yessential.command.warp.admin"):
                 self.warp.del_warp(sender, args[1])
+            elif args[0] == "near" and len(args) <= 3 and (len(args) == 1 and "near" not in self.warp.warp_data or len(args) > 1 and args[1].isdigit()):
+                self.warp.open_near_gui(sender, int(args[1]) if len(args) > 1 else None, len(args) == 3 and args[2] == "hub")
             elif len(args) == 1:
                 self.warp.teleport_warp(sender, args[0])
+            elif len(args) == 2 and args[0] not in ("set", "del") and sender.has_permission("yessential.command.teleport.mass"):
+                self.warp.mass_teleport(sender, args[0], args[1])
             else:
-                sender.send_message("§c用法: /warp [name] | /warp set <name> | /warp del <name>")
+                sender.send_message("§c用法: /warp [name] | /warp set <name> | /warp del <name> | /warp <name> <all|@a[...]>")
             return True
 
         # ── rtp ────────────────────────────────────────────
@@ -650,7 +720,13 @@ class YEssentialPlugin(Plugin):
 
         # ── hub ────────────────────────────────────────────
         elif cmd == "hub":
-            self.hub.open_hub_gui(sender)
+            if len(args) == 1:
+                if not sender.has_permission("yessential.command.teleport.mass"):
+                    sender.send_message(tr("no_permission"))
+                else:
+                    self.hub.mass_teleport(sender, args[0])
+            else:
+                self.hub.open_hub_gui(sender)
             return True
 
         elif cmd == "sethub":
@@ -673,6 +749,15 @@ class YEssentialPlugin(Plugin):
             self.cd.getclock(sender)
             return True
 
+        # ── shop / market ─────────────────────────────────
+        elif cmd == "shop":
+            self.shop.on_command(sender, args)
+            return True
+
+        elif cmd == "market":
+            self.market.on_command(sender, args)
+            return True
+
         # ── fcam ───────────────────────────────────────────
         elif cmd == "fcam":
             self.fcam.toggle_fcam(sender)
@@ -0,0 +1,460 @@
+"""
+YEssential Market - 玩家交易所
+每种物品一本订单簿: 买单最大堆 / 卖单最小堆(惰性删除), 挂单与撮合 O(log n), 价格优先、订单号(时间)优先, 成交价取先挂单一方;
+托管走余额 API: 买单挂出即扣全款(以更低价成交时退差价), 卖单挂出即从背包移走物品; 买到的与退回的物品进入领取箱, 在线时直接放入背包.
+所有订单的过期由一个 (到期时间, 订单号) 小顶堆 + 一个定时任务处理; 每笔成交在结算时同步追加一行到 market/trades.log
+托管扣款与订单/领取箱变动在同一次操作内同步写入 market/journal.log(每次操作一行, 记录被改动订单与领取箱的新状态);
+market.json 快照定期在后台写入, 写入时轮换日志, 启动时快照之后的日志行被重放, 进程崩溃不会丢失已托管的余额或物品
+"""
+import os, json, math, time, heapq, threading
+from typing import Dict, List, Optional, Tuple
+
+from endstone import Player
+from endstone.form import ActionForm, ModalForm, MessageForm, TextInput
+from endstone.inventory import ItemStack, ItemType
+
+from .i18n import tr
+from .log import plugin_print
+from .shop import inventory_room, split_stacks
+
+BUY, SELL = "buy", "sell"
+
+
+class Order:
+    __slots__ = ("id", "side", "item", "price", "qty", "owner", "expire")
+
+    def __init__(self, id: int, side: str, item: str, price: float, qty: int, owner: str, expire: float):
+        self.id = id; self.side = side; self.item = item; self.price = price
+        self.qty = qty; self.owner = owner; self.expire = expire
+
+    def to_dict(self) -> dict:
+        return {k: getattr(self, k) for k in self.__slots__}
+
+
+class OrderBook:
+    """堆项: 买 (-价格, 订单号, 订单) / 卖 (价格, 订单号, 订单); qty 归零的订单留在堆中, 到堆顶时弹出, 过多时整体重建"""
+    COMPACT_MIN = 64
+
+    def __init__(self):
+        self.bids: list = []; self.asks: list = []
+        self.live = 0; self.dead = 0
+
+    def push(self, o: Order):
+        if o.side == BUY: heapq.heappush(self.bids, (-o.price, o.id, o))
+        else: heapq.heappush(self.asks, (o.price, o.id, o))
+        self.live += 1
+
+    def best(self, side: str) -> Optional[Order]:
+        heap = self.bids if side == BUY else self.asks
+        while heap and heap[0][2].qty <= 0: heapq.heappop(heap); self.dead -= 1
+        return heap[0][2] if heap else None
+
+    def retire(self, o: Order):
+        """订单离开订单簿(成交完 / 撤单 / 过期)"""
+        o.qty = 0; self.live -= 1; self.dead += 1
+        if self.dead > self.COMPACT_MIN and self.dead > self.live:
+            self.bids = [e for e in self.bids if e[2].qty > 0]; heapq.heapify(self.bids)
+            self.asks = [e for e in self.asks if e[2].qty > 0]; heapq.heapify(self.asks)
+            self.dead = 0
+
+    def match(self, o: Order) -> List[Tuple[Order, int, float]]:
+        """新订单与对手盘撮合, 返回 [(对手订单, 数量, 成交价)]; 未成交部分留在 o.qty"""
+        fills = []; opp = SELL if o.side == BUY else BUY
+        while o.qty > 0:
+            m = self.best(opp)
+            if m is None or (m.price > o.price if o.side == BUY else m.price < o.price): break
+            q = min(o.qty, m.qty); o.qty -= q; m.qty -= q
+            fills.append((m, q, m.price))
+            if m.qty == 0: self.retire(m)
+        return fills
+
+    def depth(self, side: str, levels: int = 5) -> List[Tuple[float, int]]:
+        """按价格聚合的前 levels 档 [(价格, 数量)]"""
+        heap = self.bids if side == BUY else self.asks; n = levels * 8
+        while True:
+            out: Dict[float, int] = {}
+            for _, _, o in heapq.nsmallest(n, heap):
+                if o.qty > 0: out[o.price] = out.get(o.price, 0) + o.qty
+            if len(out) > levels or n >= len(heap): break   # 多取到一档才能确定第 levels 档已完整
+            n *= 4
+        return list(out.items())[:levels]
+
+
+def parse_price(text) -> float:
+    """价格输入 → float; nan / inf 等非有限值与数字一样能被 float() 解析, 这里一并拒绝"""
+    v = float(text)
+    if not math.isfinite(v): raise ValueError(f"non-finite price: {text!r}")
+    return v
+
+
+class MarketSystem:
+    EXPIRY_TICKS = 20
+    SAVE_TICKS = 1200
+    PAGE = 10
+
+    def __init__(self, plugin):
+        self.plugin = plugin
+        self.dir = os.path.join(str(plugin.data_folder), "market"); os.makedirs(self.dir, exist_ok=True)
+        self.path = os.path.join(self.dir, "market.json")
+        self.log_path = os.path.join(self.dir, "trades.log")
+        self.journal_path = os.path.join(self.dir, "journal.log")
+        self.old_path = self.journal_path + ".old"       # 轮换出的日志, 快照写入成功后删除
+        self.books: Dict[str, OrderBook] = {}
+        self.orders: Dict[int, Order] = {}
+        self.by_owner: Dict[str, set] = {}
+        self.claims: Dict[str, Dict[str, int]] = {}       # 玩家 → {物品: 数量}, 待领取
+        self._expiry: List[Tuple[float, int]] = []        # (到期时间, 订单号), 已成交/撤销的在弹出时跳过
+        self._next = 1; self._seq = 0; self._dirty = False
+        self._touched: Dict[int, Order] = {}; self._boxes: set = set(); self._fills: List[str] = []   # 本次操作的改动, _commit 时写出
+        self._io = threading.Lock()                       # 持有期间: 快照写入进行中
+        self._jf = None; self._tf = None
+        self.trades = 0
+        self.load()
+        plugin.server.scheduler.run_task(plugin, self.expire_due, self.EXPIRY_TICKS, self.EXPIRY_TICKS)
+        plugin.server.scheduler.run_task(plugin, self.flush, self.SAVE_TICKS, self.SAVE_TICKS)
+
+    @property
+    def config(self) -> dict:
+        return self.plugin.config_manager.get("Market", {})
+
+    @property
+    def economy(self):
+        return self.plugin.economy
+
+    # ── 存储 ────────────────────────────────────────────
+    def load(self):
+        """快照 + 重放快照之后的日志行(先 .old 后当前); 有重放时立即写一次快照"""
+        data = {}
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f: data = json.load(f)
+        except Exception as e:
+            plugin_print(f"[Market] market.json 读取失败: {e}", "WARNING")
+        self._next = data.get("next", 1); self.claims = data.get("claims", {}); self._seq = base = data.get("seq", 0)
+        for d in sorted(data.get("orders", []), key=lambda d: d["id"]):
+            o = Order(**d)
+            if o.qty > 0: self._rest(o)
+        replayed = 0
+        for path in (self.old_path, self.journal_path):
+            try:
+                if not os.path.exists(path): continue
+                with open(path, 'r', encoding='utf-8') as f: lines = f.readlines()
+            except Exception as e:
+                plugin_print(f"[Market] {os.path.basename(path)} 读取失败: {e}", "WARNING"); continue
+            for line in lines:
+                try: e = json.loads(line)
+                except ValueError: continue   # 崩溃时写了一半的行
+                if e["s"] <= base: continue
+                self._replay(e); self._seq = max(self._seq, e["s"]); replayed += 1
+        self._tf = open(self.log_path, 'a', encoding='utf-8')
+        self._jf = open(self.journal_path, 'a', encoding='utf-8')
+        if replayed:
+            plugin_print(f"[Market] 已从日志恢复 {replayed} 次操作")
+            self._dirty = True; self.flush(background=False)
+
+    def _replay(self, e: dict):
+        self._next = max(self._next, e["n"])
+        for d in e.get("o", ()):
+            o = self.orders.get(d["id"])
+            if o is None: self._rest(Order(**d))
+            else: o.qty = d["qty"]
+        for oid in e.get("x", ()):
+            o = self.orders.get(oid)
+            if o is not None: self.books[o.item].retire(o); self._close(o)
+        for name, box in e.get("c", {}).items():
+            if box: self.claims[name] = box
+            else: self.claims.pop(name, None)
+
+    def _commit(self):
+        """一次操作结束: 成交行与操作日志行同步写出(写入 OS 缓冲, 不等下一次快照)"""
+        if not self._touched and not self._boxes and not self._fills: return
+        self._seq += 1
+        live = [o.to_dict() for o in self._touched.values() if o.qty > 0 and self.orders.get(o.id) is o]
+        closed = [oid for oid, o in self._touched.items() if self.orders.get(oid) is not o]
+        boxes = {n: dict(self.claims[n]) if n in self.claims else None for n in self._boxes}
+        line = json.dumps({"s": self._seq, "n": self._next, "o": live, "x": closed, "c": boxes}, ensure_ascii=False)
+        fills, self._fills = self._fills, []; self._touched.clear(); self._boxes.clear(); self._dirty = True
+        try:
+            if fills: self._tf.write("\n".join(fills) + "\n"); self._tf.flush()
+            self._jf.write(line + "\n"); self._jf.flush()
+        except Exception as e: plugin_print(f"[Market] 日志写入失败: {e}", "WARNING")
+
+    def _rotate(self):
+        """当前日志并入 .old(上次快照写入失败时 .old 仍在, 追加到其后), 重新打开空日志"""
+        self._jf.close()
+        if os.path.exists(self.old_path):
+            with open(self.journal_path, 'rb') as src, open(self.old_path, 'ab') as dst: dst.write(src.read())
+            os.remove(self.journal_path)
+        else: os.replace(self.journal_path, self.old_path)
+        self._jf = open(self.journal_path, 'a', encoding='utf-8')
+
+    def flush(self, background: bool = True):
+        """订单快照落盘: 主线程拷贝快照并轮换日志, 序列化与写盘在后台线程; 上一次写入未结束时跳过本次"""
+        if not self._dirty: return
+        if not self._io.acquire(blocking=not background): return
+        try: self._rotate()
+        except Exception as e:
+            self._io.release(); plugin_print(f"[Market] 日志轮换失败: {e}", "WARNING"); return
+        orders = [o.to_dict() for o in self.orders.values()]
+        claims = {n: dict(b) for n, b in self.claims.items()}
+        snap = {"seq": self._seq, "next": self._next, "orders": orders, "claims": claims}
+        self._dirty = False
+        def work():
+            try:
+                tmp = self.path + ".tmp"
+                with open(tmp, 'w', encoding='utf-8') as f: json.dump(snap, f, ensure_ascii=False)
+                os.replace(tmp, self.path); os.remove(self.old_path)
+            except Exception as e:
+                self._dirty = True; plugin_print(f"[Market] 写入失败: {e}", "WARNING")   # .old 保留, 下次快照前继续追加
+            finally: self._io.release()
+        if background: threading.Thread(target=work, daemon=True).start()
+        else: work()
+
+    # ── 撮合 ────────────────────────────────────────────
+    @staticmethod
+    def normalize(item: str) -> str:
+        item = item.strip().lower()
+        return item if ":" in item else "minecraft:" + item
+
+    def _rest(self, o: Order):
+        """未成交部分挂入订单簿"""
+        book = self.books.get(o.item)
+        if book is None: book = self.books[o.item] = OrderBook()
+        book.push(o); self.orders[o.id] = o
+        self.by_owner.setdefault(o.owner, set()).add(o.id)
+        heapq.heappush(self._expiry, (o.expire, o.id))
+
+    def _close(self, o: Order):
+        self.orders.pop(o.id, None)
+        ids = self.by_owner.get(o.owner)
+        if ids is not None:
+            ids.discard(o.id)
+            if not ids: del self.by_owner[o.owner]
+
+    def place(self, player, side: str, item: str, price: float, qty: int) -> Optional[Order]:
+        """校验 → 托管(扣款或移走物品) → 撮合结算 → 余量挂单; 失败返回 None"""
+        cfg = self.config; name = player.name; item = self.normalize(item)
+        price = round(float(price), 2); qty = int(qty)
+        if not math.isfinite(price) or price <= 0 or price > cfg.get("max_price", 1e9) or qty < 1: player.send_message(tr("market.bad_order")); return None
+        if len(self.by_owner.get(name, ())) >= cfg.get("max_orders", 20): player.send_message(tr("market.too_many", cfg.get("max_orders", 20))); return None
+        if ItemType.get(item) is None: player.send_message(tr("market.bad_item", item)); return None
+        if side == BUY:
+            if not self.economy.reduce_money_internal(player, round(price * qty, 2)): player.send_message(tr("economy.not_enough")); return None
+        elif not self._take_items(player, item, qty): player.send_message(tr("market.not_enough_items", item, qty)); return None
+        o = Order(self._next, side, item, price, qty, name, time.time() + cfg.get("expire", 86400)); self._next += 1
+        book = self.books.get(item)
+        if book is None: book = self.books[item] = OrderBook()
+        filled = self._settle(o, book.match(o))
+        if o.qty > 0: self._rest(o)
+        self._touched[o.id] = o; self._commit()
+        coin = self.economy.config.coin_name
+        if o.qty > 0: player.send_message(tr("market.placed", o.id, tr(f"market.{side}"), item, o.qty, f"{price:g}", coin, filled))
+        else: player.send_message(tr("market.filled", tr(f"market.{side}"), item, filled))
+        return o
+
+    def _settle(self, taker: Order, fills: List[Tuple[Order, int, float]]) -> int:
+        """逐笔结算: 卖方收款(扣手续费), 买方物品进领取箱, 买方以更低价成交时退差价; 返回成交总数"""
+        if not fills: return 0
+        eco = self.economy; coin = eco.config.coin_name; fee = float(self.config.get("fee", 0))
+        hist = []; buyers = set(); refund = 0.0; done = 0; now = int(time.time())
+        for m, q, p in fills:
+            buy, sell = (taker, m) if taker.side == BUY else (m, taker)
+            gross = round(p * q, 2); net = round(gross * (1 - fee), 2)
+            self._credit(sell.owner, net, tr("market.sold_msg", taker.item, q, f"{p:g}", net, coin))
+            if taker.side == BUY and taker.price > p: refund += (taker.price - p) * q
+            box = self.claims.setdefault(buy.owner, {}); box[taker.item] = box.get(taker.item, 0) + q; buyers.add(buy.owner)
+            self._touched[m.id] = m; self._boxes.add(buy.owner)
+            self._fills.append(json.dumps({"t": now, "item": taker.item, "price": p, "qty": q, "buyer": buy.owner, "seller": sell.owner,
+                                         "buy": buy.id, "sell": sell.id, "fee": round(gross - net, 2)}, ensure_ascii=False))
+            hist.append((buy.owner, f"market +{q} {taker.item} @{p:g}: -{gross} {coin}"))
+            hist.append((sell.owner, f"market -{q} {taker.item} @{p:g}: +{net} {coin}"))
+            if m.qty == 0: self._close(m)
+            done += q; self.trades += 1
+        if refund: self._credit(taker.owner, round(refund, 2))
+        eco.history.add_many(hist)
+        server = self.plugin.server
+        for b in buyers:
+            p = server.get_player(b)
+            if p is not None: self.claim(p, quiet=True)
+        return done
+
+    def _credit(self, name: str, amount: float, msg: str = ""):
+        if amount <= 0: return
+        eco = self.economy; p = self.plugin.server.get_player(name)
+        if p is not None:
+            eco.add_money_internal(p, amount)
+            if msg: p.send_message(msg)
+        elif eco.config.is_scoreboard: eco.mailbox.add(name, "add", amount, "", msg)   # 计分板只能写在线玩家
+        else: eco.add_money_internal(name, amount)
+
+    def cancel(self, o: Order, reason: str = "market.cancelled"):
+        """撤单 / 过期: 退回托管的余额或物品"""
+        rest = o.qty; self.books[o.item].retire(o); self._close(o); self._touched[o.id] = o
+        p = self.plugin.server.get_player(o.owner)
+        if o.side == BUY: self._credit(o.owner, round(o.price * rest, 2))
+        else:
+            box = self.claims.setdefault(o.owner, {}); box[o.item] = box.get(o.item, 0) + rest; self._boxes.add(o.owner)
+            if p is not None: self.claim(p, quiet=True)
+        self._commit()
+        if p is not None: p.send_message(tr(reason, o.id, o.item, rest))
+
+    def expire_due(self):
+        now = time.time(); heap = self._expiry
+        while heap and heap[0][0] <= now:
+            _, oid = heapq.heappop(heap)
+            o = self.orders.get(oid)
+            if o is not None: self.cancel(o, "market.expired")
+
+    # ── 物品 ────────────────────────────────────────────
+    def _take_items(self, player: Player, item: str, qty: int) -> bool:
+        inv = player.inventory
+        if not inv.contains_at_least(ItemStack(item, 1), qty): return False
+        left = sum(s.amount for s in inv.remove_item(*split_stacks(ItemStack(item, 1), qty)).values())
+        if left:   # 并发变化导致没拿够: 放回已移走的部分
+            inv.add_item(*split_stacks(ItemStack(item, 1), qty - left)); return False
+        return True
+
+    def claim(self, player: Player, quiet: bool = False) -> int:
+        """把领取箱中的物品放进背包(放得下多少放多少), 返回放入的数量"""
+        box = self.claims.get(player.name)
+        if not box: return 0
+        inv = player.inventory; moved = 0
+        for item, n in list(box.items()):
+            proto = ItemStack(item, 1); k = min(n, inventory_room(inv, proto))
+            if k: k -= sum(s.amount for s in inv.add_item(*split_stacks(proto, k)).values())
+            if k >= n: del box[item]
+            else: box[item] = n - k
+            moved += k
+        if not box: del self.claims[player.name]
+        if moved: self._boxes.add(player.name); self._commit()
+        if moved or not quiet:
+            rest = sum(self.claims.get(player.name, {}).values())
+            player.send_message(tr("market.claimed", moved) + (tr("market.claim_rest", rest) if rest else ""))
+        return moved
+
+    def on_join(self, player: Player):
+        if player.name in self.claims: self.claim(player, quiet=True)
+
+    # ── 界面 ────────────────────────────────────────────
+    @staticmethod
+    def _short(item: str) -> str:
+        return item.split(":", 1)[1] if item.startswith("minecraft:") else item
+
+    def open_market(self, player: Player):
+        if not self.config.get("EnabledModule", True): player.send_message(tr("market.disabled")); return
+        mine = len(self.by_owner.get(player.name, ())); box = sum(self.claims.get(player.name, {}).values())
+        f = ActionForm(title=tr("market.title"), content=tr("market.content", len(self.orders), sum(1 for b in self.books.values() if b.live), self.trades))
+        f.add_button(tr("market.browse"), icon="textures/ui/magnifyingGlass")
+        f.add_button(tr("market.sell_hand"), icon="textures/ui/trade_icon")
+        f.add_button(tr("market.buy_item"), icon="textures/ui/icon_deals")
+        f.add_button(tr("market.my_orders", mine), icon="textures/ui/book_edit_default")
+        f.add_button(tr("market.claim_btn", box), icon="textures/ui/icon_recipe_item")
+        def cb(p, idx):
+            if idx is None: return
+            if idx == 0: self._browse(p, 0)
+            elif idx == 1: self._sell_hand(p)
+            elif idx == 2: self._order_form(p, BUY, None)
+            elif idx == 3: self._my_orders(p)
+            elif idx == 4: self.claim(p)
+        f.on_submit = cb; player.send_form(f)
+
+    def _browse(self, player: Player, page: int):
+        items = sorted(i for i, b in self.books.items() if b.live)
+        if not items: player.send_message(tr("market.empty")); return
+        pages = max(1, math.ceil(len(items) / self.PAGE)); page = max(0, min(page, pages - 1))
+        rows = items[page * self.PAGE:(page + 1) * self.PAGE]
+        f = ActionForm(title=f"{tr('market.title')} §8({page + 1}/{pages})", content="")
+        for i in rows:
+            b = self.books[i]; bid, ask = b.best(BUY), b.best(SELL)
+            f.add_button(f"{self._short(i)}\n§a{f'{bid.price:g}' if bid else '-'} §8/ §c{f'{ask.price:g}' if ask else '-'}")
+        nav = []
+        if page > 0: f.add_button(tr("shop.prev")); nav.append(page - 1)
+        if page < pages - 1: f.add_button(tr("shop.next")); nav.append(page + 1)
+        f.add_button(tr("shop.back"))
+        def cb(p, idx):
+            if idx is None: return
+            if idx < len(rows): self._book_view(p, rows[idx]); return
+            idx -= len(rows)
+            if idx < len(nav): self._browse(p, nav[idx])
+            else: self.open_market(p)
+        f.on_submit = cb; player.send_form(f)
+
+    def _book_view(self, player: Player, item: str):
+        book = self.books.get(item) or OrderBook(); coin = self.economy.config.coin_name
+        asks = book.depth(SELL); bids = book.depth(BUY)
+        lines = [tr("market.book_header", self._short(item), coin)]
+        lines += [f"§c{p:>10g}  §7x{q}" for p, q in reversed(asks)] or ["§8  -"]
+        lines.append("§8" + "─" * 16)
+        lines += [f"§a{p:>10g}  §7x{q}" for p, q in bids] or ["§8  -"]
+        f = ActionForm(title=self._short(item), content="\n".join(lines))
+        f.add_button(tr("market.buy_btn")); f.add_button(tr("market.sell_btn")); f.add_button(tr("shop.back"))
+        def cb(p, idx):
+            if idx is None: return
+            if idx == 0: self._order_form(p, BUY, item, asks[0][0] if asks else None)
+            elif idx == 1: self._order_form(p, SELL, item, bids[0][0] if bids else None)
+            else: self._browse(p, 0)
+        f.on_submit = cb; player.send_form(f)
+
+    def _sell_hand(self, player: Player):
+        hand = player.inventory.item_in_main_hand
+        if hand is None or hand.type.id == "minecraft:air": player.send_message(tr("market.empty_hand")); return
+        book = self.books.get(hand.type.id); bid = book.best(BUY) if book else None
+        self._order_form(player, SELL, hand.type.id, bid.price if bid else None, hand.amount)
+
+    def _order_form(self, player: Player, side: str, item: Optional[str], price: Optional[float] = None, qty: int = 1):
+        controls = [] if item else [TextInput(label=tr("market.item_label"), placeholder="diamond", default_value="")]
+        controls += [TextInput(label=tr("market.price_label"), placeholder="0", default_value=f"{price:g}" if price else ""),
+                     TextInput(label=tr("market.qty_label"), placeholder="1", default_value=str(qty))]
+        title = tr("market.order_title", tr(f"market.{side}"), self._short(item) if item else "")
+        fm = ModalForm(title=title, controls=controls)
+        def cb(p, data):
+            if not data: self.open_market(p); return
+            data = json.loads(data) if isinstance(data, str) else data
+            vals = [str(v).strip() for v in data]
+            it = item or vals.pop(0)
+            try: pr, q = parse_price(vals[0]), int(vals[1])
+            except (ValueError, IndexError): p.send_message(tr("market.bad_order")); return
+            if not it: p.send_message(tr("market.bad_order")); return
+            self.place(p, side, it, pr, q)
+        fm.on_submit = cb; player.send_form(fm)
+
+    def _my_orders(self, player: Player):
+        mine = sorted((self.orders[i] for i in self.by_owner.get(player.name, ())), key=lambda o: o.id)
+        if not mine: player.send_message(tr("market.no_orders")); return
+        coin = self.economy.config.coin_name
+        f = ActionForm(title=tr("market.my_orders", len(mine)), content=tr("market.cancel_hint"))
+        for o in mine:
+            f.add_button(f"#{o.id} {tr(f'market.{o.side}')} {self._short(o.item)} x{o.qty}\n§6{o.price:g} {coin} §8{time.strftime('%m-%d %H:%M', time.localtime(o.expire))}")
+        def cb(p, idx):
+            if idx is None or idx >= len(mine): return
+            o = mine[idx]
+            cfm = MessageForm(title=tr("market.cancel_title"), content=f"#{o.id} {tr(f'market.{o.side}')} {self._short(o.item)} x{o.qty} @ {o.price:g}",
+                              button1=tr("economy.confirm_btn"), button2=tr("economy.cancel_btn"))
+            def conf(cp, ok):
+                if ok == 0 and self.orders.get(o.id) is o: self.cancel(o)
+                self._my_orders(cp)
+            cfm.on_submit = conf; p.send_form(cfm)
+        f.on_submit = cb; player.send_form(f)
+
+    # ── 命令 ────────────────────────────────────────────
+    def on_command(self, sender, args: list):
+        """/market [sell <价格> [数量] | buy <物品> <价格> <数量> | book <物品> | orders | cancel <订单号> | claim]"""
+        if not isinstance(sender, Player): sender.send_message(tr("player_only")); return
+        if not self.config.get("EnabledModule", True): sender.send_message(tr("market.disabled")); return
+        sub = args[0].lower() if args else ""
+        try:
+            if not sub: self.open_market(sender)
+            elif sub == "sell" and len(args) >= 2:
+                hand = sender.inventory.item_in_main_hand
+                if hand is None or hand.type.id == "minecraft:air": sender.send_message(tr("market.empty_hand")); return
+                self.place(sender, SELL, hand.type.id, parse_price(args[1]), int(args[2]) if len(args) > 2 else hand.amount)
+            elif sub == "buy" and len(args) >= 4: self.place(sender, BUY, args[1], parse_price(args[2]), int(args[3]))
+            elif sub == "book" and len(args) >= 2: self._book_view(sender, self.normalize(args[1]))
+            elif sub == "orders": self._my_orders(sender)
+            elif sub == "claim": self.claim(sender)
+            elif sub == "cancel" and len(args) >= 2:
+                o = self.orders.get(int(args[1].lstrip("#")))
+                if o is None or o.owner != sender.name: sender.send_message(tr("market.no_such_order", args[1])); return
+                self.cancel(o)
+            else: sender.send_message("§c/market [sell <price> [count] | buy <item> <price> <count> | book <item> | orders | cancel <id> | claim]")
+        except ValueError: sender.send_message(tr("market.bad_order"))
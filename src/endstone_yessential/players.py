@@ -0,0 +1,123 @@
+"""
+YEssential Player Registry - 已知玩家登记表
+记录每位进过服的玩家(名称, xuid, 最后在线时间), 持久化到 players.json;
+小写名称的有序数组 + bisect 做前缀补全, Bloom 过滤器做 O(1) 的"从未见过"判定, 查询不读任何数据文件
+"""
+import os, json, time, bisect, hashlib, threading
+from typing import Dict, List, Optional
+
+from endstone import Player
+
+from .log import plugin_print
+
+
+class BloomFilter:
+    """k 个哈希由一次 blake2b 摘要的两半做双重哈希得到"""
+    def __init__(self, capacity: int, bits_per_item: int = 10, k: int = 7):
+        self.m = max(1024, capacity * bits_per_item)
+        self.k = k
+        self.capacity = capacity
+        self._bits = bytearray((self.m + 7) // 8)
+
+    def _positions(self, key: str):
+        d = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1, h2 = int.from_bytes(d[:8], "little"), int.from_bytes(d[8:], "little") | 1
+        return ((h1 + i * h2) % self.m for i in range(self.k))
+
+    def add(self, key: str):
+        for p in self._positions(key): self._bits[p >> 3] |= 1 << (p & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+
+class PlayerRegistry:
+    def __init__(self, plugin):
+        self.plugin = plugin
+        self.path = os.path.join(str(plugin.data_folder), "players.json")
+        self._data: Dict[str, dict] = {}          # 名称 → {"xuid", "last_seen"}
+        self._lower: Dict[str, str] = {}          # 小写名称 → 名称
+        self._sorted: List[str] = []              # 小写名称, 有序
+        self._bloom = BloomFilter(1024)
+        self._dirty = False
+        self.load()
+        plugin.server.scheduler.run_task(plugin, self.batch_save, 1200, 1200)
+
+    # ── 存储 ────────────────────────────────────────────
+    def load(self):
+        seeded = not os.path.exists(self.path)
+        try:
+            if not seeded:
+                with open(self.path, 'r', encoding='utf-8') as f: self._data = json.load(f)
+        except Exception as e:
+            plugin_print(f"[Players] players.json 读取失败: {e}", "WARNING"); self._data = {}
+        if seeded: self._seed()
+        self._reindex()
+
+    def _seed(self):
+        """首次启用: 以排行榜与余额存储中出现过的名称打底(无 xuid); 余额存储含尚未进入排行榜的账户"""
+        eco = getattr(self.plugin, "economy", None)
+        if eco is None: return
+        for n, _ in eco.ranking.get_range(0, len(eco.ranking)): self._data.setdefault(n, {"xuid": "", "last_seen": ""})
+        for n in eco.money_data: self._data.setdefault(n, {"xuid": "", "last_seen": ""})
+        if self._data: self._dirty = True; plugin_print(f"[Players] 已从经济数据导入 {len(self._data)} 位已知玩家")
+
+    def _reindex(self):
+        self._lower = {n.lower(): n for n in self._data}
+        self._sorted = sorted(self._lower)
+        self._bloom = BloomFilter(max(1024, len(self._lower) * 2))
+        for k in self._sorted: self._bloom.add(k)
+
+    def save(self, background: bool = True):
+        snapshot = dict(self._data)
+        def work():
+            try:
+                tmp = self.path + ".tmp"
+                with open(tmp, 'w', encoding='utf-8') as f: json.dump(snapshot, f, ensure_ascii=False)
+                os.replace(tmp, self.path)
+            except Exception as e: plugin_print(f"[Players] players.json 写入失败: {e}", "WARNING")
+        if background: threading.Thread(target=work, daemon=True).start()
+        else: work()
+
+    def batch_save(self, background: bool = True):
+        if self._dirty: self.save(background); self._dirty = False
+
+    # ── 登记 ────────────────────────────────────────────
+    def seen(self, player: Player):
+        name = player.name
+        rec = self._data.get(name)
+        if rec is None:
+            rec = self._data[name] = {"xuid": "", "last_seen": ""}
+            key = name.lower()
+            if key not in self._lower:
+                bisect.insort(self._sorted, key); self._bloom.add(key)
+                if len(self._sorted) > self._bloom.capacity: self._reindex()
+            self._lower[key] = name
+        try: rec["xuid"] = str(player.xuid)
+        except Exception: pass
+        rec["last_seen"] = time.strftime("%Y-%m-%d %H:%M:%S")
+        self._dirty = True
+
+    # ── 查询 ────────────────────────────────────────────
+    def resolve(self, name: str) -> Optional[str]:
+        """不区分大小写的精确匹配, 返回登记的原名; Bloom 判否时不查字典"""
+        key = name.strip().lower()
+        if not key or key not in self._bloom: return None
+        return self._lower.get(key)
+
+    def is_known(self, name: str) -> bool:
+        return self.resolve(name) is not None
+
+    def complete(self, prefix: str, limit: int = 8) -> List[str]:
+        key = prefix.strip().lower()
+        if not key: return []
+        i = bisect.bisect_left(self._sorted, key); out = []
+        while i < len(self._sorted) and len(out) < limit and self._sorted[i].startswith(key):
+            out.append(self._lower[self._sorted[i]]); i += 1
+        return out
+
+    def get(self, name: str) -> Optional[dict]:
+        real = self.resolve(name)
+        return dict(self._data[real], name=real) if real else None
+
+    def __len__(self): return len(self._data)
@@ -13,6 +13,7 @@ class RedpacketDB:
         self.plugin = plugin
         self.data_path = "./plugins/YEssential/data/Redpacketdata/Redpacket.json"
         self.data: Dict[str, Any] = {"nextId": 1, "packets": {}}
+        self.version = 0  # 每次写盘递增, 供只读快照判断红包数据是否变化
         self.ensure_directory()
         self.load()
 
@@ -33,6 +34,7 @@ class RedpacketDB:
             self.data = {"nextId": 1, "packets": {}}
 
     def save(self):
+        self.version += 1
         try:
             self.ensure_directory()
             with open(self.data_path, 'w', encoding='utf-8') as f:
@@ -40,8 +40,8 @@ class RTPSystem:
     # ─── /spreadplayers 方案（MC 引擎内部处理安全地表）─────────
 
     def _spread(self, player: Player, x: int, z: int, max_range: int = 50) -> bool:
-        """用 /spreadplayers 传送到安全地表"""
-        return self._dispatch(f'spreadplayers {x} {z} 1 {max_range} {player.name}')
+        """用 /spreadplayers 传送到安全地表（经 TeleportService 计时并记录出发点）"""
+        return self.plugin.teleport.track(player, "rtp", lambda: self._dispatch(f'spreadplayers {x} {z} 1 {max_range} {player.name}'))
 
     def _rtp(self, player: Player, anim: bool):
         x, z = self._random_xy()
@@ -127,8 +127,7 @@ class RTPSystem:
         try:
             x, z = self._random_xy()
             self._dispatch(f'effect "{player.name}" slow_falling 30 1 true')
-            player.teleport(Location(player.location.dimension, x, 320, z))
-            player.send_message(tr("rtp.fallback", x, 320, z))
+            self.plugin.teleport.teleport(player, Location(player.location.dimension, x, 320, z), "rtp", tr("rtp.fallback", x, 320, z))
         except Exception as e:
             plugin_print(f"[RTP] fallback fail: {e}")
 
@@ -0,0 +1,241 @@
+"""
+YEssential Shop - 物品商店
+商品目录(shop.json)启动时一次载入并建立索引: 按分类 / 按物品 ID / 名称全文(英文词前缀 + 中文单字与双字), 翻页与搜索只切片内存列表;
+每个商品的 ItemStack 原型首次使用时构造并缓存. 购买先按原型计算背包容量, 再一次扣款 + 一次放入, 放不下的部分按比例退款
+"""
+import os, re, json, math, bisect
+from typing import Dict, List, Optional
+
+from endstone import Player
+from endstone.form import ActionForm, ModalForm, Slider, TextInput
+from endstone.inventory import ItemStack, ItemType
+
+from .i18n import tr
+from .log import plugin_print
+
+_WORD = re.compile(r"[a-z0-9]+")
+_CJK = re.compile(r"[㐀-鿿]+")
+
+
+def tokens(text: str, query: bool = False) -> List[str]:
+    """英文/数字按词; 中文连续片段取单字与相邻双字(查询时有双字就只用双字, 更精确)"""
+    text = text.lower(); out = _WORD.findall(text)
+    for run in _CJK.findall(text):
+        pairs = [run[i:i + 2] for i in range(len(run) - 1)]
+        out += pairs if query and pairs else list(run) + pairs
+    return out
+
+
+def split_stacks(proto: ItemStack, n: int, meta=None) -> List[ItemStack]:
+    """按最大堆叠拆分, 供一次 add_item 放入"""
+    size = max(1, proto.max_stack_size); out = []
+    while n > 0:
+        s = ItemStack(proto.type.id, min(n, size), proto.data)
+        if meta is not None: s.set_item_meta(meta)
+        out.append(s); n -= s.amount
+    return out
+
+
+def inventory_room(inv, proto: ItemStack) -> int:
+    """背包还能放下多少个该物品(空格 + 同类未满的堆叠)"""
+    size = max(1, proto.max_stack_size); room = 0
+    for s in inv.contents:
+        if s is None or s.type.id == "minecraft:air": room += size
+        elif s.is_similar(proto): room += max(0, size - s.amount)
+    return room
+
+
+class ShopCatalog:
+    """只读目录与索引, 不依赖服务端对象"""
+    def __init__(self, data: dict):
+        self.categories: List[dict] = [c for c in data.get("categories", []) if isinstance(c, dict) and c.get("id")]
+        self.by_id: Dict[str, dict] = {}
+        self.by_category: Dict[str, List[dict]] = {c["id"]: [] for c in self.categories}
+        self.by_item: Dict[str, List[dict]] = {}
+        self._postings: Dict[str, set] = {}
+        for it in data.get("listings", []):
+            if not isinstance(it, dict) or not it.get("id") or not it.get("item") or it["id"] in self.by_id: continue
+            it = dict(it); it["item"] = it["item"] if ":" in it["item"] else "minecraft:" + it["item"]
+            it.setdefault("name", it["item"].split(":", 1)[1]); it.setdefault("count", 1); it.setdefault("max", 64)
+            try: it["price"] = float(it.get("price", 0))
+            except (TypeError, ValueError): continue
+            if it["price"] < 0 or int(it["count"]) < 1: continue
+            self.by_id[it["id"]] = it
+            self.by_category.setdefault(it.get("category", ""), []).append(it)
+            self.by_item.setdefault(it["item"], []).append(it)
+            for t in set(tokens(f"{it['name']} {it['id']} {it['item'].split(':', 1)[1]}")): self._postings.setdefault(t, set()).add(it["id"])
+        for lst in self.by_category.values(): lst.sort(key=lambda x: (x["price"], x["name"]))
+        self._vocab = sorted(self._postings)
+
+    def __len__(self): return len(self.by_id)
+
+    def category_name(self, cid: str) -> str:
+        return next((c.get("name", cid) for c in self.categories if c["id"] == cid), cid)
+
+    def _match(self, tok: str) -> set:
+        if not tok.isascii(): return self._postings.get(tok, set())
+        i = bisect.bisect_left(self._vocab, tok); ids = set()   # 英文词按前缀匹配
+        while i < len(self._vocab) and self._vocab[i].startswith(tok): ids |= self._postings[self._vocab[i]]; i += 1
+        return ids
+
+    def search(self, query: str) -> List[dict]:
+        toks = tokens(query, query=True)
+        if not toks: return []
+        ids = None
+        for t in sorted(set(toks), key=len, reverse=True):
+            ids = self._match(t) if ids is None else ids & self._match(t)
+            if not ids: return []
+        return sorted((self.by_id[i] for i in ids), key=lambda x: (x["price"], x["name"]))
+
+
+class ShopSystem:
+    PAGE = 10
+
+    def __init__(self, plugin):
+        self.plugin = plugin
+        self.path = os.path.join(str(plugin.data_folder), "shop.json")
+        self.catalog = ShopCatalog({})
+        self._protos: Dict[str, Optional[ItemStack]] = {}   # 商品 ID → ItemStack 原型(None: 物品 ID 无效)
+        self.load()
+
+    @property
+    def enabled(self) -> bool:
+        return self.plugin.config_manager.get("Shop", {}).get("EnabledModule", True)
+
+    # ── 目录 ────────────────────────────────────────────
+    @staticmethod
+    def default_catalog() -> dict:
+        return {
+            "categories": [
+                {"id": "blocks", "name": "建筑方块", "icon": "textures/blocks/stone"},
+                {"id": "food", "name": "食物", "icon": "textures/items/apple"}
+            ],
+            "listings": [
+                {"id": "stone", "category": "blocks", "item": "minecraft:stone", "name": "石头", "price": 20, "count": 16},
+                {"id": "oak_log", "category": "blocks", "item": "minecraft:oak_log", "name": "橡木原木", "price": 5},
+                {"id": "apple", "category": "food", "item": "minecraft:apple", "name": "苹果", "price": 3},
+                {"id": "bread", "category": "food", "item": "minecraft:bread", "name": "面包", "price": 5, "lore": ["§7新鲜出炉"]}
+            ]
+        }
+
+    def load(self):
+        data = None
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f: data = json.load(f)
+            else:
+                data = self.default_catalog()
+                with open(self.path, 'w', encoding='utf-8') as f: json.dump(data, f, indent=4, ensure_ascii=False)
+        except Exception as e: plugin_print(f"[Shop] shop.json 读取失败: {e}", "WARNING")
+        self.catalog = ShopCatalog(data or {}); self._protos.clear()
+        plugin_print(f"[Shop] 已载入 {len(self.catalog)} 件商品")
+
+    def _proto(self, it: dict) -> Optional[ItemStack]:
+        if it["id"] in self._protos: return self._protos[it["id"]]
+        proto = None
+        try:
+            if ItemType.get(it["item"]) is None: raise ValueError("unknown item type")
+            proto = ItemStack(it["item"], 1, int(it.get("data", 0)))
+            if it.get("display") or it.get("lore"):
+                meta = proto.item_meta
+                if it.get("display"): meta.display_name = it["display"]
+                if it.get("lore"): meta.lore = list(it["lore"])
+                proto.set_item_meta(meta)
+        except Exception as e:
+            plugin_print(f"[Shop] 商品 {it['id']} 的物品 {it['item']} 无效: {e}", "WARNING"); proto = None
+        self._protos[it["id"]] = proto
+        return proto
+
+    # ── 购买 ────────────────────────────────────────────
+    def buy(self, player: Player, listing_id: str, qty: int = 1) -> bool:
+        it = self.catalog.by_id.get(listing_id)
+        if it is None: player.send_message(tr("shop.not_found", listing_id)); return False
+        qty = max(1, min(int(qty), int(it["max"]))); proto = self._proto(it)
+        if proto is None: player.send_message(tr("shop.broken", it["name"])); return False
+        eco = self.plugin.economy; coin = eco.config.coin_name
+        items = qty * int(it["count"]); total = round(it["price"] * qty, 2)
+        room = inventory_room(player.inventory, proto)
+        if room < items: player.send_message(tr("shop.no_room", room // int(it["count"]))); return False
+        if not eco.reduce_money_internal(player, total): player.send_message(tr("economy.not_enough")); return False
+        meta = proto.item_meta if it.get("display") or it.get("lore") else None
+        left = sum(s.amount for s in player.inventory.add_item(*split_stacks(proto, items, meta)).values())
+        refund = round(total * left / items, 2) if left else 0
+        if refund: eco.add_money_internal(player, refund)
+        eco.history.add(player.name, f"shop {it['id']} x{qty}: -{total - refund} {coin}")
+        player.send_message(tr("shop.bought", it["name"], items - left, f"{total - refund:g}", coin))
+        return True
+
+    # ── 界面 ────────────────────────────────────────────
+    def _balance(self, player: Player) -> str:
+        eco = self.plugin.economy
+        return eco._fmt(eco.get_money_internal(player))
+
+    def open_shop(self, player: Player):
+        if not self.enabled: player.send_message(tr("shop.disabled")); return
+        cats = [c for c in self.catalog.categories if self.catalog.by_category.get(c["id"])]
+        f = ActionForm(title=tr("shop.title"), content=tr("shop.content", len(self.catalog), self._balance(player), self.plugin.economy.config.coin_name))
+        f.add_button(tr("shop.search_btn"), icon="textures/ui/magnifyingGlass")
+        for c in cats: f.add_button(f"{c.get('name', c['id'])}\n§8{len(self.catalog.by_category[c['id']])}", icon=c.get("icon") or None)
+        def cb(p, idx):
+            if idx is None: return
+            if idx == 0: self._search_form(p); return
+            c = cats[idx - 1]
+            self._open_list(p, c.get("name", c["id"]), self.catalog.by_category[c["id"]], 0)
+        f.on_submit = cb; player.send_form(f)
+
+    def _search_form(self, player: Player):
+        fm = ModalForm(title=tr("shop.search_title"), controls=[TextInput(label=tr("shop.search_label"), placeholder="stone / 苹果", default_value="")])
+        def cb(p, data):
+            if not data: self.open_shop(p); return
+            data = json.loads(data) if isinstance(data, str) else data
+            self.search(p, str(data[0]))
+        fm.on_submit = cb; player.send_form(fm)
+
+    def search(self, player: Player, query: str):
+        res = self.catalog.search(query)
+        if not res: player.send_message(tr("shop.no_result", query)); return
+        self._open_list(player, tr("shop.result_title", query), res, 0)
+
+    def _open_list(self, player: Player, title: str, listings: List[dict], page: int):
+        pages = max(1, math.ceil(len(listings) / self.PAGE)); page = max(0, min(page, pages - 1))
+        rows = listings[page * self.PAGE:(page + 1) * self.PAGE]
+        coin = self.plugin.economy.config.coin_name
+        f = ActionForm(title=f"{title} §8({page + 1}/{pages})", content=tr("shop.balance", self._balance(player), coin))
+        for it in rows: f.add_button(f"{it['name']} §8x{it['count']}\n§6{it['price']:g} {coin}", icon=it.get("icon") or None)
+        nav = []
+        if page > 0: f.add_button(tr("shop.prev")); nav.append(page - 1)
+        if page < pages - 1: f.add_button(tr("shop.next")); nav.append(page + 1)
+        f.add_button(tr("shop.back"))
+        def cb(p, idx):
+            if idx is None: return
+            if idx < len(rows): self._open_listing(p, rows[idx], lambda q: self._open_list(q, title, listings, page)); return
+            idx -= len(rows)
+            if idx < len(nav): self._open_list(p, title, listings, nav[idx])
+            else: self.open_shop(p)
+        f.on_submit = cb; player.send_form(f)
+
+    def _open_listing(self, player: Player, it: dict, back):
+        coin = self.plugin.economy.config.coin_name
+        label = tr("shop.detail", it["name"], it["count"], f"{it['price']:g}", coin, self._balance(player))
+        fm = ModalForm(title=tr("shop.buy_title"), controls=[Slider(label=label, min=1, max=max(1, int(it["max"])), step=1, default_value=1)])
+        def cb(p, data):
+            if not data: back(p); return
+            data = json.loads(data) if isinstance(data, str) else data
+            self.buy(p, it["id"], int(float(data[0])))
+        fm.on_submit = cb; player.send_form(fm)
+
+    # ── 命令 ────────────────────────────────────────────
+    def on_command(self, sender, args: list):
+        """/shop [分类|search <关键字>|buy <商品> [数量]|reload]"""
+        sub = args[0].lower() if args else ""
+        if sub == "reload":
+            if not sender.has_permission("yessential.command.shop.admin"): sender.send_message(tr("no_permission")); return
+            self.load(); sender.send_message(tr("shop.reloaded", len(self.catalog))); return
+        if not isinstance(sender, Player): sender.send_message(tr("player_only")); return
+        if not self.enabled: sender.send_message(tr("shop.disabled")); return
+        if sub == "search" and len(args) > 1: self.search(sender, " ".join(args[1:]))
+        elif sub == "buy" and len(args) > 1: self.buy(sender, args[1], int(args[2]) if len(args) > 2 and args[2].isdigit() else 1)
+        elif sub and sub in self.catalog.by_category: self._open_list(sender, self.catalog.category_name(sub), self.catalog.by_category[sub], 0)
+        elif sub: self.search(sender, " ".join(args))
+        else: self.open_shop(sender)
+
@@ -0,0 +1,123 @@
+"""
+YEssential Spatial - 命名地点的空间索引
+家园 / 传送点 / 回城点按 (图层, 维度) 放入均匀网格(x/z 平面, 格子边长 cell), 由 set/del 增量维护;
+图层区分地点类别: "warp" / "hub" / "home:<玩家>", 查询只访问所需图层
+k 近邻从查询点所在格子逐圈外扩, 圈的最小可能距离超过第 k 个结果即停止; 半径查询只访问覆盖范围内的格子
+两者在覆盖格子数超过已占用格子数时改为遍历已占用格子, 稀疏分布的远距离坐标不会放大开销
+"""
+import heapq, math
+from typing import Dict, Hashable, List, Tuple
+
+Point = Tuple[float, float, float]
+Grid = Dict[Tuple[int, int], Dict[Hashable, Point]]
+
+
+class SpatialIndex:
+    CELL = 128
+
+    def __init__(self, cell: int = CELL):
+        self.cell = cell
+        self._grids: Dict[Tuple[str, str], Grid] = {}                              # (图层, 维度) → 格子 → {键: 坐标}
+        self._where: Dict[Hashable, Tuple[Tuple[str, str], Tuple[int, int]]] = {}   # 键 → ((图层, 维度), 格子)
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, key) -> bool:
+        return key in self._where
+
+    def _cell(self, x: float, z: float) -> Tuple[int, int]:
+        return math.floor(x / self.cell), math.floor(z / self.cell)
+
+    # ── 增量维护 ────────────────────────────────────────
+    def put(self, key: Hashable, layer: str, dim: str, x: float, y: float, z: float):
+        self.remove(key)
+        c = self._cell(x, z)
+        self._grids.setdefault((layer, dim), {}).setdefault(c, {})[key] = (float(x), float(y), float(z))
+        self._where[key] = ((layer, dim), c)
+
+    def remove(self, key: Hashable) -> bool:
+        loc = self._where.pop(key, None)
+        if loc is None: return False
+        gk, c = loc; grid = self._grids[gk]; bucket = grid[c]
+        del bucket[key]
+        if not bucket:
+            del grid[c]
+            if not grid: del self._grids[gk]
+        return True
+
+    def drop_layer(self, layer: str) -> int:
+        """移除整个图层(如玩家家园数据卸载时), 返回移除的地点数"""
+        n = 0
+        for gk in [gk for gk in self._grids if gk[0] == layer]:
+            for bucket in self._grids.pop(gk).values():
+                for key in bucket: del self._where[key]; n += 1
+        return n
+
+    # ── 查询 ────────────────────────────────────────────
+    @staticmethod
+    def _scan(bucket: Dict[Hashable, Point], x, y, z):
+        for key, (px, py, pz) in bucket.items():
+            yield math.sqrt((px - x) ** 2 + (py - y) ** 2 + (pz - z) ** 2), key
+
+    def _cell_gap(self, c: Tuple[int, int], x: float, z: float) -> float:
+        """查询点到格子 c 的最小水平距离(三维距离的下界)"""
+        x0, z0 = c[0] * self.cell, c[1] * self.cell
+        dx = max(x0 - x, 0.0, x - (x0 + self.cell)); dz = max(z0 - z, 0.0, z - (z0 + self.cell))
+        return math.hypot(dx, dz)
+
+    def nearest(self, layer: str, dim: str, x: float, y: float, z: float, k: int = 1,
+                max_dist: float = math.inf) -> List[Tuple[float, Hashable]]:
+        """k 近邻, 按距离升序返回 [(距离, 键)]"""
+        grid = self._grids.get((layer, dim))
+        if not grid or k <= 0: return []
+        best: List[Tuple[float, int, Hashable]] = []   # 大顶堆(取负), 中间的序号避免键之间比较
+        seq = 0
+
+        def offer(bucket):
+            nonlocal seq
+            for d, key in self._scan(bucket, x, y, z):
+                if d > max_dist: continue
+                seq += 1
+                if len(best) < k: heapq.heappush(best, (-d, seq, key))
+                elif d < -best[0][0]: heapq.heapreplace(best, (-d, seq, key))
+
+        cx, cz = self._cell(x, z)
+        fx, fz = x - cx * self.cell, z - cz * self.cell
+        edge = min(fx, self.cell - fx, fz, self.cell - fz)   # 到本格边界的最短距离
+        r = 0
+        while True:
+            if (2 * r + 1) ** 2 > len(grid):
+                # 剩余范围比已占用格子多: 直接遍历尚未访问的格子
+                for c, bucket in grid.items():
+                    if max(abs(c[0] - cx), abs(c[1] - cz)) < r: continue
+                    if len(best) == k and self._cell_gap(c, x, z) >= -best[0][0]: continue
+                    if self._cell_gap(c, x, z) <= max_dist: offer(bucket)
+                break
+            floor = 0.0 if r == 0 else (r - 1) * self.cell + edge   # 第 r 圈的最小可能距离
+            if floor > max_dist or (len(best) == k and floor >= -best[0][0]): break
+            if r == 0:
+                ring = ((cx, cz),)
+            else:
+                ring = [(cx + i, cz + j) for i in range(-r, r + 1) for j in (-r, r)] + \
+                       [(cx + i, cz + j) for i in (-r, r) for j in range(-r + 1, r)]
+            for c in ring:
+                bucket = grid.get(c)
+                if bucket: offer(bucket)
+            r += 1
+        return [(-nd, key) for nd, _, key in sorted(best, reverse=True)]
+
+    def within(self, layer: str, dim: str, x: float, y: float, z: float, radius: float) -> List[Tuple[float, Hashable]]:
+        """半径查询, 按距离升序返回 [(距离, 键)]"""
+        grid = self._grids.get((layer, dim))
+        if not grid or radius < 0: return []
+        lo, hi = self._cell(x - radius, z - radius), self._cell(x + radius, z + radius)
+        span = (hi[0] - lo[0] + 1) * (hi[1] - lo[1] + 1)
+        if span > len(grid):
+            cells = [c for c in grid if lo[0] <= c[0] <= hi[0] and lo[1] <= c[1] <= hi[1]]
+        else:
+            cells = [(i, j) for i in range(lo[0], hi[0] + 1) for j in range(lo[1], hi[1] + 1) if (i, j) in grid]
+        out = [(d, key) for c in cells if self._cell_gap(c, x, z) <= radius
+               for d, key in self._scan(grid[c], x, y, z) if d <= radius]
+        out.sort(key=lambda t: t[0])
+        return out
@@ -0,0 +1,304 @@
+"""
+YEssential Teleport - 统一传送服务
+home / warp / hub / back / tpa / rtp 共用一条路径: 维度句柄按名称缓存, 按来源套用费用与冷却策略,
+记录出发点供 /back 返回, 可选提前若干 tick 预热目标区块后再传送, 并按来源统计耗时(/yest tpstats)
+批量传送(/warp <名称> all, /hub all, 选择器)进入队列, 每 tick 按预算出队, 预算随 cleanmgr 采样的 TPS 缩放
+"""
+import math, time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from endstone.level import Location
+
+from .i18n import tr
+from .log import plugin_print
+
+DIM_NAMES = {0: "Overworld", 1: "Nether", 2: "The End"}
+
+
+class _Counter:
+    """单个来源的计数: 次数 / 失败 / 端到端耗时(含预热等待) / teleport 调用耗时"""
+    __slots__ = ("count", "failed", "total", "peak", "call")
+
+    def __init__(self):
+        self.count = self.failed = 0
+        self.total = self.peak = self.call = 0.0
+
+    def add(self, ok: bool, total: float, call: float):
+        self.count += 1
+        if not ok: self.failed += 1
+        self.total += total; self.call += call
+        if total > self.peak: self.peak = total
+
+
+def select_players(server, sender, spec: str) -> Optional[List]:
+    """
+    all / @a / @s / 逗号分隔的玩家名 / @a[r=,rm=,tag=,name=,c=] → 在线玩家列表(按与 sender 的距离排序); 语法错误返回 None
+    """
+    online = [p for p in server.online_players if p.is_valid]
+    if spec in ("all", "@a"): return online
+    if spec == "@s": return [sender]
+    if not spec.startswith("@a["):
+        return [p for p in (server.get_player(n) for n in spec.split(",") if n) if p is not None]
+    if not spec.endswith("]"): return None
+    here = getattr(sender, "location", None); limit = None; tests = []
+    for part in filter(None, spec[3:-1].split(",")):
+        key, _, val = part.partition("=")
+        key = key.strip(); val = val.strip(); neg = val.startswith("!"); val = val.lstrip("!")
+        try:
+            if key in ("r", "rm") and here is not None:
+                d2 = float(val) ** 2; dim = here.dimension.name
+                tests.append((lambda p, d2=d2, dim=dim, here=here: p.location.dimension.name == dim and p.location.distance_squared(here) <= d2) if key == "r"
+                             else (lambda p, d2=d2, dim=dim, here=here: p.location.dimension.name != dim or p.location.distance_squared(here) >= d2))
+            elif key == "tag": tests.append(lambda p, v=val, n=neg: (v in p.scoreboard_tags) != n)
+            elif key == "name": tests.append(lambda p, v=val, n=neg: (p.name == v) != n)
+            elif key == "c": limit = int(val)
+            else: return None
+        except ValueError:
+            return None
+    out = [p for p in online if all(t(p) for t in tests)]
+    if here is not None:
+        dim = here.dimension.name
+        out.sort(key=lambda p: p.location.distance_squared(here) if p.location.dimension.name == dim else float("inf"))
+    return out if limit is None else out[:max(0, limit)]
+
+
+class _MassJob:
+    """一次批量传送: 目标已解析为 Location, 玩家按顺序出队"""
+    __slots__ = ("label", "loc", "source", "players", "pos", "moved", "skipped", "admin", "started", "notified")
+
+    def __init__(self, label: str, loc, source: str, players: list, admin):
+        self.label, self.loc, self.source, self.players, self.admin = label, loc, source, players, admin
+        self.pos = self.moved = self.skipped = 0
+        self.started = self.notified = time.monotonic()
+
+
+class TeleportService:
+    MASS_DEFAULTS = {"per_tick": 4, "min_scale": 0.1, "full_tps": 18.0, "min_tps": 12.0, "progress_seconds": 3}
+
+    def __init__(self, plugin):
+        self.plugin = plugin
+        self._dims: Dict[str, object] = {}                 # 维度名 → Dimension 句柄
+        self._cooldowns: Dict[Tuple[str, str], float] = {}  # (来源, 玩家) → 可再次传送的 monotonic 时刻
+        self.stats: Dict[str, _Counter] = {}
+        self._jobs: Deque[_MassJob] = deque()
+        self._task_id = None
+        self._credit = 0.0   # 批量队列的累计出队额度(预算可为小数)
+
+    @property
+    def config(self) -> dict:
+        return self.plugin.config_manager.get("Teleport", {})
+
+    # ── 维度与坐标 ──────────────────────────────────────
+    def dimension(self, name):
+        """按名称或 dimid 取维度句柄; 首次解析后缓存, 未知名称回退到第一个维度"""
+        if isinstance(name, int): name = DIM_NAMES.get(name, "Overworld")
+        dim = self._dims.get(name)
+        if dim is not None: return dim
+        level = self.plugin.server.level
+        if level is None: return None
+        try: dim = level.get_dimension(name)
+        except Exception: dim = None
+        if dim is None:
+            dims = level.dimensions
+            dim = dims[0] if dims else None
+            plugin_print(f"[Teleport] 未知维度 {name}, 回退到 {getattr(dim, 'name', None)}", "WARNING")
+        if dim is not None: self._dims[name] = dim
+        return dim
+
+    def location(self, data: dict, fallback=None) -> Optional[Location]:
+        """{x, y, z, dimension, pitch, yaw} → Location"""
+        dim = self.dimension(data.get("dimension", "Overworld")) or fallback
+        if dim is None: return None
+        return Location(dim, data["x"], data["y"], data["z"], data.get("pitch", 0.0), data.get("yaw", 0.0))
+
+    # ── 费用与冷却 ──────────────────────────────────────
+    def _admit(self, payer, source: str) -> Optional[float]:
+        """通过返回已扣费用(可能为 0), 冷却中或余额不足返回 None 并提示"""
+        cfg = self.config
+        if cfg.get("op_bypass", True) and getattr(payer, "is_op", False): return 0.0
+        policy = cfg.get("sources", {}).get(source, {})
+        cost, cd = float(policy.get("cost", 0) or 0), float(policy.get("cooldown", 0) or 0)
+        key = (source, payer.name); now = time.monotonic()
+        left = self._cooldowns.get(key, 0.0) - now
+        if left > 0:
+            payer.send_message(tr("teleport.cooldown", math.ceil(left))); return None
+        eco = self.plugin.economy
+        if cost > 0:
+            if not eco.reduce_money_internal(payer, cost):
+                payer.send_message(tr("teleport.need_money", eco._fmt(cost), eco.config.coin_name)); return None
+            payer.send_message(tr("teleport.cost", eco._fmt(cost), eco.config.coin_name))
+        if cd > 0: self._cooldowns[key] = now + cd
+        return cost
+
+    def _refund(self, payer, source: str, cost: float):
+        self._cooldowns.pop((source, payer.name), None)
+        if cost > 0:
+            try: self.plugin.economy.add_money_internal(payer, cost)
+            except Exception as e: plugin_print(f"[Teleport] 退款失败 {payer.name}: {e}", "WARNING")
+
+    # ── 传送 ────────────────────────────────────────────
+    def _prewarm(self, loc: Location) -> bool:
+        """读取目标方块, 促使服务端提前载入目标区块"""
+        try:
+            loc.dimension.get_block_at(math.floor(loc.x), math.floor(loc.y), math.floor(loc.z)); return True
+        except Exception:
+            return False
+
+    def _record_origin(self, player, origin, source: str):
+        if origin is None or not self.config.get("record_back", True): return
+        back = getattr(self.plugin, "back", None)
+        if back is not None: back.record_origin(player, origin, source)
+
+    def observe(self, source: str, ok: bool, total: float, call: float = None):
+        c = self.stats.get(source)
+        if c is None: c = self.stats[source] = _Counter()
+        c.add(ok, total, total if call is None else call)
+
+    def teleport(self, player, target, source: str, message: str = None, payer=None, charge: bool = True) -> bool:
+        """
+        target 为 Location 或坐标字典; message 在落地后发给 player; payer 默认为被传送者, charge=False 跳过费用与冷却
+        返回是否受理(冷却中/余额不足/无法解析目标为 False), 预热开启时实际传送发生在若干 tick 之后
+        """
+        loc = target if isinstance(target, Location) else self.location(target, player.location.dimension)
+        if loc is None:
+            player.send_message(tr("teleport.no_target")); return False
+        payer = payer or player
+        cost = self._admit(payer, source) if charge else 0.0
+        if cost is None: return False
+        t0 = time.perf_counter()
+
+        def move():
+            ok = False; t1 = time.perf_counter()
+            try:
+                if player.is_valid:
+                    origin = player.location
+                    player.teleport(loc); ok = True
+                    self._record_origin(player, origin, source)
+            except Exception as e:
+                plugin_print(f"[Teleport] {source} 传送 {player.name} 失败: {e}", "WARNING")
+            t2 = time.perf_counter()
+            self.observe(source, ok, t2 - t0, t2 - t1)
+            if not ok: self._refund(payer, source, cost)
+            elif message: player.send_message(message)
+
+        ticks = int(self.config.get("prewarm_ticks", 0) or 0)
+        if ticks > 0 and self._prewarm(loc): self.plugin.server.scheduler.run_task(self.plugin, move, ticks)
+        else: move()
+        return True
+
+    def track(self, player, source: str, action: Callable[[], bool]) -> bool:
+        """由引擎命令完成的传送(如 rtp 的 spreadplayers): 同样计时并记录出发点"""
+        origin = player.location; t0 = time.perf_counter(); ok = False
+        try: ok = bool(action())
+        finally:
+            self.observe(source, ok, time.perf_counter() - t0)
+            if ok: self._record_origin(player, origin, source)
+        return ok
+
+    # ── 批量传送 ────────────────────────────────────────
+    @property
+    def mass_config(self) -> dict:
+        return {**self.MASS_DEFAULTS, **self.config.get("mass", {})}
+
+    def select(self, sender, spec: str) -> Optional[List]:
+        return select_players(self.plugin.server, sender, spec)
+
+    def mass(self, players: list, target, source: str, admin=None, label: str = "") -> Optional[_MassJob]:
+        """把一批玩家排入队列传送到 target(不收费不计冷却); 进度与预计剩余时间定期发给 admin"""
+        loc = target if isinstance(target, Location) else self.location(target)
+        if loc is None or not players: return None
+        job = _MassJob(label or source, loc, source, list(players), admin)
+        self._jobs.append(job)
+        if self._task_id is None:
+            task = self.plugin.server.scheduler.run_task(self.plugin, self._drain, 1, 1)
+            self._task_id = task.task_id if task else None
+        if admin is not None:
+            admin.send_message(tr("teleport.mass_queued", job.label, len(job.players), self._eta(job)))
+        return job
+
+    def pending(self) -> int:
+        return sum(len(j.players) - j.pos for j in self._jobs)
+
+    def _tps(self) -> float:
+        """取 cleanmgr 每秒采样的 TPS, 避免每 tick 访问服务端"""
+        return float(getattr(getattr(self.plugin, "cleanmgr", None), "current_tps", 20.0) or 20.0)
+
+    def budget(self) -> float:
+        """每 tick 出队人数: TPS ≥ full_tps 时为 per_tick, 低于 min_tps 时降到 per_tick × min_scale, 之间线性"""
+        m = self.mass_config; per_tick = max(1.0, float(m["per_tick"]))
+        tps = self._tps()
+        lo, hi, floor = float(m["min_tps"]), float(m["full_tps"]), float(m["min_scale"])
+        scale = 1.0 if tps >= hi else floor if tps <= lo else floor + (1.0 - floor) * (tps - lo) / (hi - lo)
+        return per_tick * scale
+
+    def _eta(self, job: _MassJob) -> str:
+        """job 及排在它前面的任务剩余人数 ÷ 当前出队速率(人/秒)"""
+        remaining = 0
+        for j in self._jobs:
+            remaining += len(j.players) - j.pos
+            if j is job: break
+        return f"{remaining / max(self.budget() * min(self._tps(), 20.0), 1e-6):.0f}"
+
+    def _drain(self):
+        self._credit = min(self._credit + self.budget(), max(1.0, float(self.mass_config["per_tick"])))   # 上限与 budget() 一致, 不低于 1 人
+        while self._jobs and self._credit >= 1.0:
+            job = self._jobs[0]
+            if job.pos >= len(job.players):
+                self._finish(self._jobs.popleft()); continue
+            p = job.players[job.pos]; job.pos += 1; self._credit -= 1.0
+            if p.is_valid and self.teleport(p, job.loc, job.source, tr("teleport.mass_arrived", job.label), charge=False): job.moved += 1
+            else: job.skipped += 1
+        if self._jobs and self._jobs[0].pos >= len(self._jobs[0].players): self._finish(self._jobs.popleft())
+        now = time.monotonic(); every = float(self.mass_config["progress_seconds"])
+        for job in self._jobs:
+            if now - job.notified >= every:
+                job.notified = now
+                self._notify(job, tr("teleport.mass_progress", job.label, job.pos, len(job.players), self._eta(job)))
+        if not self._jobs: self._stop_drain()
+
+    def _finish(self, job: _MassJob):
+        self._notify(job, tr("teleport.mass_done", job.label, job.moved, job.skipped, f"{time.monotonic() - job.started:.1f}"))
+
+    def _notify(self, job: _MassJob, msg: str):
+        try:
+            if job.admin is not None and job.admin.is_valid: job.admin.send_message(msg)
+        except Exception:
+            pass
+
+    def _stop_drain(self):
+        if self._task_id is not None:
+            try: self.plugin.server.scheduler.cancel_task(self._task_id)
+            except Exception: pass
+            self._task_id = None
+        self._credit = 0.0
+
+    def cancel_mass(self) -> int:
+        """清空队列, 返回未传送的人数"""
+        left = self.pending()
+        for job in self._jobs: self._notify(job, tr("teleport.mass_cancelled", job.label, job.pos, len(job.players)))
+        self._jobs.clear(); self._stop_drain()
+        return left
+
+    def handle_queue(self, sender, args: list):
+        """/yest tpqueue [cancel]"""
+        if args and args[0] == "cancel":
+            sender.send_message(tr("teleport.queue_cancelled", self.cancel_mass())); return
+        if not self._jobs:
+            sender.send_message(tr("teleport.queue_empty")); return
+        sender.send_message(tr("teleport.queue_header", len(self._jobs), f"{self.budget():.2f}",
+                               f"{self._tps():.1f}"))
+        for job in self._jobs:
+            sender.send_message(tr("teleport.mass_progress", job.label, job.pos, len(job.players), self._eta(job)))
+
+    # ── 统计 ────────────────────────────────────────────
+    def handle_stats(self, sender, args: list):
+        """/yest tpstats [reset]"""
+        if args and args[0] == "reset":
+            self.stats.clear(); sender.send_message(tr("teleport.stats_reset")); return
+        if not self.stats:
+            sender.send_message(tr("teleport.stats_empty")); return
+        sender.send_message(tr("teleport.stats_header", int(self.config.get("prewarm_ticks", 0) or 0), len(self._dims)))
+        for src, c in sorted(self.stats.items()):
+            sender.send_message(tr("teleport.stats_line", src, c.count, c.failed,
+                                   f"{c.total / c.count * 1000:.2f}", f"{c.peak * 1000:.2f}", f"{c.call / c.count * 1000:.2f}"))
@@ -84,13 +84,13 @@ class TPASystem:
             target.send_message(tr("tpa.accepted", sender_name))
             sender.send_message(tr("tpa.sender_accepted", target_name))
             
-            # 执行传送
+            # 执行传送, 费用与冷却由请求发送者承担
             if request_type == "to":
                 # 发送者传送到目标位置
-                sender.teleport(target.location)
+                self.plugin.teleport.teleport(sender, target.location, "tpa")
             else:
                 # 目标传送到发送者位置 (tpahere)
-                target.teleport(sender.location)
+                self.plugin.teleport.teleport(target, sender.location, "tpa", payer=sender)
         else:
             target.send_message(tr("tpa.rejected", sender_name))
             sender.send_message(tr("tpa.sender_rejected", target_name))
@@ -1,19 +1,89 @@
 import os
 import json
-from typing import Dict, Any
+import math
+import difflib
+from bisect import bisect_left
+from typing import Dict, Any, List, Optional, Tuple
 from endstone import Player
-from endstone.level import Location
 from endstone.form import ActionForm, ModalForm, TextInput
 
 from .log import plugin_print
 from .i18n import tr
 
+
+def _subsequence(q: str, s: str) -> bool:
+    it = iter(s)
+    return all(c in it for c in q)
+
+
+class WarpIndex:
+    """
+    传送点名称的有序索引: (小写名, 原名) 有序列表 + bisect, 前缀查找 O(log n + k)
+    模糊搜索按 前缀 > 子串 > 子序列 > 近似拼写 排序
+    """
+    def __init__(self, names=()):
+        self._keys: List[Tuple[str, str]] = sorted((n.lower(), n) for n in names)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, name: str):
+        key = (name.lower(), name)
+        i = bisect_left(self._keys, key)
+        if i == len(self._keys) or self._keys[i] != key:
+            self._keys.insert(i, key)
+
+    def remove(self, name: str):
+        key = (name.lower(), name)
+        i = bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            del self._keys[i]
+
+    def names(self) -> List[str]:
+        return [n for _, n in self._keys]
+
+    def _scan(self, q: str, exact: bool) -> List[str]:
+        keys = self._keys; i = bisect_left(keys, (q, "")); out = []
+        while i < len(keys) and (keys[i][0] == q if exact else keys[i][0].startswith(q)):
+            out.append(keys[i][1]); i += 1
+        return out
+
+    def prefix(self, q: str) -> List[str]:
+        return self._scan(q.lower(), False)
+
+    def search(self, q: str, limit: int = 200) -> List[str]:
+        q = q.strip().lower()
+        if not q: return self.names()[:limit]
+        out = self.prefix(q)[:limit]; seen = set(out)
+        for test in (lambda k: q in k, lambda k: _subsequence(q, k)):
+            for k, n in self._keys:
+                if len(out) >= limit: return out
+                if n not in seen and test(k): out.append(n); seen.add(n)
+        if len(out) < limit:
+            by_key = {}
+            for k, n in self._keys: by_key.setdefault(k, n)
+            out += [by_key[k] for k in difflib.get_close_matches(q, list(by_key), n=10, cutoff=0.6) if by_key[k] not in seen]
+        return out[:limit]
+
+    def resolve(self, q: str) -> Tuple[Optional[str], List[str]]:
+        """精确名 → 忽略大小写唯一匹配 → 唯一前缀; 否则返回 (None, 候选)"""
+        same = self._scan(q.lower(), True)
+        if q in same: return q, []
+        if len(same) == 1: return same[0], []
+        cands = same or self.prefix(q)
+        return (cands[0], []) if len(cands) == 1 else (None, cands)
+
+
 class WarpSystem:
+    PAGE = 10       # 每页按钮数, 表单大小与传送点总数无关
+    NAME_MAX = 32   # 按钮上显示的名称长度上限
+
     def __init__(self, plugin):
         self.plugin = plugin
         self.data_folder = plugin.data_folder
         self.warp_path = os.path.join(self.data_folder, "warps.json")
         self.warp_data: Dict[str, Dict[str, float]] = {}
+        self.index = WarpIndex()
         self.load_warps()
 
     def load_warps(self):
@@ -27,6 +97,12 @@ class WarpSystem:
             except Exception as e:
                 plugin_print(f"Failed to load warp data: {e}")
                 self.warp_data = {}
+        self.index = WarpIndex(self.warp_data)
+        for warp_name, data in self.warp_data.items():
+            self._place(warp_name, data)
+
+    def _place(self, warp_name: str, data: dict):
+        self.plugin.spatial.put(("warp", warp_name), "warp", data.get("dimension", "Overworld"), data["x"], data["y"], data["z"])
 
     def save_warps(self):
         try:
@@ -49,6 +125,8 @@ class WarpSystem:
             "pitch": loc.pitch,
             "yaw": loc.yaw
         }
+        self.index.add(warp_name)
+        self._place(warp_name, self.warp_data[warp_name])
         self.save_warps()
         player.send_message(tr("warp.set", warp_name))
 
@@ -59,39 +137,121 @@ class WarpSystem:
 
         if warp_name in self.warp_data:
             del self.warp_data[warp_name]
+            self.index.remove(warp_name)
+            self.plugin.spatial.remove(("warp", warp_name))
             self.save_warps()
             player.send_message(tr("warp.deleted", warp_name))
         else:
             player.send_message(tr("warp.not_found", warp_name))
 
+    def resolve(self, sender, query: str) -> Optional[str]:
+        """名称或唯一前缀 → 传送点名; 有歧义或不存在时提示候选"""
+        if query in self.warp_data:
+            return query
+        name, cands = self.index.resolve(query)
+        if name is not None:
+            return name
+        if cands:
+            more = f" …(+{len(cands) - 8})" if len(cands) > 8 else ""
+            sender.send_message(tr("warp.ambiguous", query, ", ".join(cands[:8]) + more))
+            return None
+        sender.send_message(tr("warp.not_found", query))
+        similar = self.index.search(query, 5)
+        if similar:
+            sender.send_message(tr("warp.suggest", ", ".join(similar)))
+        return None
+
     def teleport_warp(self, player: Player, warp_name: str):
-        if warp_name in self.warp_data:
+        warp_name = self.resolve(player, warp_name)
+        if warp_name is not None:
             data = self.warp_data[warp_name]
-            dim = self._resolve_dimension(data.get("dimension", "Overworld"))
-            if dim is None:
-                dim = player.location.dimension
-            loc = Location(dim, data["x"], data["y"], data["z"], data["pitch"], data["yaw"])
-            player.teleport(loc)
-            player.send_message(tr("warp.teleported", warp_name))
-        else:
-            player.send_message(tr("warp.not_found", warp_name))
+            self.plugin.teleport.teleport(player, data, "warp", tr("warp.teleported", warp_name))
 
-    def _resolve_dimension(self, dim_name: str):
-        try:
-            return self.plugin.server.level.get_dimension(dim_name)
-        except Exception:
-            dims = self.plugin.server.level.dimensions
-            return dims[0] if dims else None
-
-    def open_warp_gui(self, player: Player):
-        form = ActionForm(title=tr("warp.title"))
-        
+    def mass_teleport(self, sender, warp_name: str, spec: str):
+        """/warp <名称> <all|选择器|玩家名,...>: 排队批量传送"""
+        warp_name = self.resolve(sender, warp_name)
+        if warp_name is None:
+            return
+        players = self.plugin.teleport.select(sender, spec)
+        if players is None:
+            sender.send_message(tr("teleport.bad_selector", spec))
+        elif not self.plugin.teleport.mass(players, self.warp_data[warp_name], "warp", sender, warp_name):
+            sender.send_message(tr("teleport.mass_none"))
+
+    def open_warp_gui(self, player: Player, query: str = "", page: int = 0):
+        """分页列表, 每页 PAGE 个传送点; query 非空时显示搜索结果"""
+        names = self.index.search(query) if query else self.index.names()
+        pages = max(1, math.ceil(len(names) / self.PAGE))
+        page = max(0, min(page, pages - 1))
+        title = tr("warp.title") if not query else tr("warp.result_title", query[:self.NAME_MAX])
+        content = tr("warp.page_info", len(self.index)) if not query else tr("warp.result_info", len(names))
+        form = ActionForm(title=f"{title} §8({page + 1}/{pages})", content=content)
+
+        form.add_button(tr("warp.search"), on_click=lambda p: self.open_search_gui(p))
         if player.is_op:
             form.add_button(tr("warp.set_new"), on_click=lambda p: self.open_set_warp_gui(p))
-        
-        for warp_name in self.warp_data.keys():
-            form.add_button(f"§e{warp_name}", on_click=lambda p, w=warp_name: self.teleport_warp(p, w))
-            
+
+        for warp_name in names[page * self.PAGE:(page + 1) * self.PAGE]:
+            label = warp_name if len(warp_name) <= self.NAME_MAX else warp_name[:self.NAME_MAX - 1] + "…"
+            form.add_button(f"§e{label}", on_click=lambda p, w=warp_name: self.teleport_warp(p, w))
+
+        if page > 0:
+            form.add_button(tr("warp.prev"), on_click=lambda p: self.open_warp_gui(p, query, page - 1))
+        if page < pages - 1:
+            form.add_button(tr("warp.next"), on_click=lambda p: self.open_warp_gui(p, query, page + 1))
+        if query:
+            form.add_button(tr("warp.all"), on_click=lambda p: self.open_warp_gui(p))
+        player.send_form(form)
+
+    def open_near_gui(self, player: Player, radius: Optional[int] = None, around_hub: bool = False, page: int = 0):
+        """
+        /warp near [半径] [hub]: 以自身(或回城点)为中心, 无半径时列出最近的 PAGE 个传送点, 有半径时列出范围内全部(分页)
+        回城点也作为一项参与排序
+        """
+        center = self.plugin.hub.get_hub_location() if around_hub else player.location
+        if center is None:
+            player.send_message(tr("hub.no_location"))
+            return
+        spatial, dim = self.plugin.spatial, center.dimension.name
+        args = (dim, center.x, center.y, center.z)
+        if radius is None:
+            rows = sorted(spatial.nearest("warp", *args, self.PAGE) + spatial.nearest("hub", *args, 1), key=lambda t: t[0])[:self.PAGE]
+        else:
+            rows = sorted(spatial.within("warp", *args, radius) + spatial.within("hub", *args, radius), key=lambda t: t[0])
+        if not rows:
+            player.send_message(tr("warp.none_near"))
+            return
+        pages = max(1, math.ceil(len(rows) / self.PAGE))
+        page = max(0, min(page, pages - 1))
+        content = tr("warp.near_info", len(rows), radius if radius is not None else "-", tr("hub.title") if around_hub else player.name)
+        form = ActionForm(title=f"{tr('warp.near_title')} §8({page + 1}/{pages})", content=content)
+        for dist, key in rows[page * self.PAGE:(page + 1) * self.PAGE]:
+            if key[0] == "hub":
+                form.add_button(f"§b{tr('hub.title')} §7{int(dist)}m", on_click=lambda p: self.plugin.hub.teleport_to_hub(p))
+                continue
+            name = key[1]
+            label = name if len(name) <= self.NAME_MAX else name[:self.NAME_MAX - 1] + "…"
+            form.add_button(f"§e{label} §7{int(dist)}m", on_click=lambda p, w=name: self.teleport_warp(p, w))
+        if page > 0:
+            form.add_button(tr("warp.prev"), on_click=lambda p: self.open_near_gui(p, radius, around_hub, page - 1))
+        if page < pages - 1:
+            form.add_button(tr("warp.next"), on_click=lambda p: self.open_near_gui(p, radius, around_hub, page + 1))
+        player.send_form(form)
+
+    def open_search_gui(self, player: Player):
+        def on_submit(p, data):
+            data = json.loads(data) if isinstance(data, str) else data
+            query = str(data[0]).strip() if data else ""
+            if query and not self.index.search(query, 1):
+                p.send_message(tr("warp.no_result", query))
+                query = ""
+            self.open_warp_gui(p, query)
+
+        form = ModalForm(
+            title=tr("warp.search_title"),
+            controls=[TextInput(label=tr("warp.search_label"), placeholder="spawn", default_value="")],
+            on_submit=on_submit
+        )
         player.send_form(form)
 
     def open_set_warp_gui(self, player: Player):